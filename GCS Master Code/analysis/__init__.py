@@ -0,0 +1 @@
+# analysis package init: post-flight analysis of recordings (headless, no Tk imports)
@@ -0,0 +1,101 @@
+# analysis/__main__.py
+# Campaign analysis: python -m analysis recordings/ [--plots DIR] [--report report.csv] [--jobs N]
+import argparse
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analysis.flight import REPORT_FIELDS, analyze_recording
+from config import settings
+
+# Files written next to a recording, not recordings themselves
+_SIDECARS = ("_link.csv", "_events.csv")
+
+
+def find_recordings(paths):
+    """Recording files among `paths` (files, folders or glob patterns), sorted, without sidecars"""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = glob.glob(os.path.join(path, "*.csv")) + glob.glob(os.path.join(path, "*.cfr"))
+        else:
+            candidates = glob.glob(path) or [path]
+        found.update(c for c in candidates if not c.endswith(_SIDECARS))
+    return sorted(found)
+
+
+def analyze_all(paths, plot_dir=None, jobs=None):
+    """Report rows in file order; recordings are analysed by `jobs` worker processes (1 = in this process)"""
+    jobs = min(jobs or os.cpu_count() or 1, len(paths)) or 1
+    if jobs == 1:
+        return [analyze_recording(path, plot_dir) for path in paths]
+    rows = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(analyze_recording, path, plot_dir): path for path in paths}
+        for future in as_completed(futures):
+            rows[futures[future]] = future.result()
+    return [rows[path] for path in paths]
+
+
+def _fmt(value, digits=1):
+    if value is None or value != value:
+        return "--"
+    return f"{value:.{digits}f}" if isinstance(value, float) else str(value)
+
+
+def print_report(rows):
+    print(f"{'file':<32} {'packets':>8} {'loss %':>7} {'apogee m':>9} {'deploy s':>9} "
+          f"{'primary m/s':>12} {'second. m/s':>12} {'battery %':>10} {'drift m':>8}")
+    for row in rows:
+        if row.get("error"):
+            print(f"{row['file']:<32} [!] {row['error']}")
+            continue
+        print(f"{row['file']:<32} {row['packets']:>8} {_fmt(row['packet_loss'] * 100 if 'packet_loss' in row else None):>7} "
+              f"{_fmt(row.get('apogee_m')):>9} {_fmt(row.get('time_to_deployment_s')):>9} "
+              f"{_fmt(row.get('descent_rate_primary_chute_ms')):>12} {_fmt(row.get('descent_rate_secondary_chute_ms')):>12} "
+              f"{_fmt(row.get('battery_drain')):>10} {_fmt(row.get('gps_drift_radius_m')):>8}")
+    good = [row for row in rows if not row.get("error") and row.get("apogee_m") is not None]
+    if len(good) > 1:
+        apogees = [row["apogee_m"] for row in good]
+        print(f"[INFO] {len(good)} flights: apogee {min(apogees):.1f}-{max(apogees):.1f} m "
+              f"(mean {sum(apogees) / len(apogees):.1f} m)")
+
+
+def write_report(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: round(v, 4) if isinstance(v, float) else v for k, v in row.items()})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analysis", description="Post-flight analysis of CanSat recordings")
+    parser.add_argument("paths", nargs="+", help="recordings (.csv/.cfr), folders or glob patterns")
+    parser.add_argument("--plots", metavar="DIR", help="write one plot per flight to this folder")
+    parser.add_argument("--report", metavar="FILE", help="write the combined report as CSV")
+    parser.add_argument("--jobs", type=int, default=settings.ANALYSIS_JOBS, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    paths = find_recordings(args.paths)
+    if not paths:
+        print("[!] No recordings found.")
+        return 1
+    if args.plots:
+        os.makedirs(args.plots, exist_ok=True)
+    start = time.perf_counter()
+    rows = analyze_all(paths, args.plots, args.jobs)
+    elapsed = time.perf_counter() - start
+    print_report(rows)
+    if args.report:
+        write_report(rows, args.report)
+        print(f"[✓] Report written to {args.report}")
+    failed = sum(1 for row in rows if row.get("error"))
+    print(f"[✓] Analysed {len(rows) - failed} of {len(rows)} recordings in {elapsed:.2f} s.")
+    return 0 if not failed else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
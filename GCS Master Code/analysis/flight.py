@@ -0,0 +1,255 @@
+# analysis/flight.py
+# One recording -> columns -> summary (apogee, phases, descent rates, battery, GPS drift, packet loss) and plot
+__all__ = ["REPORT_FIELDS", "analyze_recording", "load_columns", "plot_flight", "summarize"]
+
+import csv
+import itertools
+import os
+import warnings
+
+import numpy as np
+
+from config import settings
+from config.telemetry_schema import TIME_FIELD
+from core.fusion import fuse_batch, pressure_to_altitude, sample_times
+from core.phase_detector import PHASE_NAMES, WAITING, PhaseDetector
+from data.flight_log import FlightLogReader, parse_time_of_day
+from data.geo import distances_m
+
+# Non-numeric recording columns, left out of the analysis (multi-link recordings name the delivering link)
+TEXT_COLUMNS = ("source",)
+# Phases after ejection, in flight order
+PHASES = [name for phase, name in sorted(PHASE_NAMES.items()) if phase != WAITING]
+# Columns of the campaign report, one row per recording
+REPORT_FIELDS = (
+    ["file", "packets", "duration_s", "packet_rate_hz", "lost_packets", "packet_loss", "gaps",
+     "apogee_m", "apogee_time_s", "max_descent_rate_ms", "time_to_deployment_s", "descent_time_s"]
+    + [f"{name}_time_s" for name in PHASES]
+    + [f"descent_rate_{name}_ms" for name in PHASES[:-1]]
+    + ["battery_start", "battery_end", "battery_drain", "battery_drain_per_min", "min_voltage",
+       "gps_fixes", "gps_drift_radius_m", "landing_offset_m", "error"]
+)
+
+
+def _column(values, is_time):
+    """One CSV column (tuple of str) as float64; empty cells are NaN"""
+    text = np.array(values)
+    if is_time:
+        # The clock only changes once a second: parse each distinct stamp once
+        stamps, index = np.unique(text, return_inverse=True)
+        parsed = [parse_time_of_day(s) for s in stamps.tolist()]
+        return np.array([np.nan if v is None else v for v in parsed], dtype=np.float64)[index]
+    text[text == ""] = "nan"
+    try:
+        return text.astype(np.float64)
+    except ValueError:
+        # A corrupted cell: convert one by one
+        out = np.full(len(text), np.nan)
+        for i, v in enumerate(text.tolist()):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                pass
+        return out
+
+
+def _clock_converter():
+    stamps = {}
+
+    def convert(text):
+        value = stamps.get(text)
+        if value is None:
+            value = parse_time_of_day(text)
+            value = stamps[text] = np.nan if value is None else value
+        return value
+    return convert
+
+
+def _read_csv_chunks(f, header, chunk_rows):
+    """Tolerant CSV reader: `chunk_rows` at a time, each chunk converted column-wise"""
+    rows = csv.reader(f)
+    parts = {name: [] for name in header if name not in TEXT_COLUMNS}
+    while True:
+        block = list(itertools.islice(rows, chunk_rows))
+        if not block:
+            break
+        block = [row for row in block if len(row) == len(header)]  # e.g. a last line cut short by a crash
+        if not block:
+            continue
+        for name, values in zip(header, zip(*block)):
+            if name in parts:
+                parts[name].append(_column(values, name == TIME_FIELD))
+    return {name: np.concatenate(chunks) if chunks else np.zeros(0) for name, chunks in parts.items()}
+
+
+def load_columns(path, chunk_rows=65536):
+    """
+    Columns of a .csv or .cfr recording as float64 arrays (the clock as seconds
+    since midnight). .cfr files are memory-mapped. CSVs are parsed by NumPy's
+    loadtxt, which streams the file; one with empty cells or broken lines is
+    read again `chunk_rows` at a time with the csv module.
+    """
+    if os.path.splitext(path)[1].lower() == ".cfr":
+        with FlightLogReader(path) as reader:
+            return {name: np.array(reader[name], dtype=np.float64) for name in reader.fields
+                    if reader[name].dtype.kind in "fiub"}
+    with open(path, newline="") as f:
+        header = next(csv.reader([f.readline()]), None)
+        if not header:
+            return {}
+        start = f.tell()
+        usecols = [i for i, name in enumerate(header) if name not in TEXT_COLUMNS]
+        converters = {header.index(TIME_FIELD): _clock_converter()} if TIME_FIELD in header else None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # "input contained no data": a recording with no rows
+                data = np.loadtxt(f, delimiter=",", converters=converters, dtype=np.float64, ndmin=2, usecols=usecols)
+        except ValueError:
+            f.seek(start)
+            return _read_csv_chunks(f, header, chunk_rows)
+    names = [header[i] for i in usecols]
+    if data.shape[1] != len(names):
+        return {name: np.zeros(0) for name in names}  # no rows
+    return {name: data[:, i] for i, name in enumerate(names)}
+
+
+def _first_last(values):
+    valid = values[~np.isnan(values)]
+    return (float(valid[0]), float(valid[-1])) if len(valid) else (np.nan, np.nan)
+
+
+def summarize(columns, settle_s=None):
+    """
+    Flight summary of recording columns, as (summary dict, series for plot_flight).
+
+    Altitude and descent rate are re-estimated from pressure with fuse_batch,
+    so old and new recordings are treated alike; phase times come from the same
+    PhaseDetector the live pipeline runs, with the same settling rule
+    (`settle_s`, default PHASE_SETTLE_S, from the first row). Packet loss assumes a steady, whole
+    number of packets per clock second, over every second spanned.
+    """
+    clock = columns.get(TIME_FIELD)
+    if clock is None or "pressure" not in columns:
+        raise ValueError("not a telemetry recording (needs time and pressure columns)")
+    keep = ~np.isnan(clock)
+    cols = {name: values[keep] for name, values in columns.items()}
+    n = len(cols[TIME_FIELD])
+    summary = {"packets": n}
+    if n < 2:
+        return summary, None
+
+    t = sample_times(cols[TIME_FIELD])
+    seconds = np.floor(t)
+    per_second = np.unique(seconds, return_counts=True)[1]
+    # Nominal rate: a full second (the first and last are usually partial); a high
+    # percentile, since lost packets pull the median below the rate that was sent
+    rate = float(np.round(np.percentile(per_second[1:-1] if len(per_second) > 2 else per_second, 90)))
+    expected = rate * (seconds[-1] + 1)
+    lost = max(expected - n, 0.0)
+    summary.update(
+        duration_s=float(t[-1]),
+        packet_rate_hz=rate,
+        lost_packets=int(round(lost)),
+        packet_loss=lost / expected,
+        gaps=int(np.count_nonzero(np.diff(np.unique(seconds)) > settings.LINK_GAP_S)),
+    )
+
+    accel = cols.get(settings.FUSION_ACCEL_FIELD) if settings.FUSION_ACCEL_FIELD else None
+    altitude, descent = fuse_batch(t, cols["pressure"], accel, settings.FUSION_BARO_NOISE_M,
+                                   settings.FUSION_PROCESS_ACCEL, settings.FUSION_ACCEL_NOISE,
+                                   settings.FUSION_SEA_LEVEL_HPA)
+    if np.isnan(altitude).all():
+        return summary, None
+    top = int(np.nanargmax(altitude))
+    summary.update(apogee_m=float(altitude[top]), apogee_time_s=float(t[top]),
+                   max_descent_rate_ms=float(np.nanmax(descent)))
+
+    detector = PhaseDetector.from_settings(accel=accel is not None)
+    if settle_s is not None:
+        detector.settle_s = settle_s
+    measured = pressure_to_altitude(cols["pressure"], settings.FUSION_SEA_LEVEL_HPA)
+    events = {}
+    for ti, alt, rate_ms, z in zip(t.tolist(), altitude.tolist(), descent.tolist(), measured.tolist()):
+        event = detector.update(ti, alt, rate_ms, measured=z)
+        if event:
+            events[event["phase"]] = ti
+    for name, at in events.items():
+        summary[f"{name}_time_s"] = at
+    if "ejection" in events and "primary_chute" in events:
+        summary["time_to_deployment_s"] = events["primary_chute"] - events["ejection"]
+    if "ejection" in events and "landed" in events:
+        summary["descent_time_s"] = events["landed"] - events["ejection"]
+    # Typical descent rate from each phase's start to the next one's
+    starts = [(events[name], name) for name in PHASES if name in events]
+    bounds = np.searchsorted(t, [at for at, _ in starts] + [np.inf])
+    for (_, name), lo, hi in zip(starts, bounds[:-1], bounds[1:]):
+        if name != "landed" and hi > lo:
+            summary[f"descent_rate_{name}_ms"] = float(np.nanmedian(descent[lo:hi]))
+
+    if "battery" in cols:
+        first, last = _first_last(cols["battery"])
+        summary.update(battery_start=first, battery_end=last, battery_drain=first - last,
+                       battery_drain_per_min=(first - last) / (t[-1] / 60) if t[-1] > 0 else np.nan)
+    if "voltage" in cols and not np.isnan(cols["voltage"]).all():
+        summary["min_voltage"] = float(np.nanmin(cols["voltage"]))
+    if "gps_lat" in cols and "gps_lon" in cols:
+        lat, lon = cols["gps_lat"], cols["gps_lon"]
+        fix = ~np.isnan(lat) & ~np.isnan(lon) & ((lat != 0) | (lon != 0))
+        summary["gps_fixes"] = int(np.count_nonzero(fix))
+        if fix.any():
+            # Drift from the first fix of the recording
+            drift = distances_m(lat[fix][0], lon[fix][0], lat[fix], lon[fix])
+            summary.update(gps_drift_radius_m=float(drift.max()), landing_offset_m=float(drift[-1]))
+
+    series = {"t": t, "pressure_altitude": pressure_to_altitude(cols["pressure"], settings.FUSION_SEA_LEVEL_HPA),
+              "altitude": altitude, "descent_rate": descent, "events": events,
+              "battery": cols.get("battery"), "voltage": cols.get("voltage")}
+    return summary, series
+
+
+def plot_flight(series, path, title=""):
+    """Altitude, descent rate and battery over flight time, phase changes marked, saved as an image"""
+    # Figure + Agg canvas directly: no pyplot, no GUI backend, safe in worker processes
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    ax_alt, ax_rate, ax_batt = fig.subplots(3, 1, sharex=True)
+    t = series["t"]
+    ax_alt.plot(t, series["pressure_altitude"], color=settings.THEME["graph_line"], lw=0.6, alpha=0.5, label="barometric")
+    ax_alt.plot(t, series["altitude"], color=settings.THEME["fused_line"], lw=1.2, label="fused")
+    ax_alt.set_ylabel("Altitude (m)")
+    ax_alt.legend(loc="center right")
+    ax_rate.plot(t, series["descent_rate"], color=settings.THEME["fused_line"], lw=1.0)
+    ax_rate.set_ylabel("Descent rate (m/s)")
+    if series["battery"] is not None:
+        ax_batt.plot(t, series["battery"], color=settings.THEME["graph_line"], lw=1.0)
+    ax_batt.set_ylabel("Battery (%)")
+    ax_batt.set_xlabel("Flight time (s)")
+    for name, at in series["events"].items():
+        for ax in (ax_alt, ax_rate, ax_batt):
+            ax.axvline(at, color="grey", lw=0.8, ls="--")
+        ax_alt.annotate(name, (at, 1), xycoords=("data", "axes fraction"), rotation=90, va="top", ha="right", fontsize=8)
+    for ax in (ax_alt, ax_rate, ax_batt):
+        ax.grid(True, alpha=0.3)
+    fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=settings.ANALYSIS_PLOT_DPI)
+
+
+def analyze_recording(path, plot_dir=None):
+    """
+    Process-pool entry point: the report row of one recording (with `error` set
+    if it couldn't be read), plus its plot in `plot_dir` if given.
+    """
+    row = {"file": os.path.basename(path)}
+    try:
+        summary, series = summarize(load_columns(path))
+    except (OSError, ValueError) as e:
+        row["error"] = str(e)
+        return row
+    row.update(summary)
+    if plot_dir and series is not None:
+        plot_flight(series, os.path.join(plot_dir, os.path.splitext(row["file"])[0] + ".png"), row["file"])
+    return row
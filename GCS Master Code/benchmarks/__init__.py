@@ -0,0 +1 @@
+# benchmarks package init: hot-path throughput benchmarks (python -m benchmarks)
@@ -0,0 +1,82 @@
+# benchmarks/__main__.py
+# python -m benchmarks [--quick] [--only parse,store] [--output results.json] [--baseline baseline.json]
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+
+from benchmarks.common import over_limit
+
+SUITES = ("parse", "store", "render", "pipeline", "broadcast", "fusion", "analysis")
+
+
+def compare(results, baseline, tolerance):
+    """Returns (name, baseline, current, change) for every metric that got worse by more than `tolerance`"""
+    regressions = []
+    for suite, metrics in results["suites"].items():
+        for name, current in metrics.items():
+            base = baseline.get("suites", {}).get(suite, {}).get(name)
+            if not base or not base["value"]:
+                continue
+            change = (current["value"] - base["value"]) / abs(base["value"])
+            worse = -change if current["higher_is_better"] else change
+            if worse > tolerance:
+                regressions.append((f"{suite}.{name}", base["value"], current["value"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="CanSat GCS hot-path benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, for CI smoke runs")
+    parser.add_argument("--only", help=f"comma-separated subset of {','.join(SUITES)}")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    suites = args.only.split(",") if args.only else SUITES
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "quick": args.quick,
+        "suites": {},
+    }
+    for suite in suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite!r}")
+        module = importlib.import_module(f"benchmarks.bench_{suite}")
+        print(f"[..] {suite}")
+        results["suites"][suite] = metrics = module.run(quick=args.quick)
+        for name, m in metrics.items():
+            flag = f"  [X] limit {m['limit']:g}" if over_limit(m) else ""
+            print(f"     {name:<32} {m['value']:>14,.4f} {m['unit']}{flag}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[✓] Results written to {args.output}")
+
+    failed = [f"{suite}.{name}" for suite, metrics in results["suites"].items()
+              for name, m in metrics.items() if over_limit(m)]
+    if failed:
+        print(f"[X] Over their limit: {', '.join(failed)}")
+        return 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[X] {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for name, base, current, change in regressions:
+                print(f"     {name:<40} {base:>12,.4f} -> {current:>12,.4f} ({change:+.1%})")
+            return 1
+        print(f"[✓] No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+# benchmarks/bench_analysis.py
+# Post-flight analysis: per-recording cost, and a campaign in one process vs a process pool
+import os
+import tempfile
+
+from analysis.__main__ import analyze_all
+from analysis.flight import load_columns, summarize
+from benchmarks.common import SEED, best_of, metric
+from data.dummy_data import CSV_FIELDS, MissionProfile
+
+
+def run(quick=False):
+    flights = 4 if quick else 16
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for i in range(flights):
+            path = os.path.join(folder, f"recording_{i}.csv")
+            lines = MissionProfile(rate_hz=20.0, seed=SEED + i).csv_lines()
+            with open(path, "wb") as f:
+                f.write(",".join(CSV_FIELDS).encode("ascii") + b"\n" + b"\n".join(lines) + b"\n")
+            paths.append(path)
+        rows = len(lines)
+        columns = {}
+        load_s = best_of(lambda: columns.update(load_columns(paths[0])))
+        summary_s = best_of(lambda: summarize(columns))
+        serial_s = best_of(lambda: analyze_all(paths, jobs=1), repeat=1)
+        pool_s = best_of(lambda: analyze_all(paths), repeat=1)
+    return {
+        "load_rows_per_s": metric(rows / load_s, "rows/s"),
+        "summary_rows_per_s": metric(rows / summary_s, "rows/s"),
+        "serial_flights_per_s": metric(flights / serial_s, "flights/s"),
+        "pool_flights_per_s": metric(flights / pool_s, "flights/s"),
+        "pool_speedup": metric(serial_s / pool_s, "x"),
+    }
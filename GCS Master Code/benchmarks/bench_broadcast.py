@@ -0,0 +1,74 @@
+# benchmarks/bench_broadcast.py
+# Fan-out: publisher cost and delivery with several TCP clients, one of them stalled
+import socket
+import threading
+import time
+
+from benchmarks.common import flight_lines, metric
+from core.broadcast import TelemetryBroadcaster
+from core.event_bus import EventBus, PACKET
+from serial_comm.decoder import SchemaDecoder
+
+
+def _reader(sock, counts, i, stop):
+    buf = b""
+    while not stop.is_set():
+        try:
+            chunk = sock.recv(65536)
+        except OSError:
+            break
+        if not chunk:
+            break
+        buf += chunk
+        counts[i] += buf.count(b"\n")
+        buf = buf[buf.rfind(b"\n") + 1:]
+
+
+def run(quick=False, fast_clients=4):
+    decoder = SchemaDecoder()
+    packets = [decoder.to_dict(decoder.from_csv(line)) for line in flight_lines(rate_hz=100.0, limit=5000 if quick else 20000)]
+    bus = EventBus()
+    broadcaster = TelemetryBroadcaster(bus, tcp_port=0, ws_port=None, client_buffer=256)
+    broadcaster.start()
+    stop = threading.Event()
+    counts = [0] * fast_clients
+    socks, threads = [], []
+    for i in range(fast_clients):
+        sock = socket.create_connection(("127.0.0.1", broadcaster.tcp_port))
+        socks.append(sock)
+        threads.append(threading.Thread(target=_reader, args=(sock, counts, i, stop), daemon=True))
+        threads[-1].start()
+    # Never reads: its socket buffer fills and its queue must overflow, not the publisher
+    slow = socket.socket()
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)  # before connect, or the window is already open
+    slow.connect(("127.0.0.1", broadcaster.tcp_port))
+    deadline = time.perf_counter() + 5
+    while len(broadcaster.clients) < fast_clients + 1 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    for packet in packets:
+        bus.publish(PACKET, packet)
+    publish_s = time.perf_counter() - start
+    # A burst faster than the clients drain costs them their oldest messages; wait
+    # until every fast client has received everything it wasn't dropped
+    names = {f"tcp:127.0.0.1:{sock.getsockname()[1]}": i for i, sock in enumerate(socks)}
+    deadline = time.perf_counter() + 10
+    while time.perf_counter() < deadline:
+        clients = broadcaster.stats()["clients"]
+        dropped = {names[c["name"]]: c["dropped"] for c in clients if c["name"] in names}
+        if all(counts[i] + dropped.get(i, 0) >= len(packets) for i in range(fast_clients)):
+            break
+        time.sleep(0.005)
+    delivered_s = time.perf_counter() - start
+    slow_dropped = max(c["dropped"] for c in clients if c["name"] not in names)
+    stop.set()
+    for sock in socks + [slow]:
+        sock.close()
+    broadcaster.stop()
+    return {
+        "publish_us": metric(publish_s / len(packets) * 1e6, "us/packet", higher_is_better=False),
+        "fanout_packets_per_s": metric(min(counts) / delivered_s, "packets/s"),
+        "fast_client_loss": metric(1 - min(counts) / len(packets), "fraction", higher_is_better=False),
+        "slow_client_dropped": metric(slow_dropped, "packets"),
+    }
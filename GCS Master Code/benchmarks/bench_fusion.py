@@ -0,0 +1,65 @@
+# benchmarks/bench_fusion.py
+# Altitude / descent-rate filter: per-packet cost, whole-recording cost, and accuracy;
+# mission-phase detection on top of it: per-packet cost and delay behind the true events
+import numpy as np
+
+from benchmarks.common import SEED, best_of, metric
+from config import settings
+from core.fusion import AltitudeFilter, fuse_batch
+from core.phase_detector import PHASE_NAMES, PhaseDetector
+from data.dummy_data import MissionProfile
+
+CHUTE_DELAY_LIMIT_S = 1.5  # both chute openings confirmed this soon
+LANDED_SETTLE_LIMIT_S = 1.5  # landing: PHASE_LANDED_S of stillness plus this
+
+
+def run(quick=False):
+    flight = MissionProfile(rate_hz=50.0, seed=SEED)
+    c = flight.columns
+    n = 5000 if quick else len(flight)
+    t, pressure = c["t"][:n], c["pressure"][:n]
+    params = (settings.FUSION_BARO_NOISE_M, settings.FUSION_PROCESS_ACCEL)
+    t_list, p_list = t.tolist(), pressure.tolist()
+    out = []
+
+    def stream():
+        f = AltitudeFilter(*params)
+        out[:] = [f.update(ti, pi) for ti, pi in zip(t_list, p_list)]
+
+    stream_s = best_of(stream)
+    batch_s = best_of(lambda: fuse_batch(t, pressure, baro_noise_m=params[0], process_accel=params[1]))
+    est = np.array(out)
+
+    # Detection always runs on the whole flight, its events are spread over all of it
+    f = AltitudeFilter(*params)
+    fused = [(f.update(ti, pi), f.started, f.measured) for ti, pi in zip(c["t"].tolist(), c["pressure"].tolist())]
+    detected = {}
+
+    def detect():
+        d = PhaseDetector.from_settings()
+        detected.clear()
+        for ti, ((alt, rate), started, measured) in zip(c["t"].tolist(), fused):
+            event = d.update(ti, alt, rate, started=started, measured=measured)
+            if event:
+                detected[event["phase"]] = ti
+
+    detect_s = best_of(detect)
+    delays = {PHASE_NAMES[phase]: detected.get(PHASE_NAMES[phase], float("inf")) - t_true
+              for t_true, phase, _ in flight.events}
+    settled = slice(100, None)  # skip the first 2 s while the filter converges
+    return {
+        "stream_us": metric(stream_s / n * 1e6, "us/packet", higher_is_better=False),
+        "batch_us": metric(batch_s / n * 1e6, "us/packet", higher_is_better=False),
+        "altitude_rms_m": metric(float(np.sqrt(np.mean((est[settled, 0] - c["altitude"][:n][settled]) ** 2))), "m",
+                                 higher_is_better=False),
+        "descent_rate_rms_ms": metric(float(np.sqrt(np.mean((est[settled, 1] - c["vertical_speed"][:n][settled]) ** 2))),
+                                      "m/s", higher_is_better=False),
+        "detect_us": metric(detect_s / len(fused) * 1e6, "us/packet", higher_is_better=False),
+        "events_detected": metric(len(detected), "events"),
+        "max_event_delay_s": metric(max(delays.values()), "s", higher_is_better=False),
+        # Bounds of what the detector achieves on this 50 Hz flight (see PhaseDetector)
+        "chute_delay_s": metric(max(delays["primary_chute"], delays["secondary_chute"]), "s",
+                                higher_is_better=False, limit=CHUTE_DELAY_LIMIT_S),
+        "landed_delay_s": metric(delays["landed"], "s", higher_is_better=False,
+                                 limit=settings.PHASE_LANDED_S + LANDED_SETTLE_LIMIT_S),
+    }
@@ -0,0 +1,60 @@
+# benchmarks/bench_parse.py
+# Raw line -> packet dict parse rate, and bulk serial reader throughput (ASCII and binary)
+import threading
+import time
+
+from benchmarks.common import SEED, FakeSerial, best_of, flight_lines, metric
+from data.dummy_data import MissionProfile
+from serial_comm.binary_protocol import FRAME_SIZE, BinaryFrameDecoder
+from serial_comm.port_handler import SerialHandler
+
+
+def _read_all(stream, packets):
+    """Runs read_serial_data over a fake port until `packets` are queued; returns (queued, seconds)"""
+    reader = SerialHandler()
+    reader.data_queue.maxsize = packets
+    reader.serial_port = FakeSerial(stream)
+    reader.running = True
+    thread = threading.Thread(target=reader.read_serial_data, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    while reader.data_queue.qsize() < packets and time.perf_counter() - start < 60:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    reader.running = False
+    thread.join(1.0)
+    return reader.data_queue.qsize(), elapsed
+
+
+def run(quick=False):
+    lines = flight_lines(limit=5000 if quick else 20000)
+    text = [line.decode("ascii") for line in lines]
+    handler = SerialHandler()
+    results = {}
+
+    elapsed = best_of(lambda: [handler._parse(line) for line in text])
+    results["parse_lines_per_s"] = metric(len(text) / elapsed, "lines/s")
+
+    def queue_and_drain():
+        for line in lines:
+            handler._handle_line(line)
+        handler.get_batch()
+    handler.data_queue.maxsize = len(lines)  # measure parsing, not the overflow policy
+    elapsed = best_of(queue_and_drain)
+    results["handle_and_drain_lines_per_s"] = metric(len(lines) / elapsed, "lines/s")
+
+    # read_serial_data on a fake port: bulk chunk reads + framing + queueing
+    stream = b"\r\n".join(lines) + b"\r\n"
+    queued, elapsed = _read_all(stream, len(lines))
+    results["serial_reader_lines_per_s"] = metric(queued / elapsed, "lines/s")
+    results["serial_reader_mb_per_s"] = metric(len(stream) / elapsed / 1e6, "MB/s")
+
+    # Same flight as binary frames
+    frames = MissionProfile(rate_hz=50.0, seed=SEED).frame_stream()[:len(lines) * FRAME_SIZE]
+    results["binary_bytes_per_packet"] = metric(FRAME_SIZE, "B", higher_is_better=False)
+    results["ascii_bytes_per_packet"] = metric(len(stream) / len(lines), "B", higher_is_better=False)
+    elapsed = best_of(lambda: BinaryFrameDecoder().feed(frames))
+    results["binary_decode_frames_per_s"] = metric(len(lines) / elapsed, "frames/s")
+    queued, elapsed = _read_all(frames, len(lines))
+    results["serial_reader_frames_per_s"] = metric(queued / elapsed, "frames/s")
+    return results
@@ -0,0 +1,43 @@
+# benchmarks/bench_pipeline.py
+# End to end: fake serial byte stream -> reader -> pipeline -> rendered frame
+import threading
+import time
+
+from benchmarks.bench_render import OffscreenDashboard
+from benchmarks.common import FakeSerial, flight_lines, metric
+from config import settings
+from core.pipeline import TelemetryPipeline
+
+
+def run(quick=False):
+    lines = flight_lines(rate_hz=100.0, limit=5000 if quick else 20000)
+    stream = b"\r\n".join(lines) + b"\r\n"
+    pipeline = TelemetryPipeline()
+    handler = pipeline.handler
+    handler.data_queue.maxsize = len(lines)  # measure throughput, not the overflow policy
+    handler.serial_port = FakeSerial(stream)
+    handler.running = True
+    dash = OffscreenDashboard(pipeline.store, lod=pipeline.lod)
+    frame_interval = 1.0 / settings.RENDER_MAX_FPS
+    frames = 0
+    thread = threading.Thread(target=handler.read_serial_data, daemon=True)
+    start = last_frame = time.perf_counter()
+    thread.start()
+    while pipeline.packets < len(lines) and time.perf_counter() - start < 120:
+        handler.data_queue.wait(settings.INGEST_INTERVAL_MS / 1000)
+        pipeline.poll()
+        now = time.perf_counter()
+        if now - last_frame >= frame_interval:
+            dash.render()
+            frames += 1
+            last_frame = now
+    dash.render()  # the last packet has to reach the screen too
+    frames += 1
+    elapsed = time.perf_counter() - start
+    handler.running = False
+    thread.join(1.0)
+    return {
+        "e2e_packets_per_s": metric(pipeline.packets / elapsed, "packets/s"),
+        "e2e_fps": metric(frames / elapsed, "frames/s"),
+        "e2e_dropped": metric(handler.queue_stats()["dropped"], "packets", higher_is_better=False),
+    }
@@ -0,0 +1,123 @@
+# benchmarks/bench_render.py
+# Per-frame cost of the dashboard plots on an offscreen Agg canvas
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from benchmarks.common import SEED, best_of, metric
+from config import settings
+from core.pipeline import TELEMETRY_FIELDS
+from data.dummy_data import MissionProfile
+from data.lod_store import LodStore
+from data.ring_buffer import TelemetryRingBuffer
+from gui.live_plot import LivePlot
+
+LEFT_KEYS = ["altitude", "temperature", "pressure", "vertical_speed", "voltage", "current"]
+
+
+def _styled_axes(title):
+    fig = Figure(figsize=(3, 2), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.set_title(title, color="#fff", fontsize=10)
+    ax.tick_params(axis='x', colors='#aaa')
+    ax.tick_params(axis='y', colors='#aaa')
+    fig.patch.set_facecolor(settings.THEME["background"])
+    ax.set_facecolor(settings.THEME["background"])
+    return fig, ax, FigureCanvasAgg(fig)
+
+
+class OffscreenDashboard:
+    """The six left plots and the gyro plot, built the same way as CanSatGCSApp does"""
+
+    def __init__(self, store, points=settings.MAX_DATA_POINTS, lod=None, window_s=settings.PLOT_WINDOW_S):
+        self.store = store
+        self.points = points
+        self.lod = lod
+        self.window_s = window_s
+        self.left = []
+        for key in LEFT_KEYS:
+            fig, ax, canvas = _styled_axes(key)
+            line = ax.plot([], [], color=settings.THEME["graph_line"])[0]
+            self.left.append((key, ax, canvas, LivePlot(ax, canvas, [line], points)))
+        fig, self.gyro_ax, self.gyro_canvas = _styled_axes("Gyroscope (Pitch, Roll, Yaw)")
+        lines = [self.gyro_ax.plot([], [], label=label)[0] for label in ("Pitch", "Roll", "Yaw")]
+        self.gyro_ax.legend(facecolor="#222", edgecolor="#222", labelcolor="#fff")
+        self.gyro = LivePlot(self.gyro_ax, self.gyro_canvas, lines, points)
+
+    def render(self):
+        """Same work as CanSatGCSApp._render_plots + _render_gyro"""
+        if self.lod is not None:
+            span = self.window_s or max(self.lod.last_time - self.lod.first_time, 1.0)
+            for key, _, _, plot in self.left:
+                plot.set_x_window(-span, 0)
+                plot.update([self.lod.query(key, self.window_s, self.points)])
+            self.gyro.set_x_window(-span, 0)
+            self.gyro.update([self.lod.query(f"gyro_{axis}", self.window_s, self.points) for axis in "xyz"])
+            return
+        for key, _, _, plot in self.left:
+            plot.update([self.store.view(key, self.points)])
+        self.gyro.update([self.store.view(f"gyro_{axis}", self.points) for axis in "xyz"])
+
+    def render_legacy(self):
+        """The pre-blitting approach: clear, re-plot, re-style and fully draw every figure"""
+        for key, ax, canvas, _ in self.left:
+            ax.clear()
+            ax.plot(self.store.view(key, self.points), color=settings.THEME["graph_line"])
+            ax.set_title(key, color="#fff", fontsize=10)
+            ax.tick_params(axis='x', colors='#aaa')
+            ax.tick_params(axis='y', colors='#aaa')
+            ax.set_facecolor(settings.THEME["background"])
+            canvas.draw()
+        self.gyro_ax.relim()
+        self.gyro_ax.autoscale_view()
+        self.gyro_canvas.draw()
+
+
+def profile_rows(rate_hz=10.0):
+    profile = MissionProfile(rate_hz=rate_hz, seed=SEED)
+    cols = profile.columns
+    return [dict(zip(TELEMETRY_FIELDS, vals))
+            for vals in zip(*(cols[name].tolist() for name in TELEMETRY_FIELDS))]
+
+
+def _frame_times(render, store, rows, frames):
+    times = []
+    for i in range(frames):
+        store.append(rows[i % len(rows)], timestamp=float(i))
+        start = time.perf_counter()
+        render()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times
+
+
+def run(quick=False):
+    frames = 60 if quick else 300
+    rows = profile_rows()
+    results = {}
+    store = TelemetryRingBuffer(TELEMETRY_FIELDS, settings.HISTORY_CAPACITY)
+    dash = OffscreenDashboard(store)
+    times = _frame_times(dash.render, store, rows, frames)
+    results["frame_ms_mean"] = metric(sum(times) / len(times) * 1000, "ms", higher_is_better=False)
+    results["frame_ms_p95"] = metric(times[int(len(times) * 0.95)] * 1000, "ms", higher_is_better=False)
+    results["full_redraws"] = metric(sum(p.full_draws for *_, p in dash.left) + dash.gyro.full_draws, "draws", higher_is_better=False)
+
+    store = TelemetryRingBuffer(TELEMETRY_FIELDS, settings.HISTORY_CAPACITY)
+    dash = OffscreenDashboard(store)
+    times = _frame_times(dash.render_legacy, store, rows, max(frames // 5, 10))
+    results["legacy_frame_ms_mean"] = metric(sum(times) / len(times) * 1000, "ms", higher_is_better=False)
+
+    # Full-flight plots from the LOD pyramid: a 10 s window and the whole flight should cost the same
+    flight = MissionProfile(rate_hz=50.0, seed=SEED)
+    lod = LodStore(TELEMETRY_FIELDS, settings.LOD_FACTOR, settings.HISTORY_CAPACITY)
+    for t, vals in zip(flight.columns["t"].tolist(), zip(*(flight.columns[name].tolist() for name in TELEMETRY_FIELDS))):
+        lod.append_values(t, vals)
+    for label, window in (("10s", 10), ("full_flight", None)):
+        dash = OffscreenDashboard(None, lod=lod, window_s=window)
+        dash.render()  # first frame draws the axes
+        elapsed = best_of(dash.render, repeat=max(frames // 10, 5))
+        results[f"lod_frame_ms_{label}"] = metric(elapsed * 1000, "ms", higher_is_better=False)
+    return results
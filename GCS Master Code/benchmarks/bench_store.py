@@ -0,0 +1,57 @@
+# benchmarks/bench_store.py
+# History append/trim cost at several MAX_DATA_POINTS, ring buffer vs. the old lists
+import numpy as np
+
+from benchmarks.common import best_of, metric
+from core.pipeline import TELEMETRY_FIELDS
+from data.lod_store import LodStore
+from data.ring_buffer import TelemetryRingBuffer
+
+WINDOWS = (100, 1000, 10000)
+
+
+def run(quick=False):
+    n = 20000 if quick else 100000
+    rng = np.random.default_rng(0)
+    rows = [dict(zip(TELEMETRY_FIELDS, vals)) for vals in rng.random((2000, len(TELEMETRY_FIELDS))).tolist()]
+    results = {}
+    for window in WINDOWS:
+        store = TelemetryRingBuffer(TELEMETRY_FIELDS, window)
+
+        def ring():
+            for i in range(n):
+                store.append(rows[i % len(rows)], timestamp=float(i))
+        elapsed = best_of(ring)
+        results[f"ring_append_us_w{window}"] = metric(elapsed / n * 1e6, "us/sample", higher_is_better=False)
+
+        # Previous implementation: dict of lists trimmed with pop(0)
+        history = {name: [] for name in TELEMETRY_FIELDS}
+
+        def lists():
+            for i in range(n):
+                row = rows[i % len(rows)]
+                for name in TELEMETRY_FIELDS:
+                    series = history[name]
+                    series.append(row[name])
+                    if len(series) > window:
+                        series.pop(0)
+        elapsed = best_of(lists, repeat=1)
+        results[f"list_append_us_w{window}"] = metric(elapsed / n * 1e6, "us/sample", higher_is_better=False)
+
+        elapsed = best_of(lambda: [store.view(name, window) for _ in range(100) for name in TELEMETRY_FIELDS])
+        results[f"ring_view_us_w{window}"] = metric(elapsed / (100 * len(TELEMETRY_FIELDS)) * 1e6, "us/view", higher_is_better=False)
+        elapsed = best_of(lambda: [store.window_stats("altitude", window / 2) for _ in range(100)])
+        results[f"ring_window_stats_us_w{window}"] = metric(elapsed / 100 * 1e6, "us/query", higher_is_better=False)
+
+    # Plot history pyramid: append cost and a whole-history query capped at 1000 points
+    lod = LodStore(TELEMETRY_FIELDS, raw_capacity=10000)
+    values = [list(row.values()) for row in rows]
+
+    def lod_append():
+        for i in range(n):
+            lod.append_values(float(i), values[i % len(values)])
+    elapsed = best_of(lod_append, repeat=1)
+    results["lod_append_us"] = metric(elapsed / n * 1e6, "us/sample", higher_is_better=False)
+    elapsed = best_of(lambda: [lod.query("altitude", None, 1000) for _ in range(100)])
+    results["lod_query_all_us"] = metric(elapsed / 100 * 1e6, "us/query", higher_is_better=False)
+    return results
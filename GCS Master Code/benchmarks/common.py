@@ -0,0 +1,70 @@
+# benchmarks/common.py
+# Shared helpers: reproducible input, a fake serial port and timing
+import time
+
+from data.dummy_data import MissionProfile
+
+SEED = 1234
+
+
+def flight_lines(rate_hz=50.0, limit=None):
+    """Firmware-format CSV lines of a seeded synthetic flight (identical on every run)"""
+    lines = MissionProfile(rate_hz=rate_hz, seed=SEED).csv_lines()
+    return lines[:limit] if limit else lines
+
+
+def metric(value, unit, higher_is_better=True, limit=None):
+    """One result; with a `limit` the run fails whenever the value is on the wrong side of it"""
+    m = {"value": round(value, 4), "unit": unit, "higher_is_better": higher_is_better}
+    if limit is not None:
+        m["limit"] = limit
+    return m
+
+
+def over_limit(m):
+    if "limit" not in m:
+        return False
+    return m["value"] < m["limit"] if m["higher_is_better"] else m["value"] > m["limit"]
+
+
+def best_of(fn, repeat=3):
+    """Runs fn() `repeat` times and returns the fastest wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class FakeSerial:
+    """
+    Stands in for serial.Serial: serves a byte string in chunks of at most
+    `chunk` bytes, the way the OS buffer hands them to read().
+    """
+
+    def __init__(self, data, chunk=4096):
+        self._data = memoryview(data)
+        self._pos = 0
+        self.chunk = chunk
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return min(self.chunk, len(self._data) - self._pos)
+
+    @property
+    def exhausted(self):
+        return self._pos >= len(self._data)
+
+    def read(self, size=1):
+        if self.exhausted:
+            time.sleep(0.001)  # a real port would block until its timeout
+            return b""
+        end = min(self._pos + size, len(self._data))
+        out = bytes(self._data[self._pos:end])
+        self._pos = end
+        return out
+
+    def close(self):
+        self.is_open = False
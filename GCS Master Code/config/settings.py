@@ -1,7 +1,7 @@
 # settings.py
 # Serial config, team name, and constants for CanSat GCS
 TEAM_NAME = "Team Phoenix"
-SERIAL_PORT = "COM3"
+SERIAL_PORT = None  # None: find it (serial_comm/autodetect.py)
 BAUD_RATE = 9600
 # config/settings.py
 
@@ -12,15 +12,63 @@ All modules should import constants from here to maintain consistency.
 
 # Serial Communication Settings
 BAUD_RATE = 9600
-DEFAULT_PORT = "COM3"  # Change this as per your OS or auto-detect
+DEFAULT_PORT = None  # None: probe every port for telemetry (serial_comm/autodetect.py); or e.g. "COM3"
+SERIAL_READ_TIMEOUT_S = 0.1  # Blocking read timeout; also bounds how fast the reader thread stops
+SERIAL_READ_CHUNK_BYTES = 4096  # Max bytes pulled from the OS buffer per read
+SERIAL_MAX_LINE_BYTES = 1024  # Partial lines longer than this are discarded as noise
+SERIAL_BINARY_FALLBACK_BYTES = 4096  # Binary link reverts to ASCII after this many bytes without a valid frame
+AUTO_CONNECT_PORT = None  # e.g. "COM3" or "auto": skip the port dialog and read at once (fast restart on the pad); also main.py --port
+AUTO_RECORD = False  # Start recording as soon as AUTO_CONNECT_PORT is open; also main.py --record
+
+# Telemetry Queue Settings (reader thread -> GUI)
+DATA_QUEUE_MAXSIZE = 2048  # Packets buffered before the overflow policy kicks in
+DATA_QUEUE_POLICY = "drop_oldest"  # "drop_oldest", "latest_only" or "block"
+DATA_QUEUE_BLOCK_TIMEOUT_S = 0.5  # "block" policy: wait this long for room, then drop
+
+# Port Auto-Detection (every port probed at once; main.py port dialog, --port auto)
+AUTODETECT_BAUDS = (9600, 57600, 115200, 38400, 19200)  # Tried in this order after the remembered rate and BAUD_RATE
+AUTODETECT_TIMEOUT_S = 3.0  # Give up a search round after this long without one valid packet
+AUTODETECT_SWEEP_MAX_S = 8.0  # ... unless a port that is sending hasn't been tried at every baud yet (slow packet rates)
+AUTODETECT_BAUD_DWELL_S = 0.3  # Move to the next baud after receiving this long without a valid packet
+AUTODETECT_BAUD_BYTES = 256  # ... or after this many non-text bytes with a sync word but no valid frame
+AUTODETECT_GRACE_S = 0.2  # After the first valid packet, let the other ports catch up before choosing
+AUTODETECT_ON_START = True  # Port dialog searches as soon as it opens (pick a port to stop it)
+AUTODETECT_RETRY_S = 1.0  # Port dialog: pause between search rounds until a radio shows up
+LAST_LINK_FILE = "logs/last_link.json"  # Port/baud that last delivered telemetry, tried first; None to forget
+
+# Multi-Link Ingestion (several radios / vehicles at once, serial_comm/multilink.py; python -m core --port A --port B)
+MULTILINK_DEDUP_WINDOW = 512  # Recent packets per vehicle remembered to drop copies from redundant links
+MULTILINK_RECONNECT_S = 2.0  # A link that failed or vanished is reopened this often
+
+# Link Statistics (diagnostics panel, and a *_link.csv next to each recording)
+LINK_STATS_WINDOW_S = 10  # Rolling window for byte/packet rates and the error rate
+LINK_GAP_S = 2.0  # A packet clock jump larger than this counts as a gap (the clock has 1 s resolution)
+LINK_RECORD_INTERVAL_S = 1.0  # One link statistics row per this interval while recording
 
 # Data Logging Settings
 LOG_FILE_PATH = "data/telemetry_log.csv"
-LOG_HEADERS = ["Timestamp", "Altitude", "Temperature", "Pressure", "Latitude", "Longitude", "Voltage"]
+MISSION_LOG_FILE = "logs/mission.log"  # Everything shown in the mission log, rotated; None to disable
+MISSION_LOG_FILE_MAX_BYTES = 1_000_000
+MISSION_LOG_FILE_BACKUPS = 5
+MISSION_LOG_MAX_LINES = 500  # Lines kept in the mission log widget; older ones are trimmed
+MISSION_LOG_LEVEL = "info"  # Initial severity filter: "debug", "info", "warning" or "error"
+TOAST_DURATION_MS = 6000  # Mission-event notifications close by themselves after this
+TOAST_MAX_VISIBLE = 3
+# Packet fields / recording columns are defined in config/telemetry_schema.py
+
+# Recording Settings (CSV written by a background thread)
+RECORD_FOLDER = "."
+RECORD_FORMAT = "csv"  # "csv", or "binary" for compact .cfr flight logs (convert with python -m data.flight_log)
+RECORD_BATCH_ROWS = 50  # Write as soon as this many rows are pending...
+RECORD_FLUSH_INTERVAL_S = 1.0  # ...or this much time has passed; bounds data lost on a crash
+RECORD_FSYNC_INTERVAL_S = 5.0  # Force data to disk (survives power loss) this often
+RECORD_QUEUE_SIZE = 10000  # Rows buffered for the writer before new ones are dropped
 
 # Dummy Data (for testing without live telemetry)
 USE_DUMMY_DATA = False
 DUMMY_UPDATE_INTERVAL_MS = 1000  # in milliseconds
+REPLAY_SPEED = 1.0  # Recording playback speed multiplier; None replays as fast as possible
+REPLAY_SKIP_S = 10.0  # Replay controls: seconds skipped back/forward per click
 
 # GUI Settings
 WINDOW_TITLE = "Team Phoenix - CANSAT GCS"
@@ -29,14 +77,74 @@ WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 
 # Graph Display Settings
-GRAPH_REFRESH_INTERVAL_MS = 500
-MAX_DATA_POINTS = 100  # Number of points to show in real-time graphs
+INGEST_INTERVAL_MS = 50  # How often the GUI drains the telemetry queue into history
+RENDER_MAX_FPS = 10  # Repaint cap; unchanged widgets are skipped entirely
+RENDER_MIN_FPS = 2  # Floor the scheduler may drop to when frames overrun their budget
+LATENCY_WINDOW = 2048  # Packets in the rolling latency percentiles (diagnostics panel)
+MAX_DATA_POINTS = 1000  # Max points drawn per line, whatever the visible time window
+PLOT_WINDOW_S = 60  # Initial visible window in seconds; None shows the whole flight
+PLOT_WINDOW_PRESETS_S = [10, 60, 300, None]  # Zoom buttons above the plots (None = "All")
+PLOT_MIN_WINDOW_S = 2  # Mouse-wheel zoom limit
+LOD_FACTOR = 4  # Samples per min/max bucket at each level of the plot history pyramid
+HISTORY_CAPACITY = 36000  # Samples kept in memory per field (1 h at 10 Hz); older ones are overwritten
+
+# Map Settings
+MAP_TILE_SERVER = "https://a.tile.openstreetmap.org/{z}/{x}/{y}.png"  # Live map tiles (TkinterMapView's default), or a local tile server
+MAP_PREFETCH_SERVER = "http://localhost:8080/tile/{z}/{x}/{y}.png"  # Bulk prefetch source, a local tile server; OSM's public servers forbid prefetching
+MAP_TILE_CACHE_PATH = "map_tiles.db"  # Fill before a launch with: python -m data.tile_cache --bbox ...
+MAP_TILE_CACHE_MAX_MB = 200  # Least recently used tiles are evicted beyond this
+MAP_OFFLINE = False  # Only use cached tiles (no internet at the launch site)
+MAP_ZOOM = 15
+MAP_MIN_MOVE_M = 5.0  # Marker moves smaller than this are ignored (GPS jitter)
+MAP_MIN_INTERVAL_S = 1.0  # At most one marker move per interval
+MAP_RECENTER_M = 200.0  # Recentre the view (and load tiles) only when the CanSat is this far from the centre
+MAP_TRACK_MIN_STEP_M = 10.0  # Spacing of points on the flown-track polyline
+MAP_TRACK_MAX_POINTS = 500  # The track is decimated by half whenever it grows past this
+
+# Altitude / Descent-Rate Fusion (Kalman filter over barometric altitude, core/fusion.py)
+FUSION_SEA_LEVEL_HPA = 1013.25  # Reference pressure; the launch site's ground pressure gives height above ground
+FUSION_BARO_NOISE_M = 2.0  # Standard deviation of the barometric altitude
+FUSION_PROCESS_ACCEL = 2.0  # Unmodelled vertical acceleration (m/s²): higher follows chute openings faster, but noisier
+FUSION_ACCEL_FIELD = None  # Schema field with vertical acceleration (m/s², up positive), once the firmware sends one
+FUSION_ACCEL_NOISE = 0.3  # Standard deviation of that acceleration (m/s²)
+
+# Mission Phase Detection (core/phase_detector.py; thresholds on the fused estimates)
+PHASE_GROUND_ALT_M = 0.0  # Fused altitude of the landing site; phase heights are above this
+PHASE_FALL_MS = 10.0  # Descent rate that marks ejection
+PHASE_FREEFALL_MS = 20.0  # Free fall is faster than this; dropping back below it means the primary chute opened
+PHASE_SECONDARY_MS = 6.0  # Descent rate under the secondary chute is below this
+PHASE_EXPANSION_AGL_M = 450.0
+PHASE_BEACON_AGL_M = 20.0
+PHASE_STILL_MS = 1.0  # Landed: barometric altitude trend within ±this (m/s)...
+PHASE_LANDED_S = 2.0  # ...for this long at least (longer on a slow link, see PhaseDetector)
+PHASE_FREEFALL_WAIT_S = 2.0  # Ejection without visible free fall: primary chute taken as open after this
+PHASE_SHOCK_MS2 = 30.0  # Acceleration magnitude of a chute opening (only used with FUSION_ACCEL_FIELD)
+PHASE_HYSTERESIS_MS = 2.0  # Hysteresis band of the descent-rate thresholds
+PHASE_HYSTERESIS_M = 5.0  # Hysteresis band of the height thresholds
+PHASE_SETTLE_S = 2.0  # Ignore packets this long after the altitude filter (re)starts...
+PHASE_SETTLE_SAMPLES = 3  # ...and until it has had this many, whatever the packet rate
+PHASE_RAW_WINDOW_S = 1.25  # Chute openings are also confirmed by the raw baro rate over this window (see PhaseDetector)
+PHASE_RAW_MAX_STD_MS = 2.5  # ...if that rate is this certain (~50 Hz packets); below, the fused rate alone decides
+PHASE_NOTIFY = ("primary_chute", "secondary_chute")  # Phases that also raise an operator notification
+
+# Post-flight Analysis (python -m analysis recordings/ --plots plots --report report.csv)
+ANALYSIS_JOBS = None  # Worker processes; None = one per CPU core
+ANALYSIS_PLOT_DPI = 100
+
+# Telemetry Broadcast (other laptops/displays on the local network)
+BROADCAST_ENABLED = False  # Serve live telemetry from the dashboard; the headless CLI uses --serve
+BROADCAST_HOST = "127.0.0.1"  # "0.0.0.0" to accept clients from other machines
+BROADCAST_TCP_PORT = 5760  # Newline-delimited JSON, one message per packet/event
+BROADCAST_WS_PORT = 8765  # WebSocket at /ws (needs fastapi + uvicorn); None to disable
+BROADCAST_CLIENT_BUFFER = 256  # Messages buffered per client before its oldest are dropped
+BROADCAST_CLIENT_POLICY = "drop_oldest"  # or "latest_only" for displays that only need the newest packet
 
 # Theme / Color Palette
 THEME = {
     "background": "#1e1e1e",
     "text": "#ffffff",
     "graph_line": "#00ffcc",
+    "fused_line": "#ff9f1c",  # filtered altitude / descent rate drawn over the raw readings
     "grid": "#444444"
 }
 
@@ -0,0 +1,36 @@
+# config/telemetry_schema.py
+# The telemetry packet layout, defined once.
+#
+# Everything that knows about packet fields derives from FIELDS: the CSV/JSON
+# decoder (serial_comm/decoder.py), the binary frame layout, the in-memory
+# history, recordings, replay and the plot titles. Adding a sensor is one line
+# here (plus the firmware that sends it).
+from collections import namedtuple
+
+# name:  row key, recording column and CSV position (list order = firmware order)
+# json:  key path in JSON packets; "|" separates accepted alternatives
+# wire:  struct code in binary frames; value on the wire = round(value * scale)
+# label: plot / display title
+Field = namedtuple("Field", "name json wire scale label")
+
+FIELDS = [
+    Field("voltage", "voltage", "H", 1000, "Voltage (V)"),
+    Field("gps_lat", "gps.lat|gps_lat", "i", 10_000_000, "Latitude (°)"),
+    Field("gps_lon", "gps.lon|gps_lon", "i", 10_000_000, "Longitude (°)"),
+    Field("altitude", "altitude", "i", 100, "Altitude (m)"),
+    Field("temperature", "temperature", "h", 100, "Temperature (°C)"),
+    Field("pressure", "pressure", "H", 10, "Pressure (hPa)"),
+    Field("vertical_speed", "vertical_speed", "h", 100, "Velocity (m/s)"),
+    Field("current", "current", "h", 1000, "Current (A)"),
+    Field("gyro_x", "gyro.x|gyro_x|x", "h", 100, "Gyro X"),
+    Field("gyro_y", "gyro.y|gyro_y|y", "h", 100, "Gyro Y"),
+    Field("gyro_z", "gyro.z|gyro_z|z", "h", 100, "Gyro Z"),
+    Field("battery", "battery", "H", 100, "Battery (%)"),
+    # 'HH:MM:SS' on the CSV/JSON link; stored and framed as seconds since midnight
+    Field("time", "time", "I", 1, "Time"),
+]
+
+TIME_FIELD = "time"
+FIELD_NAMES = [f.name for f in FIELDS]
+INDEX = {name: i for i, name in enumerate(FIELD_NAMES)}
+LABELS = {f.name: f.label for f in FIELDS}
@@ -0,0 +1,3 @@
+# conftest.py
+# test_gui.py is a manual Tk smoke check: it opens a window and blocks in mainloop
+collect_ignore = ["test_gui.py"]
@@ -0,0 +1 @@
+# core package init: headless telemetry pipeline (no Tk imports allowed here)
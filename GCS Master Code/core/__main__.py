@@ -0,0 +1,149 @@
+# core/__main__.py
+# Headless recorder/monitor: python -m core --port COM3 --record
+import argparse
+import signal
+import sys
+import threading
+import time
+
+from config import settings
+from core.event_bus import EventBus, LOG, NOTIFY
+from core.pipeline import TelemetryPipeline
+
+
+def _replay_commands(replay, stream=None):
+    """
+    Replay control from standard input, one command per line:
+    p (pause/resume), +N / -N (skip N seconds), N (go to N seconds), ? (stats)
+    """
+    for line in stream or sys.stdin:
+        command = line.strip()
+        try:
+            if command == "p":
+                (replay.resume if replay.paused else replay.pause)()
+            elif command[:1] in "+-" and command[1:]:
+                replay.skip(float(command))
+            elif command and command != "?":
+                replay.seek(float(command))
+            elif not command:
+                continue
+        except ValueError:
+            print(f"[WARN] Unknown replay command {command!r}: p, +N, -N, N or ?")
+            continue
+        print("[INFO] " + replay.summary_text())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core", description="Headless CanSat telemetry recorder and monitor")
+    parser.add_argument("--port", action="append", help="serial port to read, e.g. COM3 or /dev/ttyUSB0 (PORT@BAUD for "
+                                                        "another rate, \"auto\" to find it); repeat for redundant radios, "
+                                                        "duplicates are dropped")
+    parser.add_argument("--tcp", action="append", metavar="HOST:PORT", help="also read a telemetry stream over TCP, "
+                                                                            "e.g. from a networked radio; can be repeated")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", metavar="FILE", help="play back a recording (.csv/.cfr) or raw capture")
+    source.add_argument("--simulate", metavar="HZ", type=float, help="synthetic mission profile at this packet rate")
+    parser.add_argument("--baud", type=int, default=settings.BAUD_RATE)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay/simulation speed, 0 = as fast as possible")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --simulate")
+    parser.add_argument("--start", type=float, default=0.0, metavar="S", help="replay/simulation: start S seconds in")
+    parser.add_argument("--record", action="store_true", help="record every packet")
+    parser.add_argument("--format", choices=["csv", "binary"], default=settings.RECORD_FORMAT)
+    parser.add_argument("--folder", default=settings.RECORD_FOLDER, help="recording folder")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--serve", action="store_true", help="broadcast telemetry to local TCP/WebSocket clients")
+    parser.add_argument("--tcp-port", type=int, default=settings.BROADCAST_TCP_PORT)
+    parser.add_argument("--ws-port", type=int, default=settings.BROADCAST_WS_PORT)
+    parser.add_argument("--status-interval", type=float, default=2.0, help="seconds between status lines, 0 = quiet")
+    args = parser.parse_args(argv)
+    live = bool(args.port or args.tcp)
+    if live == bool(args.replay or args.simulate):
+        parser.error("choose one source: --port/--tcp, --replay or --simulate")
+
+    bus = EventBus()
+    bus.subscribe(LOG, print)
+    bus.subscribe(NOTIFY, lambda msg: print(f"[NOTIFY] {msg}"))
+    links = [port.partition("@") for port in args.port or []]
+    multilink = None
+    if len(links) > 1 or args.tcp:
+        if any(port == "auto" for port, _, _ in links):
+            parser.error("--port auto finds a single radio; name the ports to read several")
+        # One asyncio thread for every link, one stream of deduplicated packets
+        from serial_comm.multilink import MultiLinkHandler
+        multilink = MultiLinkHandler(bus)
+    pipeline = TelemetryPipeline(bus, multilink)
+    replay = None
+    if multilink:
+        for port, _, baud in links:
+            multilink.add_serial(port, port, int(baud) if baud else args.baud)
+        for address in args.tcp or []:
+            host, _, port = address.rpartition(":")
+            multilink.add_tcp(address, host or "127.0.0.1", int(port))
+    elif links:
+        port, _, baud = links[0]
+        if not pipeline.handler.connect(port, int(baud) if baud else args.baud):
+            return 1
+    else:
+        from serial_comm.replay import ReplaySource
+        speed = args.speed or None
+        if args.replay:
+            replay = ReplaySource(pipeline.handler, args.replay, speed=speed)
+        else:
+            from data.dummy_data import MissionProfile
+            replay = ReplaySource.from_profile(pipeline.handler, MissionProfile(rate_hz=args.simulate, seed=args.seed), speed=speed)
+        if args.start:
+            replay.seek(args.start)
+        replay.start()
+        threading.Thread(target=_replay_commands, args=(replay,), name="ReplayCommands", daemon=True).start()
+    if args.record:
+        pipeline.start_recording(args.folder, args.format)
+    broadcaster = None
+    if args.serve:
+        from core.broadcast import TelemetryBroadcaster
+        broadcaster = TelemetryBroadcaster(bus, settings.BROADCAST_HOST, args.tcp_port, args.ws_port,
+                                           settings.BROADCAST_CLIENT_BUFFER, settings.BROADCAST_CLIENT_POLICY)
+        broadcaster.start()
+
+    worker = threading.Thread(target=pipeline.run, name="TelemetryPipeline", daemon=True)
+    worker.start()
+    signal.signal(signal.SIGINT, lambda *_: pipeline.stop())
+    started = last_status = time.monotonic()
+    last_packets = 0
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+            now = time.monotonic()
+            if args.duration and now - started >= args.duration:
+                break
+            if replay and replay.finished and pipeline.handler.data_queue.empty():
+                break
+            if args.status_interval and now - last_status >= args.status_interval:
+                rate = (pipeline.packets - last_packets) / (now - last_status)
+                q = pipeline.handler.queue_stats()
+                link = pipeline.handler.link.stats()
+                alt = pipeline.store.latest("altitude")
+                print(f"[STATUS] {pipeline.packets} packets, {rate:.1f} pkt/s, altitude {alt if alt is not None else '--'} m, "
+                      f"queue {q['depth']}/{q['maxsize']}, dropped {q['dropped']}, "
+                      f"link {link['bytes_per_s']:.0f} B/s, errors {link['error_rate'] * 100:.1f}%, "
+                      f"lost {link['lost_packets']}, gaps {link['gaps']}"
+                      + (f", clients {len(broadcaster.clients)}" if broadcaster else ""))
+                if replay:
+                    print("         " + replay.summary_text())
+                if multilink:
+                    print("         " + ", ".join(
+                        f"{s['name']}: {s['total_packets']} pkts ({s['duplicates']} dup)"
+                        + ("" if s["connected"] else " [down]") for s in multilink.stats()["links"]))
+                last_status, last_packets = now, pipeline.packets
+    finally:
+        if replay:
+            replay.stop()
+        pipeline.shutdown()
+        worker.join(1.0)
+        if broadcaster:
+            broadcaster.stop()
+    print(f"[✓] Done: {pipeline.packets} packets ingested.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
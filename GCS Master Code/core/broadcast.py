@@ -0,0 +1,208 @@
+# core/broadcast.py
+# Local fan-out of decoded telemetry to other displays over TCP and WebSocket
+__all__ = ["TelemetryBroadcaster", "create_app"]
+
+import asyncio
+import json
+import socket
+import socketserver
+import threading
+import time
+
+from core.event_bus import EVENT, PACKET
+from serial_comm.telemetry_queue import BLOCK, TelemetryQueue
+
+
+class _Message:
+    """One bus message, serialized once and shared by every client queue"""
+
+    __slots__ = ("text", "line")
+
+    def __init__(self, topic, payload):
+        if isinstance(payload, dict):
+            # NaN (missing reading) is not valid JSON; send null instead
+            payload = {k: (None if isinstance(v, float) and v != v else v) for k, v in payload.items()}
+        self.text = json.dumps({"topic": topic, "data": payload}, separators=(",", ":"))
+        self.line = (self.text + "\n").encode("utf-8")
+
+
+class _Client:
+    def __init__(self, name, maxsize, policy, sock=None):
+        self.name = name
+        self.sock = sock  # TCP clients: shut down by stop() to end a sendall() in progress
+        self.queue = TelemetryQueue(maxsize, policy)
+        self.connected = time.time()
+        self.sent = 0
+
+
+class TelemetryBroadcaster:
+    """
+    Streams every PACKET and EVENT published on the bus to any number of clients,
+    as newline-delimited JSON over TCP and, with fastapi/uvicorn installed, as
+    WebSocket text messages.
+
+    Each message is serialized once, then the same object is put on every
+    client's bounded TelemetryQueue. A client that can't keep up loses its oldest
+    messages ("drop_oldest") or only ever gets the newest ("latest_only"); the
+    publisher never waits on a socket, so a stalled viewer can't slow ingestion.
+    """
+
+    def __init__(self, bus, host="127.0.0.1", tcp_port=5760, ws_port=None, client_buffer=256, policy="drop_oldest"):
+        if policy == BLOCK:
+            raise ValueError("A blocking client policy would let one viewer stall the pipeline")
+        self.bus = bus
+        self.host = host
+        self.tcp_port = tcp_port
+        self.ws_port = ws_port
+        self.client_buffer = client_buffer
+        self.policy = policy
+        self.messages = 0
+        self.clients = {}
+        self._lock = threading.Lock()
+        self._tcp = None
+        self._ws = None
+        self._threads = []
+        self._stopping = threading.Event()  # client loops end when set
+
+    # Publisher side (runs in the thread that publishes on the bus)
+
+    def _on_message(self, topic, payload):
+        with self._lock:
+            clients = list(self.clients.values())
+        self.messages += 1
+        if not clients:
+            return
+        message = _Message(topic, payload)
+        for client in clients:
+            client.queue.put(message)
+
+    def _on_packet(self, payload):
+        self._on_message(PACKET, payload)
+
+    def _on_event(self, payload):
+        self._on_message(EVENT, payload)
+
+    def _add_client(self, name, sock=None):
+        client = _Client(name, self.client_buffer, self.policy, sock)
+        with self._lock:
+            self.clients[id(client)] = client
+        return client
+
+    def _remove_client(self, client):
+        with self._lock:
+            self.clients.pop(id(client), None)
+
+    # Servers
+
+    def start(self):
+        self._stopping.clear()
+        self.bus.subscribe(PACKET, self._on_packet)
+        self.bus.subscribe(EVENT, self._on_event)
+        if self.tcp_port is not None:
+            self._tcp = _TCPServer((self.host, self.tcp_port), _TCPHandler)
+            self._tcp.broadcaster = self
+            self.tcp_port = self._tcp.server_address[1]  # resolves port 0
+            self._spawn(self._tcp.serve_forever, "BroadcastTCP")
+            print(f"[✓] Telemetry broadcast on tcp://{self.host}:{self.tcp_port}")
+        if self.ws_port is not None:
+            try:
+                import uvicorn
+                app = create_app(self)
+            except ImportError as e:
+                print(f"[WARN] WebSocket broadcast disabled ({e}); install fastapi and uvicorn.")
+            else:
+                config = uvicorn.Config(app, host=self.host, port=self.ws_port, log_level="warning")
+                self._ws = uvicorn.Server(config)
+                self._spawn(self._ws.run, "BroadcastWS")
+                print(f"[✓] Telemetry broadcast on ws://{self.host}:{self.ws_port}/ws")
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self):
+        self.bus.unsubscribe(PACKET, self._on_packet)
+        self.bus.unsubscribe(EVENT, self._on_event)
+        self._stopping.set()
+        with self._lock:
+            clients = list(self.clients.values())
+        for client in clients:
+            if client.sock is not None:
+                try:
+                    client.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # already gone
+        if self._tcp:
+            self._tcp.shutdown()
+            self._tcp.server_close()
+        if self._ws:
+            self._ws.should_exit = True
+        for thread in self._threads:
+            thread.join(2.0)
+
+    def stats(self):
+        with self._lock:
+            clients = list(self.clients.values())
+        return {
+            "messages": self.messages,
+            "clients": [
+                {"name": c.name, "sent": c.sent, "dropped": c.queue.dropped, "pending": c.queue.qsize()}
+                for c in clients
+            ],
+        }
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TCPHandler(socketserver.BaseRequestHandler):
+    """One sender thread per TCP client; writes whatever is queued in one sendall()"""
+
+    def handle(self):
+        broadcaster = self.server.broadcaster
+        client = broadcaster._add_client(f"tcp:{self.client_address[0]}:{self.client_address[1]}", self.request)
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while not broadcaster._stopping.is_set():
+                if not client.queue.wait(0.5):
+                    continue
+                batch = client.queue.drain()
+                self.request.sendall(b"".join(m.line for m in batch))
+                client.sent += len(batch)
+        except OSError:
+            pass  # client went away
+        finally:
+            broadcaster._remove_client(client)
+
+
+def create_app(broadcaster):
+    """FastAPI app with a /ws telemetry stream and /stats; imported lazily (optional dependency)"""
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+    app = FastAPI(title="CanSat GCS telemetry")
+
+    @app.get("/stats")
+    def stats():
+        return broadcaster.stats()
+
+    @app.websocket("/ws")
+    async def stream(websocket: WebSocket):
+        await websocket.accept()
+        client = broadcaster._add_client(f"ws:{websocket.client.host}:{websocket.client.port}")
+        try:
+            while not broadcaster._stopping.is_set():
+                # The queue is thread-based; wait for data off the event loop
+                if not await asyncio.to_thread(client.queue.wait, 0.5):
+                    continue
+                for message in client.queue.drain():
+                    await websocket.send_text(message.text)
+                    client.sent += 1
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            broadcaster._remove_client(client)
+
+    return app
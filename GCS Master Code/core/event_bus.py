@@ -0,0 +1,49 @@
+# core/event_bus.py
+# Lightweight in-process publish/subscribe bus
+__all__ = ["EventBus"]
+
+import queue
+import threading
+from collections import defaultdict
+
+# Topics used across the GCS
+PACKET = "packet"   # payload: flat telemetry row (dict keyed by schema field names, time as 'HH:MM:SS')
+LOG = "log"         # payload: mission log line, e.g. "[WARN] ..."
+EVENT = "event"     # payload: dict describing a mission event
+NOTIFY = "notify"   # payload: short operator notification text
+
+
+class EventBus:
+    """
+    Synchronous pub/sub: publish() calls every subscriber in the publisher's thread.
+    Subscribers that must run on another thread (e.g. Tk widgets) should use a
+    mailbox() queue and drain it from their own loop instead.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(tuple)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, callback):
+        with self._lock:
+            self._subscribers[topic] = self._subscribers[topic] + (callback,)
+        return callback
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            self._subscribers[topic] = tuple(cb for cb in self._subscribers[topic] if cb is not callback)
+
+    def publish(self, topic, payload=None):
+        # The subscriber tuple is replaced, never mutated, so no lock is needed here
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"[!] Event bus subscriber for {topic!r} failed: {e}")
+
+    def mailbox(self, *topics):
+        """Returns a thread-safe queue that receives (topic, payload) for the given topics"""
+        box = queue.SimpleQueue()
+        for topic in topics:
+            self.subscribe(topic, lambda payload, topic=topic: box.put((topic, payload)))
+        return box
@@ -0,0 +1,276 @@
+# core/fusion.py
+# Altitude / descent-rate estimation from barometric pressure (optionally fused with acceleration)
+__all__ = ["AltitudeFilter", "FUSED_FIELDS", "SampleClock", "fuse_batch", "pressure_to_altitude", "sample_times"]
+
+import math
+
+import numpy as np
+
+# Columns the pipeline appends to every row. Descent rate is positive while
+# falling, the same sign as the packets' vertical_speed.
+FUSED_FIELDS = ["fused_altitude", "fused_descent_rate"]
+
+# ISA troposphere, the inverse of the formula in SerialHandler.generate_dummy_packet:
+#   p = p0 * (1 - 0.0065 h / 288.15) ** 5.255
+_T0_K = 288.15
+_LAPSE = 0.0065
+_EXPONENT = 1 / 5.255
+
+
+def pressure_to_altitude(pressure_hpa, sea_level_hpa=1013.25):
+    """Barometric altitude in metres; works on scalars and NumPy arrays"""
+    return _T0_K / _LAPSE * (1 - (np.asarray(pressure_hpa, dtype=np.float64) / sea_level_hpa) ** _EXPONENT)
+
+
+class AltitudeFilter:
+    """
+    Two-state Kalman filter (altitude, vertical velocity) updated once per packet.
+
+    Each sample predicts the state forward by the time since the previous one,
+    then corrects it with the barometric altitude. With a vertical acceleration
+    reading (m/s², gravity removed, up positive) the prediction integrates it and
+    the process noise is the accelerometer's; without one, acceleration is
+    unmodelled and `process_accel` sets how quickly the velocity may change (a
+    parachute opening). Everything is scalar arithmetic, O(1) per sample.
+
+    Readings more than `gate_sigma` standard deviations from the prediction are
+    ignored as glitches; after `max_rejects` in a row, or rejections for more
+    than `max_coast_s` (two packets on a 1 Hz link: not a glitch but a change
+    the filter missed), the filter restarts from the measurement, as it does
+    after a gap of more than `max_gap_s`.
+    """
+
+    def __init__(self, baro_noise_m=1.0, process_accel=2.0, accel_noise=0.3, sea_level_hpa=1013.25,
+                 gate_sigma=6.0, max_rejects=10, max_gap_s=5.0, max_coast_s=1.0):
+        self.baro_var = baro_noise_m ** 2
+        self.process_var = process_accel ** 2
+        self.accel_var = accel_noise ** 2
+        self.sea_level_hpa = sea_level_hpa
+        self.gate2 = gate_sigma ** 2
+        self.max_rejects = max_rejects
+        self.max_gap_s = max_gap_s
+        self.max_coast_s = max_coast_s
+        self.rejected = 0
+        self.reset()
+
+    def reset(self):
+        self.altitude = math.nan
+        self.measured = math.nan  # barometric altitude of the last sample, unfiltered
+        self.velocity = 0.0  # up positive
+        self.p00 = self.p01 = self.p11 = 0.0
+        self.last_t = None
+        self.started = None  # time of the last (re)start; estimates settle from there
+        self._rejects = 0
+
+    @property
+    def rate_std(self):
+        """Standard deviation of the velocity estimate (m/s); large until the filter has settled"""
+        return math.sqrt(self.p11) if self.last_t is not None else math.inf
+
+    @property
+    def coasting(self):
+        """True while readings are being rejected: the estimates are a prediction only"""
+        return self._rejects > 0
+
+    def _restart(self, z, t):
+        self.altitude = z
+        self.p00 = self.baro_var
+        self.p01 = 0.0
+        self.p11 = 100.0  # velocity unknown: ±10 m/s
+        self.last_t = self.started = self._accepted_t = t
+        self._rejects = 0
+
+    def update(self, t, pressure_hpa, accel=None):
+        """
+        Feeds one sample taken at time t (seconds); returns (altitude, descent_rate),
+        NaN until the first valid pressure. A NaN pressure only advances the prediction.
+        """
+        z = math.nan
+        if pressure_hpa == pressure_hpa and pressure_hpa > 0:
+            z = _T0_K / _LAPSE * (1 - (pressure_hpa / self.sea_level_hpa) ** _EXPONENT)
+        self.measured = z
+        if self.last_t is None or t - self.last_t > self.max_gap_s:
+            if z == z:
+                self._restart(z, t)
+                self.velocity = 0.0
+            return self.altitude, -self.velocity if self.last_t is not None else math.nan
+
+        # Predict
+        dt = t - self.last_t
+        if dt > 0:
+            self.last_t = t
+            a = accel if accel is not None and accel == accel else None
+            q = self.process_var if a is None else self.accel_var
+            dt2 = dt * dt
+            self.altitude += self.velocity * dt
+            if a is not None:
+                self.altitude += 0.5 * a * dt2
+                self.velocity += a * dt
+            p00, p01, p11 = self.p00, self.p01, self.p11
+            self.p00 = p00 + 2 * dt * p01 + dt2 * p11 + q * dt2 * dt2 / 4
+            self.p01 = p01 + dt * p11 + q * dt2 * dt / 2
+            self.p11 = p11 + q * dt2
+
+        # Correct
+        if z == z:
+            y = z - self.altitude
+            s = self.p00 + self.baro_var
+            if y * y > self.gate2 * s:
+                self.rejected += 1
+                self._rejects += 1
+                if self._rejects >= self.max_rejects or t - self._accepted_t > self.max_coast_s:
+                    self._restart(z, t)
+            else:
+                self._rejects = 0
+                self._accepted_t = t
+                k0 = self.p00 / s
+                k1 = self.p01 / s
+                self.altitude += k0 * y
+                self.velocity += k1 * y
+                self.p11 -= k1 * self.p01
+                self.p01 *= 1 - k0
+                self.p00 *= 1 - k0
+        return self.altitude, -self.velocity
+
+
+class SampleClock:
+    """
+    Sub-second sample times from the whole-second packet clock.
+
+    Packets within one clock second are placed by their arrival time, scaled by
+    how long the previous second took to arrive. Estimates therefore stay in
+    flight time when a recording is replayed at 4x or at full speed, where
+    arrival times alone would be compressed.
+    """
+
+    def __init__(self):
+        self.second = None
+        self.start = None
+        self.period = None
+        self.day = 0.0
+
+    def __call__(self, clock, arrival):
+        if clock != self.second:
+            if self.second is not None and clock < self.second - 43200:
+                self.day += 86400.0  # midnight
+            consecutive = self.second is not None and (clock - self.second) % 86400.0 == 1.0
+            self.period = arrival - self.start if consecutive and arrival > self.start else None
+            self.second = clock
+            self.start = arrival
+        fraction = (arrival - self.start) / self.period if self.period else 0.0
+        return self.day + clock + min(fraction, 0.999)
+
+
+def _steady_state_gain(dt, baro_var, q, iterations=10000, tol=1e-12):
+    """Converged Kalman gain (k0, k1) for a fixed sample interval, and the samples it took to converge"""
+    p00, p01, p11 = baro_var, 0.0, 100.0
+    k0 = k1 = 0.0
+    dt2 = dt * dt
+    for step in range(1, iterations + 1):
+        p00, p01, p11 = (p00 + 2 * dt * p01 + dt2 * p11 + q * dt2 * dt2 / 4,
+                         p01 + dt * p11 + q * dt2 * dt / 2,
+                         p11 + q * dt2)
+        s = p00 + baro_var
+        new_k0, new_k1 = p00 / s, p01 / s
+        p11 -= new_k1 * p01
+        p01 *= 1 - new_k0
+        p00 *= 1 - new_k0
+        if abs(new_k0 - k0) < tol and abs(new_k1 - k1) < tol:
+            break
+        k0, k1 = new_k0, new_k1
+    return new_k0, new_k1, step
+
+
+def _linear_scan(A, u, x0, block=64):
+    """
+    All states of x[k] = A @ x[k-1] + u[k] (x[-1] = x0), computed in blocks.
+
+    Within a block the response to its inputs is one matrix product with the
+    block-Toeplitz matrix of powers of A; only the state carried from one block
+    into the next is sequential, so the Python loop runs len(u) / block times.
+    """
+    n = len(u)
+    nb = -(-n // block)
+    padded = np.zeros((nb * block, 2))
+    padded[:n] = u
+    powers = np.empty((block + 1, 2, 2))
+    powers[0] = np.eye(2)
+    for j in range(1, block + 1):
+        powers[j] = A @ powers[j - 1]
+    lag = np.arange(block)[:, None] - np.arange(block)[None, :]
+    # M[j, i] = A^(j - i) for i <= j, laid out as a (2 block x 2 block) matrix
+    M = np.where((lag >= 0)[..., None, None], powers[np.maximum(lag, 0)], 0.0)
+    M = M.transpose(0, 2, 1, 3).reshape(2 * block, 2 * block)
+    Y = (padded.reshape(nb, 2 * block) @ M.T).reshape(nb, block, 2)
+    carry = np.empty((nb, 2))
+    x = np.asarray(x0, dtype=np.float64)
+    for b in range(nb):
+        carry[b] = x
+        x = powers[block] @ x + Y[b, -1]
+    X = Y + np.einsum("jab,nb->nja", powers[1:], carry)
+    return X.reshape(-1, 2)[:n]
+
+
+def fuse_batch(t, pressure_hpa, accel=None, baro_noise_m=1.0, process_accel=2.0, accel_noise=0.3,
+               sea_level_hpa=1013.25):
+    """
+    Whole-recording version of AltitudeFilter: (altitude, descent_rate) arrays.
+
+    Assumes a steady sample rate (the median interval of t). Once the filter's
+    gain has converged it is a fixed linear recursion, which runs as a blocked
+    NumPy scan; only the first samples, until then, go through AltitudeFilter.
+    Missing pressures are interpolated and no readings are gated, otherwise the
+    result equals the streaming filter's.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    n = len(t)
+    pressure = np.asarray(pressure_hpa, dtype=np.float64)
+    z = pressure_to_altitude(np.where(pressure > 0, pressure, np.nan), sea_level_hpa)
+    valid = ~np.isnan(z)
+    if n < 2 or not valid.any():
+        return np.full(n, np.nan), np.full(n, np.nan)
+    if not valid.all():
+        z = np.interp(t, t[valid], z[valid])
+        pressure = sea_level_hpa * (1 - z * _LAPSE / _T0_K) ** 5.255
+    if accel is not None:
+        accel = np.nan_to_num(np.asarray(accel, dtype=np.float64))
+    dt = float(np.median(np.diff(t)))
+    q = (accel_noise if accel is not None else process_accel) ** 2
+    k0, k1, warmup = _steady_state_gain(dt, baro_noise_m ** 2, q)
+    warmup = min(warmup, n)
+
+    altitude = np.empty(n)
+    descent = np.empty(n)
+    f = AltitudeFilter(baro_noise_m, process_accel, accel_noise, sea_level_hpa, gate_sigma=math.inf, max_gap_s=math.inf)
+    for i in range(warmup):
+        altitude[i], descent[i] = f.update(i * dt, pressure[i], None if accel is None else accel[i])
+    if warmup == n:
+        return altitude, descent
+
+    # predict x- = F x + G a, correct x = x- + K (z - H x-):  x = (I - K H) F x + (I - K H) G a + K z
+    IKH = np.array([[1 - k0, 0.0], [-k1, 1.0]])
+    A = IKH @ np.array([[1.0, dt], [0.0, 1.0]])
+    u = np.outer(z[warmup:], [k0, k1])
+    if accel is not None:
+        u += np.outer(accel[warmup:], IKH @ np.array([dt * dt / 2, dt]))
+    x = _linear_scan(A, u, (f.altitude, f.velocity))
+    altitude[warmup:] = x[:, 0]
+    descent[warmup:] = -x[:, 1]
+    return altitude, descent
+
+
+def sample_times(clock):
+    """
+    Sample times (s since the first row) for rows that only carry a whole-second
+    clock, e.g. recordings: the rows of each clock second are spread evenly over
+    it, so a gap in the clock stays a gap. Midnight rollover is handled.
+    """
+    clock = np.asarray(clock, dtype=np.float64)
+    n = len(clock)
+    if n == 0:
+        return np.zeros(0)
+    elapsed = np.concatenate(([0.0], np.cumsum(np.diff(clock) % 86400.0)))
+    starts = np.flatnonzero(np.concatenate(([True], elapsed[1:] != elapsed[:-1])))
+    counts = np.diff(np.append(starts, n))
+    second = np.repeat(np.arange(len(starts)), counts)
+    return elapsed + (np.arange(n) - starts[second]) / counts[second]
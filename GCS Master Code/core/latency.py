@@ -0,0 +1,124 @@
+# core/latency.py
+# Per-packet latency tracing from serial byte arrival to pixels on screen
+__all__ = ["LatencyTracker", "STAGES"]
+
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from data.ring_buffer import TelemetryRingBuffer
+
+# A packet's trace is a list of time.perf_counter() stamps, appended stage by stage:
+#   0 read          chunk holding the line came back from the port
+#   1 enqueue       framed (and JSON-decoded) line put on the telemetry queue
+#   2 dequeue       drained by the consumer
+#   3 parsed        turned into a packet dict
+#   4 stored        appended to the history (and handed to the recorder)
+#   5 render start  first frame after storing began painting
+#   6 render end    that frame finished
+STAGES = [
+    ("read_to_enqueue", 0, 1),
+    ("queue_wait", 1, 2),
+    ("parse", 2, 3),
+    ("store", 3, 4),
+    ("render_wait", 4, 5),
+    ("render", 5, 6),
+]
+
+
+class LatencyTracker:
+    """
+    Collects packet traces and keeps rolling per-stage statistics.
+
+    The last `window` packets are kept per stage (plus the end-to-end total) for
+    p50/p95/p99, and every packet is counted into log-spaced histograms. Work is
+    done in one vectorized step per frame, not per packet.
+    """
+
+    def __init__(self, window=2048, max_pending=10000):
+        self.columns = [name for name, _, _ in STAGES] + ["total"]
+        self.recent = TelemetryRingBuffer(self.columns, window)
+        self.bin_edges = np.logspace(-5, 1, 31)  # 10 us .. 10 s
+        self.histograms = {name: np.zeros(len(self.bin_edges) + 1, dtype=np.int64) for name in self.columns}
+        self.count = 0
+        self.max_pending = max_pending
+        self._pending = deque(maxlen=max_pending)  # nobody rendering: the oldest traces fall off, in O(1)
+        self._frame = []
+
+    def stored(self, trace):
+        """Called once the packet is in the history"""
+        trace.append(time.perf_counter())
+        self._pending.append(trace)
+
+    def frame_started(self):
+        self._frame, self._pending = self._pending, deque(maxlen=self.max_pending)
+
+    def frame_finished(self, started):
+        """Stamps every packet stored before the frame with its render start/end"""
+        if self._frame:
+            end = time.perf_counter()
+            for trace in self._frame:
+                trace.append(started)
+                trace.append(end)
+            self._commit(self._frame)
+            self._frame = []
+
+    def commit_unrendered(self):
+        """Headless mode: packets end at the store stage"""
+        if self._pending:
+            self._commit(self._pending)
+            self._pending.clear()
+
+    def _commit(self, traces):
+        width = len(STAGES) + 1
+        stamps = np.full((len(traces), width), np.nan)
+        for i, trace in enumerate(traces):
+            stamps[i, :len(trace)] = trace
+        deltas = {name: stamps[:, b] - stamps[:, a] for name, a, b in STAGES}
+        last = np.where(np.isnan(stamps[:, 6]), stamps[:, 4], stamps[:, 6])
+        deltas["total"] = last - stamps[:, 0]
+        for name, values in deltas.items():
+            valid = values[~np.isnan(values)]
+            if len(valid):
+                self.histograms[name] += np.bincount(np.searchsorted(self.bin_edges, valid), minlength=len(self.bin_edges) + 1)
+        for i in range(len(traces)):
+            self.recent.append({name: deltas[name][i] for name in self.columns}, timestamp=stamps[i, 0])
+        self.count += len(traces)
+
+    def percentiles(self):
+        """{column: (p50, p95, p99)} in seconds over the rolling window"""
+        out = {}
+        for name in self.columns:
+            values = self.recent.view(name)
+            values = values[~np.isnan(values)]
+            out[name] = tuple(np.percentile(values, [50, 95, 99]).tolist()) if len(values) else (None, None, None)
+        return out
+
+    def summary_text(self):
+        """Short multi-line text for the diagnostics panel"""
+        p = self.percentiles()
+        p50, p95, p99 = p["total"]
+        if p50 is None:
+            return "Latency: no data"
+        lines = [f"Latency p50/95/99: {p50 * 1000:.0f}/{p95 * 1000:.0f}/{p99 * 1000:.0f} ms"]
+        for name, _, _ in STAGES:
+            stage95 = p[name][1]
+            if stage95 is not None:
+                lines.append(f"  {name:<15} p95 {stage95 * 1000:8.2f} ms")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Writes percentiles and histograms as JSON"""
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "packets": self.count,
+            "window": self.recent.capacity,
+            "percentiles_s": {name: dict(zip(("p50", "p95", "p99"), vals)) for name, vals in self.percentiles().items()},
+            "histogram_bin_edges_s": self.bin_edges.tolist(),
+            "histograms": {name: counts.tolist() for name, counts in self.histograms.items()},
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return path
@@ -0,0 +1,112 @@
+# core/mission_log.py
+# Mission log: bounded in-memory history for the log widget, mirrored to a rotating file
+__all__ = ["MissionLog", "LEVELS", "level_of"]
+
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+# Severity filter choices, lowest first
+LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+# Messages carry their severity as a prefix, e.g. "[WARN] No serial data."
+_PREFIXES = (
+    ("[!]", logging.ERROR),
+    ("[ERROR]", logging.ERROR),
+    ("[WARN]", logging.WARNING),
+    ("[DEBUG]", logging.DEBUG),
+)
+
+
+def level_of(message):
+    """Severity of a log message from its prefix; anything unmarked ([INFO], [MISSION], ...) is INFO"""
+    for prefix, level in _PREFIXES:
+        if message.startswith(prefix):
+            return level
+    return logging.INFO
+
+
+class MissionLog:
+    """
+    Thread-safe mission log.
+
+    add() may be called from any thread and never touches the disk or a
+    widget: the entry goes into a bounded history (the last `max_lines`) and a
+    pending batch that the UI takes with drain() once per frame. If a log file
+    is given, every entry is also written there by a background thread,
+    rotated at `max_bytes` with `backups` old files kept.
+    """
+
+    def __init__(self, max_lines=500, file_path=None, max_bytes=1_000_000, backups=5):
+        self.max_lines = max_lines
+        self.history = deque(maxlen=max_lines)  # (time, level, message)
+        self._pending = deque(maxlen=max_lines)  # more than a screenful can't be shown anyway
+        self._lock = threading.Lock()
+        self.count = 0
+        self.file_path = file_path
+        self._logger = None
+        self._listener = None
+        if file_path:
+            self._open_file(file_path, max_bytes, backups)
+
+    def _open_file(self, path, max_bytes, backups):
+        try:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                           encoding="utf-8", delay=True)
+        except OSError as e:
+            print(f"[!] Mission log file unavailable: {e}")
+            return
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(message)s"))
+        records = queue.SimpleQueue()
+        # A private logger, so nothing else's records end up in the file (or ours elsewhere)
+        self._logger = logging.getLogger(f"cansat.mission_log.{id(self)}")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._queue_handler = logging.handlers.QueueHandler(records)
+        self._logger.addHandler(self._queue_handler)
+        self._listener = logging.handlers.QueueListener(records, handler)
+        self._listener.start()
+
+    def add(self, message, level=None):
+        level = level_of(message) if level is None else level
+        entry = (time.time(), level, message)
+        with self._lock:
+            self.history.append(entry)
+            self._pending.append(entry)
+            self.count += 1
+        logger = self._logger
+        if logger:
+            logger.log(level, message)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def drain(self):
+        """Entries added since the last call, oldest first"""
+        with self._lock:
+            entries = list(self._pending)
+            self._pending.clear()
+        return entries
+
+    def entries(self, min_level=logging.DEBUG):
+        """The retained history at or above `min_level`, oldest first"""
+        with self._lock:
+            return [entry for entry in self.history if entry[1] >= min_level]
+
+    def close(self):
+        """Writes out what is still queued for the file and closes it"""
+        if self._listener:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._logger.removeHandler(self._queue_handler)
+            self._listener = None
+            self._logger = None
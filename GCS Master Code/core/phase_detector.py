@@ -0,0 +1,311 @@
+# core/phase_detector.py
+# Online mission-phase detection from the fused altitude / descent rate
+__all__ = ["PhaseDetector", "PHASE_NAMES", "WAITING"]
+
+import math
+from collections import deque
+
+from config import settings
+from data.dummy_data import (AUDIO_BEACON, EJECTION, EXPANSION, LANDED, PHASE_EVENTS, PRIMARY_CHUTE,
+                             SECONDARY_CHUTE)
+
+WAITING = -1  # before ejection
+
+PHASE_NAMES = {
+    WAITING: "waiting",
+    EJECTION: "ejection",
+    PRIMARY_CHUTE: "primary_chute",
+    SECONDARY_CHUTE: "secondary_chute",
+    EXPANSION: "expansion",
+    AUDIO_BEACON: "audio_beacon",
+    LANDED: "landed",
+}
+
+_MESSAGES = {**PHASE_EVENTS, EJECTION: "[MISSION] Ejection detected: CanSat in free fall."}
+
+
+class _Trigger:
+    """Schmitt trigger: turns on after `hold` samples past `on`, off again only past `off`"""
+
+    __slots__ = ("on", "off", "hold", "rising", "active", "_count")
+
+    def __init__(self, on, off, hold=1):
+        self.on = on
+        self.off = off
+        self.hold = max(1, hold)
+        self.rising = on > off  # on above `on` (else: on below `on`)
+        self.active = False
+        self._count = 0
+
+    def update(self, value):
+        if value != value:
+            return self.active
+        if self.active:
+            if (value < self.off) if self.rising else (value > self.off):
+                self.active = False
+                self._count = 0
+        elif (value > self.on) if self.rising else (value < self.on):
+            self._count += 1
+            if self._count >= self.hold:
+                self.active = True
+        else:
+            self._count = 0
+        return self.active
+
+
+class _RawRate:
+    """
+    Descent rate as the least-squares slope of the raw barometric altitude over
+    the last `window_s` (at least `min_samples` samples), with its standard
+    deviation. The baro noise behind that is measured from the fits'
+    residuals (a running average, so one lucky window can't look certain), and
+    no noise figure has to be configured. It follows a step change within one
+    window, where the Kalman filter takes seconds; O(samples in window).
+    """
+
+    def __init__(self, window_s=1.25, min_samples=4, noise_alpha=0.02):
+        self.window_s = window_s
+        self.min_samples = min_samples
+        self.noise_alpha = noise_alpha
+        self.noise_var = None
+        self.fits = 0
+        self.samples = deque()
+
+    def update(self, t, z, fit=True):
+        """(descent rate, std) including this sample; (nan, inf) until there are enough, or with fit=False"""
+        samples = self.samples
+        if z == z:
+            if samples and t <= samples[-1][0]:
+                samples.clear()  # clock went back (restart, new recording)
+            samples.append((t, z))
+            while len(samples) > self.min_samples and t - samples[0][0] > self.window_s:
+                samples.popleft()
+        n = len(samples)
+        if n < self.min_samples or not fit:
+            return math.nan, math.inf
+        t_mean = sum(ti for ti, _ in samples) / n
+        z_mean = sum(zi for _, zi in samples) / n
+        stt = szz = stz = 0.0
+        for ti, zi in samples:
+            dt, dz = ti - t_mean, zi - z_mean
+            stt += dt * dt
+            stz += dt * dz
+            szz += dz * dz
+        if stt <= 0:
+            return math.nan, math.inf
+        slope = stz / stt
+        residual_var = max(0.0, szz - slope * stz) / (n - 2)
+        # Plain mean of the fits so far, then a running average once that has 1 / noise_alpha of them
+        self.fits += 1
+        if self.noise_var is None:
+            self.noise_var = residual_var
+        else:
+            self.noise_var += max(self.noise_alpha, 1 / self.fits) * (residual_var - self.noise_var)
+        return -slope, math.sqrt(self.noise_var / stt)
+
+
+class _Stillness:
+    """
+    Whether the raw barometric altitude has stopped changing: a least-squares
+    line through every sample since it last looked still, kept as running sums
+    (O(1) per sample). Still once the line covers `min_s`, its slope is within
+    ±still_ms and the slope's standard deviation is at most `max_std_ms`; a
+    slope clearly outside the band starts the line over. A slow link just takes
+    longer to reach that certainty, where a threshold on the filtered rate
+    would flicker with its noise.
+    """
+
+    def __init__(self, still_ms=1.0, max_std_ms=0.5, min_s=2.0):
+        self.still_ms = still_ms
+        self.max_std_ms = max_std_ms
+        self.min_s = min_s
+        self.reset()
+
+    def reset(self):
+        self.t0 = self.z0 = None
+        self.n = self.st = self.sz = self.stt = self.stz = self.szz = 0.0
+
+    def update(self, t, z, noise_var=None):
+        """True if still, including this sample; `noise_var` (m²) floors the fit's own noise estimate"""
+        if z != z:
+            return False
+        if self.t0 is not None and t < self.t0:
+            self.reset()  # clock went back
+        if self.t0 is None:
+            self.t0, self.z0 = t, z
+        # Relative to the first sample, so the sums keep their precision
+        dt, dz = t - self.t0, z - self.z0
+        self.n += 1
+        self.st += dt
+        self.sz += dz
+        self.stt += dt * dt
+        self.stz += dt * dz
+        self.szz += dz * dz
+        n = self.n
+        if n < 3:
+            return False
+        stt = self.stt - self.st * self.st / n
+        if stt <= 0:
+            return False
+        stz = self.stz - self.st * self.sz / n
+        slope = stz / stt
+        var = max(0.0, self.szz - self.sz * self.sz / n - slope * stz) / (n - 2)
+        if noise_var:
+            var = max(var, noise_var)
+        std = math.sqrt(var / stt)
+        if abs(slope) - 2 * std > self.still_ms:
+            self.reset()  # clearly moving: start a new line here
+            return self.update(t, z, noise_var)
+        return dt >= self.min_s and abs(slope) <= self.still_ms and std <= self.max_std_ms
+
+
+class PhaseDetector:
+    """
+    Mission phase state machine, the same phases as the dummy generator:
+
+        waiting -> ejection          descent rate rises past fall_ms
+        ejection -> primary_chute    descent rate drops back below freefall_ms after
+                                     exceeding it (or straight to secondary_ms), or an
+                                     acceleration shock, if the link carries acceleration
+        primary -> secondary_chute   descent rate below secondary_ms
+        secondary -> expansion       height above ground below expansion_agl_m
+        expansion -> audio_beacon    height above ground below beacon_agl_m
+        any chute -> landed          below beacon_agl_m and the barometric altitude's
+                                     trend within ±still_ms (see _Stillness), over
+                                     at least landed_s
+
+    Every threshold has a hysteresis band, so noise around it can't toggle a
+    trigger; phases only move forward. Packets are skipped while the altitude
+    filter settles: for settle_s and settle_samples after it (re)started, as
+    given by `started` in update(). That holds at any packet rate, where a
+    bound on the filter's own rate std would depend on the rate.
+
+    The Kalman filter trails a chute opening by 2-3 s: it is tuned to reject
+    noise, and the descent rate steps. So the two chute transitions are also
+    confirmed by the raw barometric rate (a least-squares slope over
+    raw_window_s) whenever that is certain to raw_max_std_ms, once the rate
+    itself has shown free fall. On the simulated 50 Hz flight (±1 hPa, ~5 m
+    baro noise) both openings are confirmed within about 1 s. Within one packet
+    is out of reach: a packet's altitude change is far smaller than the noise.
+    With fewer packets per window the raw rate is never that certain, and the
+    fused rate alone decides. If free fall never shows in the fused rate (it
+    lasts about two seconds, all of it settling time after a power-on in the
+    air, or a handful of packets at 1-2 Hz), the primary chute is taken as open
+    freefall_wait_s after ejection. Landing takes landed_s of stillness at
+    least, and longer on a slow link: 2-5 s at 50 Hz, up to about 15 s at 1 Hz.
+
+    update() does a bounded amount of work per packet and returns an event
+    dict on the packet that completes a transition.
+    """
+
+    def __init__(self, ground_alt_m=0.0, fall_ms=10.0, freefall_ms=20.0, secondary_ms=6.0,
+                 expansion_agl_m=450.0, beacon_agl_m=20.0, still_ms=1.0, landed_s=2.0,
+                 freefall_wait_s=2.0,
+                 shock_ms2=None, hysteresis_ms=2.0, hysteresis_m=5.0, settle_s=2.0, settle_samples=3,
+                 raw_window_s=1.25, raw_max_std_ms=2.5):
+        self.ground_alt_m = ground_alt_m
+        self.settle_s = settle_s
+        self.settle_samples = settle_samples
+        self.raw_max_std_ms = raw_max_std_ms
+        self.freefall_wait_s = freefall_wait_s
+        self.shock = _Trigger(shock_ms2, shock_ms2 * 0.5) if shock_ms2 else None
+        self.falling = _Trigger(fall_ms, fall_ms - hysteresis_ms)
+        self.freefall = _Trigger(freefall_ms, freefall_ms - hysteresis_ms, hold=3)  # not a blip while settling
+        self.slow = _Trigger(secondary_ms, secondary_ms + hysteresis_ms)
+        self.expansion = _Trigger(expansion_agl_m, expansion_agl_m + hysteresis_m)
+        self.beacon = _Trigger(beacon_agl_m, beacon_agl_m + hysteresis_m)
+        self.still = _Stillness(still_ms, still_ms / 3, landed_s)
+        self.raw_rate = _RawRate(raw_window_s)
+        self.raw_chute = _Trigger(freefall_ms - hysteresis_ms, freefall_ms)  # below free fall
+        self.raw_slow = _Trigger(secondary_ms, secondary_ms + hysteresis_ms)
+        self.phase = WAITING
+        self.events = 0
+        self._was_freefall = False
+        self._raw_freefall = False
+        self._freefall_ms = freefall_ms
+        self._ejected_at = None
+        self._t0 = None
+        self._started = None  # the filter's last (re)start, and packets since then
+        self._since_start = 0
+
+    @classmethod
+    def from_settings(cls, accel=False):
+        """Detector tuned by the PHASE_* settings; the shock trigger only if packets carry acceleration"""
+        return cls(
+            settings.PHASE_GROUND_ALT_M, settings.PHASE_FALL_MS, settings.PHASE_FREEFALL_MS,
+            settings.PHASE_SECONDARY_MS, settings.PHASE_EXPANSION_AGL_M, settings.PHASE_BEACON_AGL_M,
+            settings.PHASE_STILL_MS, settings.PHASE_LANDED_S, settings.PHASE_FREEFALL_WAIT_S,
+            settings.PHASE_SHOCK_MS2 if accel else None,
+            settings.PHASE_HYSTERESIS_MS, settings.PHASE_HYSTERESIS_M, settings.PHASE_SETTLE_S,
+            settings.PHASE_SETTLE_SAMPLES,
+            settings.PHASE_RAW_WINDOW_S, settings.PHASE_RAW_MAX_STD_MS,
+        )
+
+    def update(self, t, altitude, descent_rate, accel=None, started=None, measured=math.nan, coasting=False):
+        """
+        One packet taken at time t (s). `started` is when the filter behind the
+        estimates last (re)started (None: at the first packet); `measured` is
+        the packet's unfiltered barometric altitude (NaN: fused estimates only).
+        With `coasting` the filter rejected this reading, so its estimates are
+        only extrapolated: the rate and height triggers keep their state.
+        Returns an event dict or None.
+        """
+        if self._t0 is None:
+            self._t0 = t
+        # Only the chute transitions use the raw rate
+        raw, raw_std = self.raw_rate.update(t, measured, fit=self.phase < SECONDARY_CHUTE)
+        started = self._t0 if started is None else started
+        if started != self._started:
+            self._started, self._since_start = started, 0
+        self._since_start += 1
+        if t - started < self.settle_s or self._since_start < self.settle_samples:
+            return None
+        if not raw_std <= self.raw_max_std_ms:
+            raw = math.nan  # _Trigger ignores NaN
+        # _Trigger ignores NaN, so a coasting filter's extrapolation can't move a trigger
+        rate = math.nan if coasting else descent_rate
+        agl = math.nan if coasting else altitude - self.ground_alt_m
+        falling = self.falling.update(rate)
+        freefall = self.freefall.update(rate)
+        slow = self.slow.update(rate)
+        low = self.expansion.update(agl)
+        very_low = self.beacon.update(agl)
+        self._raw_freefall |= raw > self._freefall_ms
+        raw_chute = self._raw_freefall and self.raw_chute.update(raw)
+        raw_slow = self.raw_slow.update(raw)
+        shock = self.shock.update(abs(accel)) if self.shock and accel is not None else False
+
+        phase = self.phase
+        new = None
+        if phase == WAITING:
+            if falling:
+                new = EJECTION
+        elif phase == EJECTION:
+            self._was_freefall |= freefall
+            if shock or (self._was_freefall and (not freefall or raw_chute)) or slow \
+                    or (not self._was_freefall and t - self._ejected_at >= self.freefall_wait_s):
+                new = PRIMARY_CHUTE
+        elif phase == PRIMARY_CHUTE:
+            if slow or raw_slow:
+                new = SECONDARY_CHUTE
+        elif phase == SECONDARY_CHUTE and low:
+            new = EXPANSION
+        elif phase == EXPANSION and very_low:
+            new = AUDIO_BEACON
+        # Stillness is only fitted where a landing can follow
+        if new is None and phase >= PRIMARY_CHUTE and phase != LANDED and very_low \
+                and self.still.update(t, measured if measured == measured else altitude, self.raw_rate.noise_var):
+            new = LANDED
+        if new is None:
+            return None
+        if new == EJECTION:
+            self._ejected_at = t
+        self.phase = new
+        self.events += 1
+        return {
+            "phase": PHASE_NAMES[new],
+            "message": _MESSAGES[new],
+            "flight_time_s": round(t - self._t0, 3),  # since the first packet
+            "altitude": round(altitude, 2),
+            "descent_rate": round(descent_rate, 2),
+        }
@@ -0,0 +1,249 @@
+# core/pipeline.py
+# Headless telemetry core: reader -> parser -> store -> recorder -> subscribers
+__all__ = ["TelemetryPipeline", "TELEMETRY_FIELDS", "HISTORY_FIELDS", "EVENT_FIELDS", "SOURCE_FIELD"]
+
+import os
+import threading
+import time
+
+from config import settings
+from config.telemetry_schema import FIELD_NAMES, INDEX, TIME_FIELD
+from core.event_bus import EVENT, EventBus, LOG, NOTIFY, PACKET
+from core.fusion import FUSED_FIELDS, AltitudeFilter, SampleClock
+from core.phase_detector import PhaseDetector
+from core.latency import LatencyTracker
+from data.flight_log import format_time_of_day
+from data.geo import distance_m
+from data.lod_store import LodStore
+from data.logger import DataLogger
+from data.ring_buffer import TelemetryRingBuffer
+from serial_comm.link_stats import LINK_FIELDS
+from serial_comm.port_handler import SerialHandler
+
+# Packet fields, in schema order
+TELEMETRY_FIELDS = FIELD_NAMES
+# History, recording and PACKET columns: the packet fields, then the fused estimates
+HISTORY_FIELDS = TELEMETRY_FIELDS + FUSED_FIELDS
+_TIME = INDEX[TIME_FIELD]
+_PRESSURE = INDEX["pressure"]
+_ACCEL = INDEX.get(settings.FUSION_ACCEL_FIELD)
+# Extra recording column with multi-link ingestion: the link that delivered the packet first
+SOURCE_FIELD = "source"
+# Columns of the mission event log written next to recordings
+EVENT_FIELDS = ["rx_time", "time", "flight_time_s", "phase", "altitude", "descent_rate", "message"]
+
+
+class TelemetryPipeline:
+    """
+    Owns the serial reader, the in-memory history and the recorder, with no GUI.
+
+    poll() moves every pending packet from the reader into the store (and the
+    recording, if one is running) and publishes each row on the bus as PACKET.
+    The Tk dashboard calls poll() from its own loop; headless tools call run().
+    """
+
+    def __init__(self, bus=None, handler=None, capacity=None):
+        self.bus = bus or EventBus()
+        self.handler = handler or SerialHandler(bus=self.bus)
+        self.store = TelemetryRingBuffer(HISTORY_FIELDS, capacity or settings.HISTORY_CAPACITY)
+        # Whole-flight min/max pyramid behind the plots (any zoom level at bounded cost)
+        self.lod = LodStore(HISTORY_FIELDS, settings.LOD_FACTOR, capacity or settings.HISTORY_CAPACITY)
+        # Smoothed altitude and descent rate from pressure (and acceleration, if sent)
+        self.fusion = AltitudeFilter(settings.FUSION_BARO_NOISE_M, settings.FUSION_PROCESS_ACCEL,
+                                     settings.FUSION_ACCEL_NOISE, settings.FUSION_SEA_LEVEL_HPA)
+        self._sample_clock = SampleClock()
+        self.phases = PhaseDetector.from_settings(accel=_ACCEL is not None)
+        self.events = []  # every mission event of this session, oldest first
+        self.recorder = None
+        self.link_recorder = None  # per-second link statistics next to the recording
+        self.event_recorder = None  # mission events next to the recording
+        self.origin = None  # first GPS fix; link rows report distance from it
+        self.latency = LatencyTracker(settings.LATENCY_WINDOW)
+        # Set by a GUI that reports frames to self.latency; otherwise traces end at the store
+        self.render_traced = False
+        self.packets = 0
+        self._reported_drops = 0
+        self._reported_errors = 0
+        self._next_link_check = 0.0
+        self._next_link_row = 0.0
+        self._stop = threading.Event()
+
+    def poll(self):
+        """Ingests everything the reader has queued; returns the number of packets"""
+        batch = self.handler.get_batch(traced=True)
+        for item in batch:
+            self.ingest(*item)  # (data, trace), plus the source link with multi-link ingestion
+        if not self.render_traced:
+            self.latency.commit_unrendered()
+        self._check_queue_drops()
+        now = time.monotonic()
+        if now >= self._next_link_check:
+            self._next_link_check = now + 1.0
+            self._check_link_errors()
+        if self.link_recorder and now >= self._next_link_row:
+            self._next_link_row = now + settings.LINK_RECORD_INTERVAL_S
+            self.link_recorder.log(self.link_row())
+        return len(batch)
+
+    def ingest(self, row, trace=None, source=None):
+        """
+        Stores, records and publishes one decoded row (a dict packet is decoded
+        first); `source` names the link it came in on, if there are several
+        """
+        if isinstance(row, dict):
+            row = self.handler.decoder.from_json(row)
+        now = time.time()
+        clock = row[_TIME]
+        if clock != clock:
+            # No packet clock: fall back to local time of day
+            local = time.localtime(now)
+            row[_TIME] = clock = local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+        # Filter time: packet clock, subdivided by when the reader received each packet
+        t = self._sample_clock(clock, trace[0] if trace else time.perf_counter())
+        accel = None if _ACCEL is None else row[_ACCEL]
+        altitude, descent_rate = self.fusion.update(t, row[_PRESSURE], accel)
+        row.append(altitude)
+        row.append(descent_rate)
+        self.store.append_values(row, timestamp=now)
+        # Plots run on the packet clock, so a replay at 4x or a late-delivered burst keeps flight time;
+        # a clock that steps back (replay seek or loop) starts the plot history over
+        if len(self.lod) and t < self.lod.last_time:
+            self.lod.clear()
+        self.lod.append_values(t, row)
+        if trace:
+            self.latency.stored(trace)
+        packet = dict(zip(HISTORY_FIELDS, row))
+        packet[TIME_FIELD] = format_time_of_day(clock)
+        if source is not None:
+            packet[SOURCE_FIELD] = source
+        if self.recorder:
+            self.recorder.log(packet)
+        self.packets += 1
+        self.bus.publish(PACKET, packet)
+        event = self.phases.update(t, altitude, descent_rate, accel, self.fusion.started, self.fusion.measured,
+                                   self.fusion.coasting)
+        if event:
+            self._emit_event(event, packet[TIME_FIELD], now)
+
+    def _emit_event(self, event, clock_text, now):
+        # Published on the packet that completed the transition; subscribers
+        # (mission log, toasts, broadcast) and the recorder only get queued work
+        event["time"] = clock_text
+        event["rx_time"] = round(now, 3)
+        self.events.append(event)
+        if self.event_recorder:
+            self.event_recorder.log(event)
+        self.bus.publish(EVENT, event)
+        self.bus.publish(LOG, f"{event['message']} ({clock_text}, {event['altitude']:.0f} m)")
+        if event["phase"] in settings.PHASE_NOTIFY:
+            self.bus.publish(NOTIFY, event["message"].replace("[MISSION] ", ""))
+
+    def _check_queue_drops(self):
+        dropped = self.handler.queue_stats()["dropped"]
+        if dropped > self._reported_drops:
+            self.bus.publish(LOG, f"[WARN] Telemetry backlog: {dropped - self._reported_drops} packets dropped.")
+            self._reported_drops = dropped
+
+    def _check_link_errors(self):
+        link = self.handler.link
+        errors = link.parse_errors + link.frame_errors
+        if errors > self._reported_errors:
+            self.bus.publish(LOG, f"[WARN] Link: {errors - self._reported_errors} corrupt packets discarded.")
+            self._reported_errors = errors
+
+    def link_row(self):
+        """Current link statistics with position context, keyed by LINK_FIELDS"""
+        row = self.handler.link.stats()
+        q = self.handler.queue_stats()
+        latest = self.store.latest
+        lat, lon = latest("gps_lat"), latest("gps_lon")
+        distance = None
+        if lat is not None and lat == lat and lon == lon:
+            if self.origin is None:
+                self.origin = (lat, lon)
+            distance = distance_m(self.origin[0], self.origin[1], lat, lon)
+        row.update(
+            rx_time=round(time.time(), 3),
+            time=format_time_of_day(latest(TIME_FIELD)),
+            altitude=latest("altitude"),
+            distance_m=distance,
+            queue_depth=q["depth"],
+            queue_dropped=q["dropped"],
+        )
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()}
+
+    def start_recording(self, folder=None, fmt=None):
+        if self.recorder:
+            return None
+        multilink = hasattr(self.handler, "start_recording")
+        # The writer thread creates and fills the file; nothing here touches the disk
+        self.recorder = DataLogger(
+            HISTORY_FIELDS + [SOURCE_FIELD] if multilink else HISTORY_FIELDS,
+            folder or settings.RECORD_FOLDER, "recording",
+            batch_rows=settings.RECORD_BATCH_ROWS,
+            flush_interval_s=settings.RECORD_FLUSH_INTERVAL_S,
+            fsync_interval_s=settings.RECORD_FSYNC_INTERVAL_S,
+            queue_size=settings.RECORD_QUEUE_SIZE,
+            fmt=fmt or settings.RECORD_FORMAT,
+            dtypes={SOURCE_FIELD: "S16"} if multilink else None,
+        )
+        self.link_recorder = DataLogger(
+            LINK_FIELDS, folder or settings.RECORD_FOLDER,
+            batch_rows=settings.RECORD_BATCH_ROWS,
+            flush_interval_s=settings.RECORD_FLUSH_INTERVAL_S,
+            fsync_interval_s=settings.RECORD_FSYNC_INTERVAL_S,
+            file_path=os.path.splitext(self.recorder.file_path)[0] + "_link.csv",
+        )
+        self.event_recorder = DataLogger(
+            EVENT_FIELDS, folder or settings.RECORD_FOLDER,
+            batch_rows=1,  # events are rare; write each one at once
+            flush_interval_s=settings.RECORD_FLUSH_INTERVAL_S,
+            fsync_interval_s=settings.RECORD_FSYNC_INTERVAL_S,
+            file_path=os.path.splitext(self.recorder.file_path)[0] + "_events.csv",
+        )
+        for event in self.events:
+            self.event_recorder.log(event)  # what happened before recording started
+        if multilink:
+            # Multi-link ingestion: every radio's own packets, duplicates included, next to this file
+            self.handler.start_recording(os.path.splitext(self.recorder.file_path)[0], fmt)
+        self._next_link_row = 0.0
+        self.bus.publish(LOG, f"[RECORD] Data recording started: {self.recorder.file_path}")
+        return self.recorder.file_path
+
+    def stop_recording(self, wait=0):
+        """Stops recording; with wait=0 the final flush finishes in the background"""
+        recorder, self.recorder = self.recorder, None
+        if not recorder:
+            return None
+        if self.link_recorder:
+            self.link_recorder.log(self.link_row())
+            self.link_recorder.close(timeout=wait)
+            self.link_recorder = None
+        if self.event_recorder:
+            self.event_recorder.close(timeout=wait)
+            self.event_recorder = None
+        if hasattr(self.handler, "stop_recording"):
+            self.handler.stop_recording(wait)
+        recorder.close(timeout=wait)
+        if recorder.dropped:
+            self.bus.publish(LOG, f"[WARN] Recorder queue overflowed: {recorder.dropped} rows lost.")
+        self.bus.publish(LOG, f"[RECORD] Data recording stopped ({recorder.rows_written} rows flushed so far).")
+        return recorder
+
+    def run(self, interval_s=None):
+        """Headless loop: poll until stop() is called"""
+        interval_s = interval_s or settings.INGEST_INTERVAL_MS / 1000
+        self._stop.clear()
+        while not self._stop.is_set():
+            # Wake as soon as data arrives instead of sleeping a fixed interval
+            self.handler.data_queue.wait(interval_s)
+            self.poll()
+        self.poll()
+
+    def stop(self):
+        self._stop.set()
+
+    def shutdown(self, wait=5.0):
+        self.stop()
+        self.stop_recording(wait=wait)
+        self.handler.disconnect()
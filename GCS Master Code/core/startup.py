@@ -0,0 +1,46 @@
+# core/startup.py
+# Cold-start timing: per-phase durations and milestones for the startup report
+__all__ = ["StartupTimer"]
+
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Times the startup of the dashboard. Phases are measured with `measure(name)`
+    and need not be contiguous (deferred UI steps run between event-loop turns);
+    milestones such as "ingesting" or "ready" are recorded with `mark(name)` as
+    seconds since `t0`, which should be taken as early as possible in the process.
+    """
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.phases = []  # (name, start since t0, seconds)
+        self.marks = []  # (name, seconds since t0)
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.t0, time.perf_counter() - start))
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.t0))
+
+    def elapsed(self, name):
+        """Seconds from t0 to milestone `name`, or None if not reached"""
+        for mark, seconds in self.marks:
+            if mark == name:
+                return seconds
+        return None
+
+    def report(self):
+        """Multi-line text: phases (duration) and milestones (time since t0), in time order"""
+        width = max([len(name) for name, *_ in self.phases + self.marks] + [8])
+        rows = [(start, f"  {name:<{width}} {seconds * 1000:8.1f} ms") for name, start, seconds in self.phases]
+        rows += [(at, f"  {name:<{width}} @{at * 1000:7.1f} ms") for name, at in self.marks]
+        rows.sort(key=lambda row: row[0])
+        return "\n".join(["[INFO] Startup report:"] + [text for _, text in rows])
@@ -1,16 +1,185 @@
 # dummy_data.py
 # Fallback data generator for CanSat GCS
-import random
+#
+# MissionProfile precomputes a whole descent (ejection, primary/secondary chute,
+# expansion, audio beacon, landed) as NumPy columns at any sample rate. The same
+# seed always gives the same flight, so load tests and before/after benchmarks
+# can be fed identical input at 50-1000 Hz without waiting on the wall clock.
 import time
 
-def generate_dummy_data():
+import numpy as np
+
+from config.telemetry_schema import FIELD_NAMES, TIME_FIELD
+from data.flight_log import FlightLogWriter, format_time_of_day
+from serial_comm.binary_protocol import encode_frame
+
+# Mission phases (same numbering as SerialHandler.generate_dummy_packet)
+EJECTION, PRIMARY_CHUTE, SECONDARY_CHUTE, EXPANSION, AUDIO_BEACON, LANDED = range(6)
+
+PHASE_EVENTS = {
+    PRIMARY_CHUTE: "[MISSION] Primary parachute deployed!",
+    SECONDARY_CHUTE: "[MISSION] Secondary parachute deployed!",
+    EXPANSION: "[MISSION] CanSat expansion mechanism completed.",
+    AUDIO_BEACON: "[MISSION] Audio beacons activated.",
+    LANDED: "[MISSION] CanSat landed.",
+}
+
+# Field order of the firmware CSV line
+CSV_FIELDS = FIELD_NAMES
+
+
+class MissionProfile:
+    """
+    Seeded, fully precomputed synthetic flight.
+
+    Columns are float64 arrays in self.columns (plus int64 "phase" and "gps_sat"),
+    indexed by sample; self.events lists (t, phase, message) for every phase change.
+    """
+
+    def __init__(self, rate_hz=10.0, seed=0, start_altitude=1000.0, primary_alt=950.0,
+                 secondary_alt=500.0, expansion_alt=450.0, beacon_alt=20.0, freefall_accel=30.0,
+                 freefall_max_speed=50.0, primary_speed=15.0, secondary_speed=2.0,
+                 landed_s=10.0, start_clock_s=12 * 3600.0):
+        self.rate_hz = rate_hz
+        self.seed = seed
+        self.start_clock_s = start_clock_s
+
+        # Phase boundary times, solved in closed form
+        a, vmax = freefall_accel, freefall_max_speed
+        t_acc = vmax / a
+        d_acc = 0.5 * a * t_acc ** 2
+        drop = start_altitude - primary_alt
+        t_primary = np.sqrt(2 * drop / a) if drop <= d_acc else t_acc + (drop - d_acc) / vmax
+        t_secondary = t_primary + (primary_alt - secondary_alt) / primary_speed
+        t_expansion = t_secondary + (secondary_alt - expansion_alt) / secondary_speed
+        t_beacon = t_secondary + (secondary_alt - beacon_alt) / secondary_speed
+        t_landed = t_secondary + secondary_alt / secondary_speed
+        self.duration_s = t_landed + landed_s
+        self.events = [
+            (float(t), phase, PHASE_EVENTS[phase])
+            for t, phase in ((t_primary, PRIMARY_CHUTE), (t_secondary, SECONDARY_CHUTE),
+                             (t_expansion, EXPANSION), (t_beacon, AUDIO_BEACON), (t_landed, LANDED))
+        ]
+
+        t = np.arange(0.0, self.duration_s, 1.0 / rate_hz)
+        n = len(t)
+        phase = np.select(
+            [t < t_primary, t < t_secondary, t < t_expansion, t < t_beacon, t < t_landed],
+            [EJECTION, PRIMARY_CHUTE, SECONDARY_CHUTE, EXPANSION, AUDIO_BEACON],
+            LANDED,
+        ).astype(np.int64)
+
+        # Free fall: constant acceleration up to terminal speed, then the chute speeds
+        tf = np.minimum(t, t_primary)
+        freefall_drop = np.where(tf < t_acc, 0.5 * a * tf ** 2, d_acc + vmax * (tf - t_acc))
+        altitude = np.select(
+            [t < t_primary, t < t_secondary, t < t_landed],
+            [start_altitude - freefall_drop,
+             primary_alt - primary_speed * (t - t_primary),
+             secondary_alt - secondary_speed * (t - t_secondary)],
+            0.0,
+        )
+        speed = np.select(
+            [t < t_primary, t < t_secondary, t < t_landed],
+            [np.minimum(a * t, vmax), primary_speed, secondary_speed],
+            0.0,
+        )
+
+        rng = np.random.default_rng(seed)
+        noise = lambda scale: rng.uniform(-scale, scale, n)
+        battery = np.maximum(100.0 - 0.005 * t, 0.0)
+        self.columns = {
+            "t": t,
+            "phase": phase,
+            "altitude": altitude,
+            "vertical_speed": speed,
+            # For India: 1000m ~18-22°C, ground ~28-35°C
+            "temperature": 28 + (altitude / 1000) * -8 + noise(1),
+            "pressure": 1013.25 * (1 - (0.0065 * altitude) / 288.15) ** 5.255 + noise(1),
+            "voltage": 3.3 + 0.9 * battery / 100 + noise(0.02),
+            "current": np.where(phase >= AUDIO_BEACON, 0.8, 0.5) + noise(0.05),
+            "gyro_x": noise(2),
+            "gyro_y": noise(2),
+            "gyro_z": noise(2),
+            "gps_lat": 13.0 + (start_altitude - altitude) * 0.0001 + noise(0.00005),
+            "gps_lon": 80.2 + (start_altitude - altitude) * 0.0001 + noise(0.00005),
+            "gps_sat": rng.integers(7, 13, n),
+            "battery": battery,
+            "time": start_clock_s + np.floor(t),
+        }
+
+    def __len__(self):
+        return len(self.columns["t"])
+
+    def _rounded(self):
+        c = self.columns
+        r = {name: np.round(c[name], 2) for name in ("altitude", "vertical_speed", "temperature", "pressure",
+                                                      "voltage", "current", "gyro_x", "gyro_y", "gyro_z", "battery")}
+        r["gps_lat"] = np.round(c["gps_lat"], 6)
+        r["gps_lon"] = np.round(c["gps_lon"], 6)
+        return r
+
+    def packets(self):
+        """Yields packets in the same dict shape as SerialHandler.generate_dummy_packet"""
+        r = self._rounded()
+        lists = {name: col.tolist() for name, col in r.items()}
+        sats = self.columns["gps_sat"].tolist()
+        clock = self.columns["time"].tolist()
+        for i in range(len(self)):
+            yield {
+                "temperature": lists["temperature"][i],
+                "pressure": lists["pressure"][i],
+                "altitude": lists["altitude"][i],
+                "vertical_speed": lists["vertical_speed"][i],
+                "voltage": lists["voltage"][i],
+                "current": lists["current"][i],
+                "gyro": {"x": lists["gyro_x"][i], "y": lists["gyro_y"][i], "z": lists["gyro_z"][i]},
+                "gps": {"lat": lists["gps_lat"][i], "lon": lists["gps_lon"][i], "sat": sats[i]},
+                "battery": lists["battery"][i],
+                "time": format_time_of_day(clock[i]),
+            }
+
+    def csv_lines(self):
+        """Firmware-format CSV lines (bytes, no line ending), one per sample"""
+        r = self._rounded()
+        # The clock only changes once a second; format each distinct value once
+        stamps = {}
+        r[TIME_FIELD] = [stamps.get(s) or stamps.setdefault(s, format_time_of_day(s)) for s in self.columns["time"].tolist()]
+        cols = [r[name] if name == TIME_FIELD else r[name].tolist() for name in CSV_FIELDS]
+        return [",".join(map(str, vals)).encode("ascii") for vals in zip(*cols)]
+
+    def csv_stream(self):
+        """The whole flight as the raw byte stream the ground radio would deliver"""
+        return b"\r\n".join(self.csv_lines()) + b"\r\n"
+
+    def frame_stream(self):
+        """The whole flight as binary frames (serial_comm/binary_protocol.py), sequence from 0"""
+        r = self._rounded()
+        r["time"] = self.columns["time"]
+        rows = zip(*(r[name].tolist() for name in CSV_FIELDS))
+        return b"".join(encode_frame(dict(zip(CSV_FIELDS, row)), seq) for seq, row in enumerate(rows))
+
+    def write_raw(self, path):
+        """Writes a raw serial capture that ReplaySource can play back"""
+        with open(path, "wb") as f:
+            f.write(self.csv_stream())
+
+    def write_flight_log(self, path, compression="none"):
+        """Writes the flight as a binary .cfr recording"""
+        fields = CSV_FIELDS
+        r = self._rounded()
+        r["time"] = self.columns["time"]
+        with FlightLogWriter(path, fields, compression=compression) as writer:
+            for row in zip(*(r[name].tolist() for name in fields)):
+                writer.write(dict(zip(fields, row)))
+
+
+def generate_dummy_data(rate_hz=1.0, seed=None):
     """
-    Simulates incoming telemetry data.
+    Simulates incoming telemetry as firmware-format CSV lines, paced in real time.
     Replace or modify as needed for testing GUI/serial integration.
     """
-    while True:
-        sensor1 = round(random.uniform(20.0, 30.0), 2)
-        sensor2 = round(random.uniform(800.0, 1200.0), 2)
-        sensor3 = round(random.uniform(0.0, 100.0), 2)
-        yield f"{sensor1},{sensor2},{sensor3}"
-        time.sleep(1)
+    profile = MissionProfile(rate_hz=rate_hz, seed=seed)
+    for line in profile.csv_lines():
+        yield line.decode("ascii")
+        time.sleep(1.0 / rate_hz)
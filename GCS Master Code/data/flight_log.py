@@ -0,0 +1,253 @@
+# flight_log.py
+# Compact append-only binary flight recordings (.cfr) for CanSat GCS
+#
+# File layout:
+#   magic b"CANSATFR" | u16 version | u16 reserved | u32 header length | header JSON | padding to 8 bytes
+#   then either fixed-width little-endian records back to back (compression "none"),
+#   or a sequence of chunks: u32 payload bytes | u32 record count | compressed records.
+# The header JSON holds the schema: [{"name", "dtype", "kind"}...] plus the compression.
+# Records are only ever appended, so a file cut short by a crash is still readable
+# up to the last complete record (or chunk).
+import csv
+import gzip
+import json
+import lzma
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+__all__ = ["FlightLogWriter", "FlightLogReader", "convert_to_csv", "parse_time_of_day", "format_time_of_day"]
+
+MAGIC = b"CANSATFR"
+VERSION = 1
+_PREAMBLE = struct.Struct("<8sHHI")
+_CHUNK = struct.Struct("<II")
+COMPRESSORS = {
+    "none": None,
+    "gzip": (lambda b: gzip.compress(b, 6), gzip.decompress),
+    "lzma": (lambda b: lzma.compress(b, preset=1), lzma.decompress),
+}
+TIME_OF_DAY = "time_of_day"  # f8 seconds since midnight, shown as HH:MM:SS in CSV
+
+
+def parse_time_of_day(t):
+    """'HH:MM:SS' packet clock -> seconds since midnight (None if unparsable)"""
+    try:
+        h, m, sec = str(t).split(':')
+        return int(h) * 3600 + int(m) * 60 + float(sec)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_time_of_day(seconds):
+    if seconds is None or seconds != seconds:
+        return ""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class FlightLogWriter:
+    """Appends telemetry rows to a .cfr file, a chunk of `chunk_records` at a time"""
+
+    def __init__(self, path, fields, dtypes=None, time_fields=("time",), compression="none", chunk_records=256):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression {compression!r}, expected one of {list(COMPRESSORS)}")
+        dtypes = dtypes or {}
+        self.path = path
+        self.fields = list(fields)
+        self.compression = compression
+        self.schema = [
+            {"name": name, "dtype": np.dtype(dtypes.get(name, "<f8")).str,
+             "kind": TIME_OF_DAY if name in time_fields else "value"}
+            for name in self.fields
+        ]
+        self.dtype = np.dtype([(f["name"], f["dtype"]) for f in self.schema])
+        self._time_fields = [f["name"] for f in self.schema if f["kind"] == TIME_OF_DAY]
+        self._chunk = np.zeros(chunk_records, dtype=self.dtype)
+        self._fill = 0
+        self.records_written = 0
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = json.dumps({
+            "schema": self.schema,
+            "compression": self.compression,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }).encode("utf-8")
+        preamble = _PREAMBLE.pack(MAGIC, VERSION, 0, len(header))
+        pad = -(len(preamble) + len(header)) % 8
+        self._file.write(preamble + header + b" " * pad)
+
+    def write(self, row):
+        """Buffers one row (dict keyed by field name); missing values are stored as NaN/0"""
+        rec = self._chunk[self._fill]
+        for name in self.fields:
+            value = row.get(name)
+            if name in self._time_fields and isinstance(value, str):
+                value = parse_time_of_day(value)
+            if value is None or value == "":
+                kind = rec.dtype[name].kind
+                value = np.nan if kind == "f" else b"" if kind == "S" else 0
+            rec[name] = value
+        self._fill += 1
+        if self._fill == len(self._chunk):
+            self._write_chunk()
+
+    def writerows(self, rows):
+        # Same name as csv.writer's, so DataLogger can drive either format
+        for row in rows:
+            self.write(row)
+
+    def _write_chunk(self):
+        if not self._fill:
+            return
+        payload = self._chunk[:self._fill].tobytes()
+        codec = COMPRESSORS[self.compression]
+        if codec is None:
+            self._file.write(payload)
+        else:
+            data = codec[0](payload)
+            self._file.write(_CHUNK.pack(len(data), self._fill) + data)
+        self.records_written += self._fill
+        self._fill = 0
+
+    def flush(self):
+        """Writes the partial chunk out and flushes it to the OS"""
+        self._write_chunk()
+        self._file.flush()
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FlightLogReader:
+    """
+    Opens a .cfr file. Uncompressed files are memory-mapped and columns are
+    zero-copy NumPy views into the map; compressed files are inflated chunk by chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        magic, version, _, header_len = _PREAMBLE.unpack(self._file.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a CanSat flight recording")
+        if version > VERSION:
+            raise ValueError(f"{path} uses format version {version}, this reader supports {VERSION}")
+        header = json.loads(self._file.read(header_len))
+        self.schema = header["schema"]
+        self.compression = header.get("compression", "none")
+        self.created = header.get("created")
+        self.fields = [f["name"] for f in self.schema]
+        self.time_fields = [f["name"] for f in self.schema if f["kind"] == TIME_OF_DAY]
+        self.dtype = np.dtype([(f["name"], f["dtype"]) for f in self.schema])
+        self.data_offset = _PREAMBLE.size + header_len
+        self.data_offset += -self.data_offset % 8
+        self._mmap = None
+        self._records = None
+
+    @property
+    def records(self):
+        """Every record as a structured array (a view of the file when uncompressed)"""
+        if self._records is None:
+            if self.compression == "none":
+                size = os.fstat(self._file.fileno()).st_size
+                count = (size - self.data_offset) // self.dtype.itemsize
+                if count <= 0:
+                    self._records = np.zeros(0, dtype=self.dtype)
+                else:
+                    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._records = np.frombuffer(self._mmap, dtype=self.dtype, count=count, offset=self.data_offset)
+            else:
+                chunks = list(self.iter_chunks())
+                self._records = np.concatenate(chunks) if chunks else np.zeros(0, dtype=self.dtype)
+        return self._records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, field):
+        """Column by name"""
+        return self.records[field]
+
+    def columns(self):
+        return {name: self.records[name] for name in self.fields}
+
+    def iter_chunks(self, chunk_records=4096):
+        """Yields the file as structured arrays without loading it all at once"""
+        if self.compression == "none":
+            records = self.records
+            for start in range(0, len(records), chunk_records):
+                yield records[start:start + chunk_records]
+            return
+        decompress = COMPRESSORS[self.compression][1]
+        self._file.seek(self.data_offset)
+        while True:
+            head = self._file.read(_CHUNK.size)
+            if len(head) < _CHUNK.size:
+                return
+            length, count = _CHUNK.unpack(head)
+            data = self._file.read(length)
+            if len(data) < length:
+                return  # chunk cut short by a crash
+            yield np.frombuffer(decompress(data), dtype=self.dtype, count=count)
+
+    def close(self):
+        self._records = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a caller still holds a column view; the map closes when it's freed
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_to_csv(src_path, dst_path):
+    """Streams a .cfr recording into a CSV with the same columns; returns the row count"""
+    rows = 0
+    with FlightLogReader(src_path) as reader, open(dst_path, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(reader.fields)
+        time_idx = {reader.fields.index(name) for name in reader.time_fields}
+        for chunk in reader.iter_chunks():
+            for rec in chunk.tolist():
+                writer.writerow([
+                    format_time_of_day(v) if i in time_idx else v.decode() if isinstance(v, bytes)
+                    else ("" if v != v else v)
+                    for i, v in enumerate(rec)
+                ])
+            rows += len(chunk)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a binary flight recording (.cfr) to CSV")
+    parser.add_argument("src", help="recording .cfr file")
+    parser.add_argument("dst", nargs="?", help="output .csv (default: next to the source)")
+    args = parser.parse_args()
+    dst = args.dst or os.path.splitext(args.src)[0] + ".csv"
+    count = convert_to_csv(args.src, dst)
+    print(f"[✓] Wrote {count} rows to {dst}")
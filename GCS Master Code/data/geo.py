@@ -0,0 +1,37 @@
+# geo.py
+# Distance and slippy-map tile math shared by the map, tile cache, link statistics and flight analysis
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def distance_m(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance in metres"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+
+
+def distances_m(lat1, lon1, lat2, lon2):
+    """distance_m over NumPy arrays (either point may be a scalar)"""
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(np.radians(np.subtract(lon2, lon1)) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+
+
+def tile_xy(lat, lon, zoom):
+    """Web Mercator tile containing (lat, lon) at `zoom`"""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_in_bbox(lat1, lon1, lat2, lon2, zoom):
+    """Every (x, y) tile at `zoom` covering the bounding box"""
+    x1, y1 = tile_xy(max(lat1, lat2), min(lon1, lon2), zoom)
+    x2, y2 = tile_xy(min(lat1, lat2), max(lon1, lon2), zoom)
+    return [(x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1)]
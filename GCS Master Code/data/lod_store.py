@@ -0,0 +1,153 @@
+# lod_store.py
+# Multi-resolution (min/max pyramid) telemetry history for full-flight plots
+import numpy as np
+
+
+class _Level:
+    """Growable columnar array of buckets: start/end time and per-field min/max"""
+
+    def __init__(self, width, capacity=256):
+        self.width = width
+        self.t0 = np.empty(capacity)
+        self.t1 = np.empty(capacity)
+        self.mn = np.empty((capacity, width))
+        self.mx = np.empty((capacity, width))
+        self.n = 0
+        self.done = 0  # buckets already merged into the level above
+
+    def push(self, t0, t1, mn, mx):
+        if self.n == len(self.t0):
+            self._grow()
+        i = self.n
+        self.t0[i] = t0
+        self.t1[i] = t1
+        self.mn[i] = mn
+        self.mx[i] = mx
+        self.n = i + 1
+
+    def _grow(self):
+        size = 2 * len(self.t0)
+        for name in ("t0", "t1", "mn", "mx"):
+            old = getattr(self, name)
+            new = np.empty((size,) + old.shape[1:])
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def drop_front(self, count):
+        """Forgets the oldest `count` buckets (all already merged upward)"""
+        keep = self.n - count
+        for name in ("t0", "t1", "mn", "mx"):
+            arr = getattr(self, name)
+            arr[:keep] = arr[count:self.n]
+        self.n = keep
+        self.done -= count
+
+
+class LodStore:
+    """
+    Level-of-detail history: level 0 holds raw samples, and every level above
+    holds one (min, max) bucket per `factor` buckets of the level below.
+
+    Buckets are merged as soon as `factor` of them are complete, so appends are
+    O(1) amortized and new levels appear as the flight grows. query() picks the
+    finest level that fits the visible window into `max_points`, so a plot of the
+    last 10 s and one of the whole mission cost the same to draw, and spikes
+    survive decimation because each bucket keeps its extremes. Raw samples are
+    kept for the last `raw_capacity` samples; older data lives in the pyramid.
+    """
+
+    def __init__(self, fields, factor=4, raw_capacity=36000):
+        self.fields = list(fields)
+        self.index = {name: i for i, name in enumerate(self.fields)}
+        self.factor = factor
+        self.raw_capacity = raw_capacity
+        self.levels = [_Level(len(self.fields))]
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def append_values(self, t, values):
+        """Adds one sample (values in `fields` order, NaN = missing) taken at time t"""
+        raw = self.levels[0]
+        raw.push(t, t, values, values)
+        self.total += 1
+        k = 0
+        factor = self.factor
+        while self.levels[k].n - self.levels[k].done >= factor:
+            lv = self.levels[k]
+            if k + 1 == len(self.levels):
+                self.levels.append(_Level(len(self.fields)))
+            a, b = lv.done, lv.done + factor
+            # fmin/fmax skip NaN (missing readings) without all-NaN warnings
+            self.levels[k + 1].push(lv.t0[a], lv.t1[b - 1], np.fmin.reduce(lv.mn[a:b]), np.fmax.reduce(lv.mx[a:b]))
+            lv.done = b
+            k += 1
+        if raw.n >= 2 * self.raw_capacity:
+            raw.drop_front(min(raw.done, raw.n - self.raw_capacity))
+
+    @property
+    def first_time(self):
+        for lv in reversed(self.levels):
+            if lv.n:
+                return lv.t0[0]
+        return None
+
+    @property
+    def last_time(self):
+        raw = self.levels[0]
+        return raw.t1[raw.n - 1] if raw.n else None
+
+    def query(self, field, seconds=None, max_points=1000):
+        """
+        (x, y) arrays for the last `seconds` (None = everything), at most about
+        `max_points` long, with x in seconds relative to the newest sample (<= 0).
+        """
+        now = self.last_time
+        if now is None:
+            return np.empty(0), np.empty(0)
+        start = -np.inf if seconds is None else now - seconds
+        col = self.index[field]
+        for k, lv in enumerate(self.levels):
+            # Level 0 may have forgotten old samples; it only serves windows it still covers
+            if k == 0 and lv.n and lv.t0[0] > start and self.levels[0].n < self.total:
+                continue
+            # Complete buckets of level k, then the unmerged tails of every finer level
+            parts = [(k, np.searchsorted(lv.t1[:lv.n], start, side="left"), lv.n)]
+            parts += [(j, self.levels[j].done, self.levels[j].n) for j in range(k - 1, -1, -1)]
+            points = sum((b - a) * (1 if j == 0 else 2) for j, a, b in parts)
+            if points <= max_points or k == len(self.levels) - 1:
+                return self._collect(parts, col, start, now)
+        return np.empty(0), np.empty(0)
+
+    def _collect(self, parts, col, start, now):
+        xs, ys = [], []
+        for j, a, b in parts:
+            if b <= a:
+                continue
+            lv = self.levels[j]
+            if j == 0:
+                t, y = lv.t0[a:b], lv.mn[a:b, col]
+                keep = t >= start
+                xs.append(t[keep])
+                ys.append(y[keep])
+                continue
+            mid = (lv.t0[a:b] + lv.t1[a:b]) / 2
+            mn, mx = lv.mn[a:b, col], lv.mx[a:b, col]
+            # Draw each bucket as a vertical stroke, entering at the end nearer the
+            # previous bucket, so a steady trend doesn't zigzag
+            centre = (mn + mx) / 2
+            rising = np.empty(len(mid), dtype=bool)
+            rising[0] = True
+            rising[1:] = centre[1:] >= centre[:-1]
+            first = np.where(rising, mn, mx)
+            second = np.where(rising, mx, mn)
+            xs.append(np.repeat(mid, 2))
+            ys.append(np.column_stack((first, second)).ravel())
+        if not xs:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(xs) - now, np.concatenate(ys)
+
+    def clear(self):
+        self.levels = [_Level(len(self.fields))]
+        self.total = 0
@@ -2,21 +2,116 @@
 # For logging/recording data in CanSat GCS
 import csv
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from data.flight_log import FlightLogWriter
+
+_STOP = object()
+
 
 class DataLogger:
-    def __init__(self, folder_path="logs"):
+    """
+    CSV recorder with a dedicated writer thread.
+
+    log() only puts the row on a bounded queue, so the caller (the Tk thread)
+    never touches the disk. The writer batches rows and flushes when
+    `batch_rows` are pending or `flush_interval_s` has passed, and fsyncs every
+    `fsync_interval_s`, so a crash loses at most the last flush window.
+    With fmt="binary" rows go to a .cfr flight log (see data/flight_log.py) instead.
+    """
+
+    def __init__(self, fields, folder_path="logs", prefix="log", batch_rows=50,
+                 flush_interval_s=1.0, fsync_interval_s=5.0, queue_size=10000, fmt="csv", file_path=None,
+                 dtypes=None):
+        if fmt not in ("csv", "binary"):
+            raise ValueError(f"Unknown recording format {fmt!r}")
+        self.fields = list(fields)
         self.folder_path = folder_path
-        os.makedirs(self.folder_path, exist_ok=True)
+        self.fmt = fmt
+        self.dtypes = dtypes  # .cfr column types other than float64, e.g. {"source": "S16"}
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.file_path = os.path.join(self.folder_path, f"log_{timestamp}.csv")
-        self.file = open(self.file_path, mode='w', newline='')
-        self.writer = csv.writer(self.file)
-        self.writer.writerow(["Timestamp", "Sensor1", "Sensor2", "Sensor3"])  # Customize headers
+        ext = "cfr" if fmt == "binary" else "csv"
+        # file_path overrides the generated name, e.g. for a file that sits next to another recording
+        self.file_path = file_path or os.path.join(self.folder_path, f"{prefix}_{timestamp}.{ext}")
+        self.batch_rows = batch_rows
+        self.flush_interval_s = flush_interval_s
+        self.fsync_interval_s = fsync_interval_s
+        self.rows_written = 0
+        self.dropped = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="DataLogger", daemon=True)
+        self._thread.start()
+
+    def log(self, row):
+        """Queues one row (a dict keyed by field name). Never blocks; returns False if dropped."""
+        if self.error is not None:
+            self.dropped += 1  # the writer has stopped; don't fill a queue nobody drains
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
 
-    def log(self, sensor1, sensor2, sensor3):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.writer.writerow([timestamp, sensor1, sensor2, sensor3])
+    def close(self, timeout=5.0):
+        """Flushes everything still queued, fsyncs and closes the file; waits at most `timeout` seconds"""
+        if self.error is not None or not self._thread.is_alive():
+            return  # the writer already gave up (see self.error)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"[WARN] Recording still busy after {timeout:g} s; {self._queue.qsize()} rows not written yet.")
+            return
+        self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
 
-    def close(self):
-        self.file.close()
+    def _run(self):
+        try:
+            os.makedirs(self.folder_path, exist_ok=True)
+            if self.fmt == "binary":
+                file = writer = FlightLogWriter(self.file_path, self.fields, self.dtypes)
+            else:
+                file = open(self.file_path, mode='w', newline='')
+                writer = csv.DictWriter(file, fieldnames=self.fields, extrasaction="ignore")
+                writer.writeheader()
+        except OSError as e:
+            self.error = e
+            print(f"[!] Recording failed: {e}")
+            return
+        pending = []
+        last_flush = last_fsync = time.monotonic()
+        stopping = False
+        with file:
+            while not stopping:
+                timeout = max(0.0, last_flush + self.flush_interval_s - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                    # Take whatever else is already queued without waiting again
+                    while item is not _STOP:
+                        pending.append(item)
+                        if len(pending) >= self.batch_rows:
+                            break
+                        item = self._queue.get_nowait()
+                    stopping = item is _STOP
+                except queue.Empty:
+                    pass
+                now = time.monotonic()
+                if stopping or len(pending) >= self.batch_rows or now - last_flush >= self.flush_interval_s:
+                    try:
+                        if pending:
+                            writer.writerows(pending)
+                            self.rows_written += len(pending)
+                            pending.clear()
+                        file.flush()
+                        if stopping or now - last_fsync >= self.fsync_interval_s:
+                            os.fsync(file.fileno())
+                            last_fsync = now
+                    except OSError as e:
+                        self.error = e
+                        print(f"[!] Recording write error: {e}")
+                        return
+                    last_flush = now
@@ -0,0 +1,117 @@
+# ring_buffer.py
+# Fixed-capacity columnar telemetry history for CanSat GCS
+import numpy as np
+
+
+class TelemetryRingBuffer:
+    """
+    Preallocated ring buffer with one NumPy column per telemetry field.
+
+    Every column is stored twice back to back (a "mirrored" ring), so each append
+    costs two scalar writes and the most recent N samples are always one contiguous
+    slice. view() can therefore hand matplotlib a zero-copy array, and memory stays
+    fixed no matter how long the session runs.
+    """
+
+    def __init__(self, fields, capacity, dtypes=None, time_field="rx_time"):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        dtypes = dtypes or {}
+        self.capacity = capacity
+        self.time_field = time_field
+        self.fields = list(fields)
+        if time_field not in self.fields:
+            self.fields.append(time_field)
+        self._columns = {
+            name: np.full(2 * capacity, self._empty(dtypes.get(name, np.float64)), dtype=dtypes.get(name, np.float64))
+            for name in self.fields
+        }
+        self._column_list = [self._columns[name] for name in self.fields]
+        self._head = 0    # next write position in [0, capacity)
+        self._count = 0   # number of valid samples, <= capacity
+        self.total = 0    # samples appended over the whole session
+
+    @staticmethod
+    def _empty(dtype):
+        return np.nan if np.issubdtype(dtype, np.floating) else 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, row, timestamp=None):
+        """Stores one sample. Missing fields become NaN (or 0 for integer columns)."""
+        i = self._head
+        j = i + self.capacity
+        for name, column in self._columns.items():
+            value = row.get(name)
+            if value is None:
+                value = self._empty(column.dtype)
+            column[i] = value
+            column[j] = value
+        if row.get(self.time_field) is None:
+            ts = timestamp if timestamp is not None else 0.0
+            self._columns[self.time_field][i] = ts
+            self._columns[self.time_field][j] = ts
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def append_values(self, values, timestamp=None):
+        """
+        Stores one sample given as a sequence in `fields` order (a decoded row).
+        Faster than append(): no dict lookups, and NaN already marks missing values.
+        """
+        i = self._head
+        j = i + self.capacity
+        for column, value in zip(self._column_list, values):
+            column[i] = value
+            column[j] = value
+        if len(values) < len(self.fields):
+            ts = timestamp if timestamp is not None else 0.0
+            self._columns[self.time_field][i] = ts
+            self._columns[self.time_field][j] = ts
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def view(self, field, last=None):
+        """Zero-copy, read-only contiguous view of the most recent samples (oldest first)"""
+        n = self._count if last is None else min(last, self._count)
+        end = self._head + self.capacity
+        out = self._columns[field][end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def latest(self, field):
+        """Most recent value of a field, or None if the buffer is empty"""
+        if not self._count:
+            return None
+        return self._columns[field][self._head + self.capacity - 1]
+
+    def window(self, field, seconds, now=None):
+        """View of a field over the last `seconds` of receive time"""
+        times = self.view(self.time_field)
+        if not len(times):
+            return times
+        if now is None:
+            now = times[-1]
+        start = np.searchsorted(times, now - seconds, side="left")
+        return self.view(field, len(times) - start)
+
+    def window_stats(self, field, seconds, now=None):
+        """min/max/mean of a field over the last `seconds`, ignoring missing values"""
+        values = self.window(field, seconds, now)
+        if not len(values) or np.all(np.isnan(values)):
+            return {"min": None, "max": None, "mean": None, "count": 0}
+        return {
+            "min": float(np.nanmin(values)),
+            "max": float(np.nanmax(values)),
+            "mean": float(np.nanmean(values)),
+            "count": int(np.count_nonzero(~np.isnan(values))),
+        }
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
@@ -0,0 +1,206 @@
+# tile_cache.py
+# Persistent map tile cache (SQLite) with LRU eviction, and an offline prefetch tool
+#
+# The `tiles` table uses the same layout as tkintermapview's offline database,
+# so the map widget can also read it directly. Fill it before going to a launch
+# site without internet:
+#   python -m data.tile_cache --bbox 12.9 80.1 13.1 80.3 --zoom 12 17 \
+#       --server "http://localhost:8080/tile/{z}/{x}/{y}.png"
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from data.geo import tiles_in_bbox
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tiles (zoom INT, x INT, y INT, server VARCHAR(300), tile_image BLOB,
+                                  CONSTRAINT pk_tiles PRIMARY KEY (zoom, x, y, server));
+CREATE TABLE IF NOT EXISTS tile_lru (zoom INT, x INT, y INT, server VARCHAR(300), size INT, last_used REAL,
+                                     CONSTRAINT pk_tile_lru PRIMARY KEY (zoom, x, y, server));
+CREATE INDEX IF NOT EXISTS idx_tile_lru_last_used ON tile_lru (last_used);
+"""
+
+
+class TileCache:
+    """
+    On-disk tile store capped at `max_bytes`. get() marks a tile as used;
+    put() evicts least-recently-used tiles until the cache is back under
+    90% of the cap. Safe to share between the UI and tile loader threads.
+    """
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        # Tiles written by other tools (e.g. tkintermapview's OfflineLoader) join the LRU as never used
+        self._db.execute(
+            "INSERT OR IGNORE INTO tile_lru SELECT zoom, x, y, server, length(tile_image), 0 FROM tiles"
+        )
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM tile_lru").fetchone()[0]
+
+    def get(self, server, zoom, x, y):
+        """Tile image bytes, or None if not cached"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tile_image FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?", (zoom, x, y, server)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE tile_lru SET last_used=? WHERE zoom=? AND x=? AND y=? AND server=?",
+                (time.time(), zoom, x, y, server),
+            )
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def __contains__(self, key):
+        server, zoom, x, y = key
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?", (zoom, x, y, server)
+            ).fetchone() is not None
+
+    def put(self, server, zoom, x, y, data):
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM tile_lru WHERE zoom=? AND x=? AND y=? AND server=?", (zoom, x, y, server)
+            ).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?, ?)", (zoom, x, y, server, data))
+            self._db.execute(
+                "INSERT OR REPLACE INTO tile_lru VALUES (?, ?, ?, ?, ?, ?)", (zoom, x, y, server, len(data), time.time())
+            )
+            self.total_bytes += len(data) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+            self._db.commit()
+
+    def _evict(self, target):
+        rows = self._db.execute(
+            "SELECT zoom, x, y, server, size FROM tile_lru ORDER BY last_used"
+        ).fetchall()
+        for zoom, x, y, server, size in rows:
+            if self.total_bytes <= target:
+                break
+            key = (zoom, x, y, server)
+            self._db.execute("DELETE FROM tiles WHERE zoom=? AND x=? AND y=? AND server=?", key)
+            self._db.execute("DELETE FROM tile_lru WHERE zoom=? AND x=? AND y=? AND server=?", key)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM tile_lru").fetchone()[0]
+        return {"tiles": count, "bytes": self.total_bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def tile_url(server, zoom, x, y):
+    return server.replace("{z}", str(zoom)).replace("{x}", str(x)).replace("{y}", str(y))
+
+
+def fetch_tile(server, zoom, x, y, timeout=10.0):
+    """Downloads one tile; returns its bytes or None"""
+    request = urllib.request.Request(tile_url(server, zoom, x, y), headers={"User-Agent": "CanSatGCS"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+    except OSError:
+        return None
+
+
+# Public tile servers whose usage policy forbids bulk downloads (prefetch refuses them)
+_NO_BULK_HOSTS = ("tile.openstreetmap.org",)
+
+
+def bulk_allowed(server):
+    """False for servers such as OSM's public ones that must not be prefetched from"""
+    host = (urllib.parse.urlsplit(tile_url(server, 0, 0, 0)).hostname or "").lower()
+    return not any(host == h or host.endswith("." + h) for h in _NO_BULK_HOSTS)
+
+
+def prefetch(cache, server, lat1, lon1, lat2, lon2, zoom_min, zoom_max, workers=8, refresh=False, progress=None):
+    """
+    Fills the cache with every tile of the bounding box for zoom_min..zoom_max.
+    Tiles already cached are skipped unless refresh=True. Returns (fetched, failed, skipped).
+    Raises ValueError for a server that forbids bulk downloads (see bulk_allowed).
+    """
+    if not bulk_allowed(server):
+        raise ValueError(f"{server} does not allow bulk downloads; prefetch from a local tile server instead")
+    jobs = []
+    skipped = 0
+    for zoom in range(zoom_min, zoom_max + 1):
+        for x, y in tiles_in_bbox(lat1, lon1, lat2, lon2, zoom):
+            if not refresh and (server, zoom, x, y) in cache:
+                skipped += 1
+            else:
+                jobs.append((zoom, x, y))
+    fetched = failed = 0
+    # Downloads run in parallel; SQLite writes stay on this thread
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (zoom, x, y), data in zip(jobs, pool.map(lambda job: fetch_tile(server, *job), jobs)):
+            if data:
+                cache.put(server, zoom, x, y, data)
+                fetched += 1
+            else:
+                failed += 1
+            if progress:
+                progress(fetched + failed, len(jobs))
+    return fetched, failed, skipped
+
+
+def main(argv=None):
+    from config import settings
+
+    parser = argparse.ArgumentParser(prog="python -m data.tile_cache", description="Prefetch map tiles for offline use")
+    parser.add_argument("--bbox", nargs=4, type=float, required=True, metavar=("LAT1", "LON1", "LAT2", "LON2"))
+    parser.add_argument("--zoom", nargs=2, type=int, default=[12, 17], metavar=("MIN", "MAX"))
+    parser.add_argument("--server", default=settings.MAP_PREFETCH_SERVER, help="tile URL template with {z}/{x}/{y}, normally a local tile server (default: MAP_PREFETCH_SERVER)")
+    parser.add_argument("--cache", default=settings.MAP_TILE_CACHE_PATH)
+    parser.add_argument("--max-mb", type=float, default=settings.MAP_TILE_CACHE_MAX_MB)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--refresh", action="store_true", help="re-download tiles that are already cached")
+    args = parser.parse_args(argv)
+    if not bulk_allowed(args.server):
+        parser.error(f"{args.server} does not allow bulk downloads (tile usage policy); "
+                     "run a local tile server and pass its URL with --server")
+
+    cache = TileCache(args.cache, int(args.max_mb * 1024 * 1024))
+
+    def progress(done, total):
+        if done % 50 == 0 or done == total:
+            print(f"\r[..] {done}/{total} tiles", end="", flush=True)
+
+    fetched, failed, skipped = prefetch(cache, args.server, *args.bbox, *args.zoom, workers=args.workers,
+                                        refresh=args.refresh, progress=progress)
+    stats = cache.stats()
+    cache.close()
+    print(f"\n[✓] {fetched} fetched, {skipped} already cached, {failed} failed; "
+          f"cache {stats['tiles']} tiles, {stats['bytes'] / 1e6:.1f}/{stats['max_bytes'] / 1e6:.1f} MB")
+    if stats["evictions"]:
+        print(f"[WARN] Cache cap reached: {stats['evictions']} tiles evicted. Raise --max-mb or shrink the area.")
+    return 1 if failed and not fetched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# live_plot.py
+# Incremental, blitted line plots for the Tk dashboard
+import numpy as np
+
+
+class LivePlot:
+    """
+    Strip chart that creates its line artists once and only swaps their data.
+
+    Lines are marked animated, so a full figure draw renders just the axes,
+    ticks and titles; that image is cached and each update restores it and
+    blits the lines on top. A full redraw only happens when the y data leaves
+    the current limits (or shrinks to a fraction of them), when the x window
+    changes, or after a resize.
+
+    Series are either y arrays (x = sample index) or (x, y) pairs, e.g. time
+    relative to now from data.lod_store.LodStore.query().
+    """
+
+    def __init__(self, ax, canvas, lines, x_span, margin=0.1, shrink_ratio=0.25):
+        self.ax = ax
+        self.canvas = canvas
+        self.lines = list(lines)
+        self.margin = margin
+        self.shrink_ratio = shrink_ratio
+        self.full_draws = 0
+        self.blits = 0
+        self._x = np.arange(x_span, dtype=np.float64)
+        self._background = None
+        for line in self.lines:
+            line.set_animated(True)
+        self.ax.set_xlim(0, max(x_span - 1, 1))
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # Fired at the end of every full draw (including resizes): cache the
+        # static background and paint the lines into the same frame.
+        self._background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.full_draws += 1
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def set_x_window(self, x0, x1):
+        """Changes the x limits; the next update() does a full redraw"""
+        if (x0, x1) != self.ax.get_xlim():
+            self.ax.set_xlim(x0, x1)
+            self._background = None
+
+    def update(self, series):
+        """Sets one y array or (x, y) pair per line and repaints"""
+        ys = []
+        for line, data in zip(self.lines, series):
+            if isinstance(data, tuple):
+                x, y = data
+            else:
+                y = data
+                n = len(y)
+                if n > len(self._x):
+                    self._x = np.arange(n, dtype=np.float64)
+                x = self._x[:n]
+            line.set_data(x, y)
+            ys.append(y)
+        if self._rescale(ys) or self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_lines()
+        self.canvas.blit(self.ax.figure.bbox)
+        self.blits += 1
+
+    def _rescale(self, series):
+        """Adjusts y limits when needed; returns True if the decorations must be redrawn"""
+        lo = hi = None
+        for y in series:
+            finite = y[np.isfinite(y)]
+            if not len(finite):
+                continue
+            y_lo, y_hi = finite.min(), finite.max()
+            lo = y_lo if lo is None else min(lo, y_lo)
+            hi = y_hi if hi is None else max(hi, y_hi)
+        if lo is None:
+            return False
+        y0, y1 = self.ax.get_ylim()
+        span = hi - lo
+        pad = (span or abs(hi) or 1.0) * self.margin
+        if lo >= y0 and hi <= y1 and span + 2 * pad >= (y1 - y0) * self.shrink_ratio:
+            return False
+        self.ax.set_ylim(lo - pad, hi + pad)
+        return True
@@ -0,0 +1,69 @@
+# log_view.py
+# Mission log widget: batched, line-capped repaints with a severity filter
+import logging
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from core.mission_log import LEVELS
+
+_COLOURS = {logging.DEBUG: "#8a8", logging.INFO: "#0f0", logging.WARNING: "#fc3", logging.ERROR: "#f55"}
+
+
+class LogView:
+    """
+    Text widget over a MissionLog. flush() is a render callback: everything
+    logged since the last frame is inserted in one call, lines beyond
+    `max_lines` are deleted from the top, and the view only follows the end
+    if it was already there (scrolling back to read isn't interrupted).
+    """
+
+    def __init__(self, parent, mission_log, max_lines=500, min_level="info", bg="#181", height=12, width=28):
+        self.log = mission_log
+        self.max_lines = max_lines
+        self.min_level = LEVELS[min_level]
+        self.frame = tk.Frame(parent, bg=parent["bg"])
+        self.level_var = tk.StringVar(value=min_level)
+        self.filter = ttk.Combobox(self.frame, textvariable=self.level_var, values=list(LEVELS), state="readonly", width=8)
+        self.filter.bind("<<ComboboxSelected>>", lambda _e: self.set_level(self.level_var.get()))
+        self.filter.pack(anchor="e")
+        self.text = tk.Text(self.frame, height=height, width=width, bg=bg, fg=_COLOURS[logging.INFO],
+                            font=("Consolas", 9), state="disabled", wrap="word")
+        for level, colour in _COLOURS.items():
+            self.text.tag_configure(str(level), foreground=colour)
+        self.text.pack(fill="both", expand=True)
+        self.lines = 0
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_level(self, name):
+        """Shows entries at or above this severity; redraws from the retained history"""
+        self.min_level = LEVELS[name]
+        self.log.drain()  # already in the history redrawn below
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.lines = 0
+        self._insert(self.log.entries(self.min_level)[-self.max_lines:], follow=True)
+
+    def flush(self):
+        entries = [entry for entry in self.log.drain() if entry[1] >= self.min_level]
+        if entries:
+            self.text.config(state="normal")
+            self._insert(entries[-self.max_lines:], follow=self.text.yview()[1] >= 1.0)
+
+    def _insert(self, entries, follow):
+        # One insert for the whole batch: alternating text and tag arguments
+        args = []
+        for at, level, message in entries:
+            args += [f"{time.strftime('%H:%M:%S', time.localtime(at))} {message}\n", str(level)]
+        if args:
+            self.text.insert("end", *args)
+            self.lines += sum(message.count("\n") + 1 for _, _, message in entries)
+        excess = self.lines - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.lines -= excess
+        if follow:
+            self.text.see("end")
+        self.text.config(state="disabled")
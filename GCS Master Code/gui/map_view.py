@@ -0,0 +1,126 @@
+# map_view.py
+# GPS map panel: throttled marker and track updates over an offline-capable tile cache
+import io
+import time
+import tkinter as tk
+
+from config import settings
+from data.geo import distance_m
+from data.tile_cache import TileCache, fetch_tile
+
+
+def _cached_map_class():
+    """TkinterMapView subclass that loads tiles through a TileCache, or None without tkintermapview"""
+    try:
+        from tkintermapview import TkinterMapView
+        from PIL import Image, ImageTk
+    except ImportError:
+        return None
+
+    class CachedMapView(TkinterMapView):
+        # Replaces the widget's tile loader (runs on its background thread):
+        # cache first, then the tile server unless offline, writing downloads back
+        # so the next session at the launch site works without internet.
+        tile_cache = None
+        offline = False
+
+        def request_image(self, zoom, x, y, db_cursor=None):
+            data = self.tile_cache.get(self.tile_server, zoom, x, y)
+            if data is None and not self.offline:
+                data = fetch_tile(self.tile_server, zoom, x, y)
+                if data:
+                    self.tile_cache.put(self.tile_server, zoom, x, y, data)
+            if not data:
+                return self.empty_tile_image  # not cached: retried on the next repaint
+            try:
+                image_tk = ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+            except Exception:
+                return self.empty_tile_image
+            self.tile_image_cache[f"{zoom}{x}{y}"] = image_tk
+            return image_tk
+
+    return CachedMapView
+
+
+class MapPanel:
+    """
+    CanSat position on a map, updated only when it matters.
+
+    The marker moves when the fix has moved at least MAP_MIN_MOVE_M and
+    MAP_MIN_INTERVAL_S has passed since the last move; the view (and with it
+    the tile loading) only recentres once the CanSat is MAP_RECENTER_M from the
+    centre. The flown track is kept as a polyline decimated to at most
+    MAP_TRACK_MAX_POINTS points. Without tkintermapview a text label is shown.
+    """
+
+    def __init__(self, parent, width=200, height=180):
+        self.updates = 0
+        self.skipped = 0
+        self.track = []
+        self.cache = None
+        self.marker = None
+        self._path = None
+        self._marker_pos = None
+        self._center = None
+        self._last_move = 0.0
+        map_class = _cached_map_class()
+        if map_class is None:
+            self.widget = None
+            self.label = tk.Label(parent, text="Map: --, --", fg="#fff", bg="#222", font=("Consolas", 10), width=28)
+            self.label.pack(pady=8)
+            return
+        self.label = None
+        self.cache = TileCache(settings.MAP_TILE_CACHE_PATH, int(settings.MAP_TILE_CACHE_MAX_MB * 1024 * 1024))
+        map_class.tile_cache = self.cache
+        map_class.offline = settings.MAP_OFFLINE
+        self.widget = map_class(parent, width=width, height=height, corner_radius=8)
+        self.widget.set_tile_server(settings.MAP_TILE_SERVER)
+        self.widget.set_zoom(settings.MAP_ZOOM)
+        self.widget.pack(pady=8)
+
+    def update(self, lat, lon):
+        """Shows a new fix; returns True if the map was touched"""
+        valid = lat is not None and lon is not None and lat == lat and lon == lon
+        if self.widget is None:
+            self.label.config(text=f"Map: {lat:.6f}, {lon:.6f}" if valid else "Map: --, --")
+            return valid
+        if not valid:
+            return False
+        lat, lon = float(lat), float(lon)
+        now = time.monotonic()
+        if self._marker_pos is not None and (
+            distance_m(*self._marker_pos, lat, lon) < settings.MAP_MIN_MOVE_M
+            or now - self._last_move < settings.MAP_MIN_INTERVAL_S
+        ):
+            self.skipped += 1
+            return False
+        self._last_move = now
+        self._marker_pos = (lat, lon)
+        if self.marker is None:
+            self.marker = self.widget.set_marker(lat, lon, text="CanSat")
+        else:
+            self.marker.set_position(lat, lon)
+        if self._center is None or distance_m(*self._center, lat, lon) > settings.MAP_RECENTER_M:
+            self.widget.set_position(lat, lon)
+            self._center = (lat, lon)
+        self._extend_track(lat, lon)
+        self.updates += 1
+        return True
+
+    def _extend_track(self, lat, lon):
+        if self.track and distance_m(*self.track[-1], lat, lon) < settings.MAP_TRACK_MIN_STEP_M:
+            return
+        self.track.append((lat, lon))
+        if len(self.track) > settings.MAP_TRACK_MAX_POINTS:
+            # Halve the resolution of the history, always keeping the newest point
+            self.track = self.track[:-1:2] + [self.track[-1]]
+        if len(self.track) < 2:
+            return
+        if self._path is None:
+            self._path = self.widget.set_path(list(self.track))
+        else:
+            self._path.set_position_list(list(self.track))
+
+    def close(self):
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,101 @@
+# render_scheduler.py
+# Frame-rate-capped repaint loop with per-widget dirty flags
+import time
+
+
+class RenderScheduler:
+    """
+    Repaints registered widgets from the Tk event loop at most `max_fps` times a second.
+
+    Producers call mark_dirty(name) whenever a widget's data changed; each frame
+    only the dirty widgets are redrawn, and a frame with nothing dirty costs nothing.
+    If frames keep overrunning their budget the frame rate is lowered (down to
+    `min_fps`), and raised back once there is headroom again.
+    """
+
+    def __init__(self, root, max_fps=10, min_fps=2, overrun_frames=3, recover_frames=20):
+        self.root = root
+        self.max_fps = max_fps
+        self.min_fps = min_fps
+        self.fps = max_fps
+        self.overrun_frames = overrun_frames
+        self.recover_frames = recover_frames
+        self.frames = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.last_frame_s = 0.0
+        self._renderers = {}
+        self._listeners = []
+        self._dirty = set()
+        self._slow_streak = 0
+        self._fast_streak = 0
+        self._after_id = None
+
+    def add(self, name, render_fn):
+        """Registers a widget repaint callback; widgets are drawn in registration order"""
+        self._renderers[name] = render_fn
+
+    def add_frame_listener(self, listener):
+        """listener.frame_started() / listener.frame_finished(start) bracket every painted frame"""
+        self._listeners.append(listener)
+
+    def mark_dirty(self, *names):
+        self._dirty.update(names)
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(0, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        budget = 1.0 / self.fps
+        if self._dirty:
+            start = time.perf_counter()
+            for listener in self._listeners:
+                listener.frame_started()
+            dirty, self._dirty = self._dirty, set()
+            for name, render in self._renderers.items():
+                if name in dirty:
+                    try:
+                        render()
+                    except Exception as e:
+                        print(f"[!] Render error in {name}: {e}")
+            for listener in self._listeners:
+                listener.frame_finished(start)
+            self.last_frame_s = time.perf_counter() - start
+            self.frames += 1
+            self._adapt(self.last_frame_s, budget)
+        else:
+            self.skipped += 1
+        self._after_id = self.root.after(max(1, int(1000 / self.fps)), self._tick)
+
+    def _adapt(self, elapsed, budget):
+        if elapsed > budget:
+            self.overruns += 1
+            self._slow_streak += 1
+            self._fast_streak = 0
+            if self._slow_streak >= self.overrun_frames and self.fps > self.min_fps:
+                self.fps = max(self.min_fps, self.fps * 0.75)
+                self._slow_streak = 0
+        elif elapsed < budget * 0.5:
+            self._fast_streak += 1
+            self._slow_streak = 0
+            if self._fast_streak >= self.recover_frames and self.fps < self.max_fps:
+                self.fps = min(self.max_fps, self.fps * 1.25)
+                self._fast_streak = 0
+        else:
+            self._slow_streak = 0
+            self._fast_streak = 0
+
+    def stats(self):
+        return {
+            "fps": round(self.fps, 2),
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "last_frame_ms": round(self.last_frame_s * 1000, 2),
+        }
@@ -0,0 +1,50 @@
+# toast.py
+# Non-blocking notifications stacked in a corner of the window
+import tkinter as tk
+
+
+class ToastManager:
+    """
+    Shows short notifications over the bottom-right corner of `root` without
+    a modal dialog: the event loop (and ingestion) keeps running. Each toast
+    disappears after `duration_ms` or when clicked; at most `max_visible` are
+    shown, the oldest making room for a new one.
+    """
+
+    def __init__(self, root, duration_ms=5000, max_visible=3, bg="#333", fg="#fff", accent="#ff9f1c"):
+        self.root = root
+        self.duration_ms = duration_ms
+        self.max_visible = max_visible
+        self.bg, self.fg, self.accent = bg, fg, accent
+        self.toasts = []  # (frame, after id), oldest first
+
+    def show(self, message, title="Mission Event"):
+        if len(self.toasts) >= self.max_visible:
+            self._close(self.toasts[0][0])
+        frame = tk.Frame(self.root, bg=self.bg, highlightbackground=self.accent, highlightthickness=2)
+        tk.Label(frame, text=title, bg=self.bg, fg=self.accent, font=("Segoe UI", 10, "bold"), anchor="w").pack(fill="x", padx=8, pady=(6, 0))
+        tk.Label(frame, text=message, bg=self.bg, fg=self.fg, font=("Segoe UI", 10), justify="left",
+                 wraplength=280, anchor="w").pack(fill="x", padx=8, pady=(0, 6))
+        for widget in (frame, *frame.winfo_children()):
+            widget.bind("<Button-1>", lambda _e, f=frame: self._close(f))
+        after_id = self.root.after(self.duration_ms, lambda: self._close(frame))
+        self.toasts.append((frame, after_id))
+        self._layout()
+
+    def _close(self, frame):
+        for i, (f, after_id) in enumerate(self.toasts):
+            if f is frame:
+                self.root.after_cancel(after_id)
+                del self.toasts[i]
+                frame.destroy()
+                self._layout()
+                return
+
+    def _layout(self):
+        # Newest at the bottom, older ones stacked above it
+        y = -12
+        for frame, _ in reversed(self.toasts):
+            frame.place(relx=1.0, rely=1.0, x=-12, y=y, anchor="se")
+            frame.lift()
+            frame.update_idletasks()
+            y -= frame.winfo_reqheight() + 8
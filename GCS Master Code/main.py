@@ -1,59 +1,105 @@
-
-
-
 # --- CanSat GCS Tkinter UI with Serial/Dummy Data and Live Matplotlib Plots ---
+import time
+_T0 = time.perf_counter()  # startup report baseline, taken before any other import
+import argparse
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from PIL import Image, ImageTk
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from tkinter import ttk, simpledialog, filedialog
 import threading
-import time
-import queue
 import os
 from config import settings
-from serial_comm.port_handler import SerialHandler
-from data.dummy_data import generate_dummy_data
+from config.telemetry_schema import LABELS
+from core.event_bus import EventBus, LOG, NOTIFY
+from core.mission_log import MissionLog
+from core.pipeline import TelemetryPipeline
+from core.startup import StartupTimer
+from serial_comm.replay import ReplaySource
+from gui.log_view import LogView
+from gui.render_scheduler import RenderScheduler
+from gui.toast import ToastManager
+AUTO_DETECT = "Auto-detect"
+# PIL, matplotlib and the map widget are imported after the first frame (see _first_frame)
 
 class CanSatGCSApp:
-    # Static reference for event logging from SerialHandler
-    instance = None
-    def __init__(self, root):
-        CanSatGCSApp.instance = self
-        self.recording = False
-        self.csv_file = None
-        self.csv_writer = None
-        self.csv_fields = [
-            "time", "voltage", "gps_lat", "gps_lon", "altitude", "temperature", "pressure", "vertical_speed", "current", "gyro_x", "gyro_y", "gyro_z", "battery"
-        ]
+    def __init__(self, root, port=None, baud=None, record=False, startup=None):
         self.root = root
+        self.startup = startup or StartupTimer()
         self.root.title(settings.WINDOW_TITLE)
         self.root.geometry(f"{settings.WINDOW_WIDTH}x{settings.WINDOW_HEIGHT}")
         self.root.configure(bg=settings.THEME["background"])
-        self.serial_handler = SerialHandler()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        # The dashboard is just one subscriber of the headless telemetry core.
+        # Bus messages may come from any thread, so they are queued and drained on ours;
+        # log lines go straight into the (thread-safe) mission log and are painted once per frame.
+        with self.startup.measure("core"):
+            self.bus = EventBus()
+            self.mission_log = MissionLog(settings.MISSION_LOG_MAX_LINES, settings.MISSION_LOG_FILE,
+                                          settings.MISSION_LOG_FILE_MAX_BYTES, settings.MISSION_LOG_FILE_BACKUPS)
+            self.bus.subscribe(LOG, self.mission_log.add)
+            self._bus_inbox = self.bus.mailbox(NOTIFY)
+            self.pipeline = TelemetryPipeline(self.bus)
+        self.serial_handler = self.pipeline.handler
+        self.data_history = self.pipeline.store
         self.use_dummy = False
-        self.data_queue = queue.Queue()
-        self.mission_log = []
-        self._setup_ui()
-        self._show_port_modal()
+        self.replay = None
+        self._detect = None  # background port search: (thread, stop event, result list)
+        self._record_on_connect = False  # --port auto --record: start recording once the search finds the radio
+        self._shown = {}  # last values painted by the label/map widgets
+        self.plot_window = settings.PLOT_WINDOW_S  # seconds visible in the plots; None = whole flight
+        self.left_plots = []
+        self.map_panel = None
+        # After a reset on the pad, reading (and recording) starts before any widget exists.
+        # "auto" can take seconds, so that search runs in the background once the window is up.
+        search = port == "auto"
+        connected = bool(port) and not search and self._auto_connect(port, baud or settings.BAUD_RATE, record)
+        self._record_on_connect = search and record
+        with self.startup.measure("window"):
+            self._setup_ui()
+        self.renderer = RenderScheduler(self.root, settings.RENDER_MAX_FPS, settings.RENDER_MIN_FPS)
+        # Plot, gyro and map renderers are added once their widgets are built
+        self.renderer.add("battery", self._render_battery)
+        self.renderer.add("diagnostics", self._render_diagnostics)
+        self.renderer.add("log", self.log_view.flush)
+        self.toasts = ToastManager(self.root, settings.TOAST_DURATION_MS, settings.TOAST_MAX_VISIBLE,
+                                   accent=settings.THEME["fused_line"])
+        self.renderer.add_frame_listener(self.pipeline.latency)
+        self.pipeline.render_traced = True
+        self.broadcaster = None
+        if settings.BROADCAST_ENABLED:
+            from core.broadcast import TelemetryBroadcaster
+            self.broadcaster = TelemetryBroadcaster(
+                self.bus, settings.BROADCAST_HOST, settings.BROADCAST_TCP_PORT, settings.BROADCAST_WS_PORT,
+                settings.BROADCAST_CLIENT_BUFFER, settings.BROADCAST_CLIENT_POLICY)
+            self.broadcaster.start()
+        if connected:
+            self._start_data_loop()
+        else:
+            self._show_port_modal(search)
+        self.root.after_idle(self._first_frame)
+
+    def _auto_connect(self, port, baud, record):
+        with self.startup.measure("connect"):
+            if not self.serial_handler.connect(port, baud):
+                return False
+            if record:
+                self.pipeline.start_recording()
+        self.bus.publish(LOG, f"[INFO] Connected to {self.serial_handler.port}. Waiting for data...")  # shown once the log exists
+        return True
 
     def _setup_ui(self):
         # Header bar
         header = tk.Frame(self.root, bg="#222", height=60)
         header.pack(side="top", fill="x")
-        try:
-            logo_img = Image.open(settings.LOGO_PATH)
-            logo_img = logo_img.resize((48, 48))
-            self.logo = ImageTk.PhotoImage(logo_img)
-            logo_label = tk.Label(header, image=self.logo, bg="#222")
-            logo_label.pack(side="left", padx=10, pady=5)
-        except Exception:
-            logo_label = tk.Label(header, text="", bg="#222")
-            logo_label.pack(side="left", padx=10, pady=5)
+        self.logo_label = tk.Label(header, text="", bg="#222")  # image set in _build_logo
+        self.logo_label.pack(side="left", padx=10, pady=5)
         team_label = tk.Label(header, text=settings.TEAM_NAME, fg="#fff", bg="#222", font=("Segoe UI", 18, "bold"))
         team_label.pack(side="left", padx=10)
+        # Plot zoom: visible time window, from seconds to the whole flight
+        zoom = tk.Frame(header, bg="#222")
+        zoom.pack(side="right", padx=10)
+        tk.Label(zoom, text="Window:", fg="#aaa", bg="#222", font=("Segoe UI", 10)).pack(side="left")
+        for preset in settings.PLOT_WINDOW_PRESETS_S:
+            label = "All" if preset is None else (f"{preset // 60} min" if preset >= 60 else f"{preset} s")
+            ttk.Button(zoom, text=label, width=6, command=lambda w=preset: self._set_plot_window(w)).pack(side="left", padx=1)
 
         # Main layout with vertical scrollbar
         container = tk.Frame(self.root, bg=settings.THEME["background"])
@@ -77,54 +123,22 @@ class CanSatGCSApp:
         main.grid_columnconfigure(1, weight=1)
         main.grid_columnconfigure(2, weight=0)
 
-        # Two columns for 6 graphs (3 per column)
-        self.left_figs = []
-        self.left_axes = []
-        self.left_canvases = []
-        self.left_titles = [
-            "Altitude (m)",
-            "Temperature (°C)",
-            "Pressure (hPa)",
-            "Velocity (m/s)",
-            "Voltage (V)",
-            "Current (A)"
-        ]
+        # Two columns for 6 graphs (3 per column); the figures are added by _build_plots
+        self.left_keys = ["altitude", "temperature", "pressure", "vertical_speed", "voltage", "current"]
+        self.left_titles = [LABELS[key] for key in self.left_keys]
+        # Fused estimates (core/fusion.py) drawn over the raw readings they smooth
+        self.left_overlays = {"altitude": "fused_altitude", "vertical_speed": "fused_descent_rate"}
+        self.left_frames = []
         for i, title in enumerate(self.left_titles):
             col = 0 if i < 3 else 1
             row = i if i < 3 else i - 3
-            frame = tk.Frame(main, bg=settings.THEME["background"])
+            frame = tk.Frame(main, bg=settings.THEME["background"], width=300, height=200)
             frame.grid(row=row, column=col, sticky="nsew", padx=6, pady=6)
-            fig = Figure(figsize=(3, 2), dpi=100)
-            ax = fig.add_subplot(111)
-            ax.set_title(title, color="#fff", fontsize=10)
-            ax.tick_params(axis='x', colors='#aaa')
-            ax.tick_params(axis='y', colors='#aaa')
-            fig.patch.set_facecolor(settings.THEME["background"])
-            ax.set_facecolor(settings.THEME["background"])
-            canvas_fig = FigureCanvasTkAgg(fig, master=frame)
-            canvas_fig.get_tk_widget().pack(fill="both", expand=True)
-            self.left_figs.append(fig)
-            self.left_axes.append(ax)
-            self.left_canvases.append(canvas_fig)
+            self.left_frames.append(frame)
 
-        # Center panel (Gyroscope main graph, same size as left graphs)
-        center = tk.Frame(main, bg=settings.THEME["background"])
-        center.grid(row=0, column=2, rowspan=3, sticky="nsew", padx=10, pady=10)
-        self.gyro_fig = Figure(figsize=(3, 2), dpi=100)
-        self.gyro_ax = self.gyro_fig.add_subplot(111)
-        self.gyro_ax.set_title("Gyroscope (Pitch, Roll, Yaw)", color="#fff", fontsize=10)
-        self.gyro_ax.tick_params(axis='x', colors='#aaa')
-        self.gyro_ax.tick_params(axis='y', colors='#aaa')
-        self.gyro_fig.patch.set_facecolor(settings.THEME["background"])
-        self.gyro_ax.set_facecolor(settings.THEME["background"])
-        self.gyro_lines = {
-            'x': self.gyro_ax.plot([], [], label='Pitch')[0],
-            'y': self.gyro_ax.plot([], [], label='Roll')[0],
-            'z': self.gyro_ax.plot([], [], label='Yaw')[0],
-        }
-        self.gyro_ax.legend(facecolor="#222", edgecolor="#222", labelcolor="#fff")
-        self.gyro_canvas = FigureCanvasTkAgg(self.gyro_fig, master=center)
-        self.gyro_canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Center panel (Gyroscope main graph, same size as left graphs; built by _build_gyro)
+        self.gyro_frame = tk.Frame(main, bg=settings.THEME["background"], width=300, height=200)
+        self.gyro_frame.grid(row=0, column=2, rowspan=3, sticky="nsew", padx=10, pady=10)
 
         # Right panel (mission log, map, etc.)
         right = tk.Frame(main, bg=settings.THEME["background"], width=220)
@@ -145,23 +159,27 @@ class CanSatGCSApp:
         self.btn_rec.grid(row=0, column=0, padx=2)
         self.btn_stop = ttk.Button(btn_frame, text="Stop Recording", command=self._stop_recording)
         self.btn_stop.grid(row=0, column=1, padx=2)
+        # Replay controls, shown once a recording is being played back
+        self.replay_frame = tk.Frame(right, bg=settings.THEME["background"])
+        ttk.Button(self.replay_frame, text=f"« {settings.REPLAY_SKIP_S:g} s", width=7,
+                   command=lambda: self._skip_replay(-settings.REPLAY_SKIP_S)).grid(row=0, column=0, padx=1)
+        self.btn_pause = ttk.Button(self.replay_frame, text="Pause", width=7, command=self._toggle_replay)
+        self.btn_pause.grid(row=0, column=1, padx=1)
+        ttk.Button(self.replay_frame, text=f"{settings.REPLAY_SKIP_S:g} s »", width=7,
+                   command=lambda: self._skip_replay(settings.REPLAY_SKIP_S)).grid(row=0, column=2, padx=1)
+        self.replay_anchor = btn_frame
+        # Diagnostics: how far behind the vehicle the dashboard is, and link quality
+        self.diag_label = tk.Label(right, text="Latency: no data", fg="#ccc", bg="#222", font=("Consolas", 8), justify="left", anchor="w", width=34)
+        self.diag_label.pack(pady=(4, 0))
+        ttk.Button(right, text="Export Latency", command=self._export_latency).pack(pady=2)
         # Mission log
         log_label = tk.Label(right, text="Mission Log", fg="#fff", bg=settings.THEME["background"], font=("Consolas", 10, "bold"))
         log_label.pack(pady=(10, 0))
-        self.log_box = tk.Text(right, height=12, width=28, bg="#181", fg="#0f0", font=("Consolas", 9), state="disabled")
-        self.log_box.pack(pady=2)
-        # Map integration for GPS (real map)
-        try:
-            from tkintermapview import TkinterMapView
-            self.map_widget = TkinterMapView(right, width=200, height=180, corner_radius=8)
-            self.map_widget.set_position(0, 0)  # Default to (0,0)
-            self.map_marker = self.map_widget.set_marker(0, 0, text="CanSat")
-            self.map_widget.pack(pady=8)
-        except ImportError:
-            self.map_widget = None
-            self.map_marker = None
-            self.map_label = tk.Label(right, text="Map: --, --", fg="#fff", bg="#222", font=("Consolas", 10), width=28)
-            self.map_label.pack(pady=8)
+        self.log_view = LogView(right, self.mission_log, settings.MISSION_LOG_MAX_LINES, settings.MISSION_LOG_LEVEL)
+        self.log_view.pack(pady=2)
+        # Map integration for GPS (real map, tiles cached on disk for offline use; built by _build_map)
+        self.map_frame = tk.Frame(right, bg=settings.THEME["background"])
+        self.map_frame.pack()
 
         # Data storage for plots
         self._check_camera_port()
@@ -172,96 +190,246 @@ class CanSatGCSApp:
         # On Windows, camera devices are not files, so we just show not connected
         # For real detection, integrate OpenCV or similar
         self.cam_status.config(text="No Camera Connected", bg="#a22")
-        self.data_history = {
-            'Altitude (m)': [], 'Temperature (°C)': [], 'Pressure (hPa)': [], 'Velocity (m/s)': [], 'Voltage (V)': [], 'Current (A)': [],
-            'gyro_x': [], 'gyro_y': [], 'gyro_z': [], 'time': [], 'gps_lat': [], 'gps_lon': [], 'battery': []
+
+    def _first_frame(self):
+        # The window (and port dialog) is on screen and ingestion is running;
+        # now pay for the heavy imports and widgets, one per event-loop turn
+        self.root.update_idletasks()
+        self.startup.mark("first frame")
+        self._deferred = [
+            ("import matplotlib", self._import_matplotlib),
+            ("plots", self._build_plots),
+            ("gyro plot", self._build_gyro),
+            ("map", self._build_map),
+            ("logo", self._build_logo),
+        ]
+        self.root.after(1, self._build_deferred)
+
+    def _build_deferred(self):
+        name, build = self._deferred.pop(0)
+        with self.startup.measure(name):
+            build()
+        if self._deferred:
+            self.root.after(1, self._build_deferred)
+            return
+        self.startup.mark("ready")
+        print(self.startup.report())
+        self._log(f"[INFO] Dashboard ready in {self.startup.elapsed('ready'):.2f} s.")
+
+    def _import_matplotlib(self):
+        import matplotlib
+        matplotlib.use('TkAgg')
+        import matplotlib.backends.backend_tkagg
+        import matplotlib.figure
+
+    def _build_plots(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from gui.live_plot import LivePlot
+        self.left_figs = []
+        self.left_axes = []
+        self.left_canvases = []
+        for key, frame, title in zip(self.left_keys, self.left_frames, self.left_titles):
+            fig = Figure(figsize=(3, 2), dpi=100)
+            ax = fig.add_subplot(111)
+            ax.set_title(title, color="#fff", fontsize=10)
+            ax.tick_params(axis='x', colors='#aaa')
+            ax.tick_params(axis='y', colors='#aaa')
+            fig.patch.set_facecolor(settings.THEME["background"])
+            ax.set_facecolor(settings.THEME["background"])
+            canvas_fig = FigureCanvasTkAgg(fig, master=frame)
+            canvas_fig.get_tk_widget().pack(fill="both", expand=True)
+            lines = [ax.plot([], [], color=settings.THEME["graph_line"])[0]]
+            if key in self.left_overlays:
+                lines.append(ax.plot([], [], color=settings.THEME["fused_line"], linewidth=1)[0])
+            self.left_figs.append(fig)
+            self.left_axes.append(ax)
+            self.left_canvases.append(canvas_fig)
+            self.left_plots.append(LivePlot(ax, canvas_fig, lines, settings.MAX_DATA_POINTS))
+            canvas_fig.mpl_connect("scroll_event", self._on_plot_scroll)
+        self.renderer.add("plots", self._render_plots)
+        self.renderer.mark_dirty("plots")
+
+    def _build_gyro(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from gui.live_plot import LivePlot
+        self.gyro_fig = Figure(figsize=(3, 2), dpi=100)
+        self.gyro_ax = self.gyro_fig.add_subplot(111)
+        self.gyro_ax.set_title("Gyroscope (Pitch, Roll, Yaw)", color="#fff", fontsize=10)
+        self.gyro_ax.tick_params(axis='x', colors='#aaa')
+        self.gyro_ax.tick_params(axis='y', colors='#aaa')
+        self.gyro_fig.patch.set_facecolor(settings.THEME["background"])
+        self.gyro_ax.set_facecolor(settings.THEME["background"])
+        self.gyro_lines = {
+            'x': self.gyro_ax.plot([], [], label='Pitch')[0],
+            'y': self.gyro_ax.plot([], [], label='Roll')[0],
+            'z': self.gyro_ax.plot([], [], label='Yaw')[0],
         }
+        self.gyro_ax.legend(facecolor="#222", edgecolor="#222", labelcolor="#fff")
+        self.gyro_canvas = FigureCanvasTkAgg(self.gyro_fig, master=self.gyro_frame)
+        self.gyro_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.gyro_plot = LivePlot(self.gyro_ax, self.gyro_canvas, self.gyro_lines.values(), settings.MAX_DATA_POINTS)
+        self.gyro_canvas.mpl_connect("scroll_event", self._on_plot_scroll)
+        self.renderer.add("gyro", self._render_gyro)
+        self.renderer.mark_dirty("gyro")
 
+    def _build_map(self):
+        from gui.map_view import MapPanel
+        self.map_panel = MapPanel(self.map_frame, width=200, height=180)
+        self.renderer.add("map", self._render_map)
+        self.renderer.mark_dirty("map")
 
-    def _show_port_modal(self):
+    def _build_logo(self):
+        try:
+            from PIL import Image, ImageTk
+            logo_img = Image.open(settings.LOGO_PATH)
+            logo_img = logo_img.resize((48, 48))
+            self.logo = ImageTk.PhotoImage(logo_img)
+            self.logo_label.config(image=self.logo)
+        except Exception:
+            pass  # no logo file or no PIL: keep the empty label
+
+
+    def _show_port_modal(self, search=False):
         modal = tk.Toplevel(self.root)
         modal.title("Select Serial Port")
         modal.geometry("350x180")
         modal.grab_set()
         modal.transient(self.root)
         tk.Label(modal, text="Select Serial Port:", font=("Segoe UI", 12, "bold")).pack(pady=(18, 5))
-        ports = self.serial_handler.list_available_ports()
-        port_options = ports.copy() if ports else []
-        port_options.append("Dummy Mode")
-        port_var = tk.StringVar(value=port_options[0])
-        combo = ttk.Combobox(modal, textvariable=port_var, values=port_options, state="readonly")
+
+        def list_options():
+            return [AUTO_DETECT, *self.serial_handler.list_available_ports(), "Dummy Mode", "Replay File..."]
+        port_var = tk.StringVar(value=AUTO_DETECT)
+        combo = ttk.Combobox(modal, textvariable=port_var, values=list_options(), state="readonly")
         combo.pack(pady=5)
         status_label = tk.Label(modal, text="", fg="#f00")
         status_label.pack(pady=2)
 
         def refresh_ports():
-            ports = self.serial_handler.list_available_ports()
-            port_options = ports.copy() if ports else []
-            port_options.append("Dummy Mode")
-            combo['values'] = port_options
-            port_var.set(port_options[0])
+            combo['values'] = list_options()
+            port_var.set(AUTO_DETECT)
         ttk.Button(modal, text="Refresh", command=refresh_ports).pack(pady=2)
 
         def try_connect():
             port = port_var.get()
+            if port == AUTO_DETECT:
+                self._autodetect(modal, status_label)
+                return
+            self._stop_autodetect()
             if port == "Dummy Mode":
                 self._log("[INFO] Dummy mode selected.")
                 self.use_dummy = True
                 modal.destroy()
                 self._start_data_loop()
                 return
-            if not port:
-                self._log("[WARN] No serial ports found. Switching to dummy mode.")
-                self.use_dummy = True
-                modal.destroy()
-                self._start_data_loop()
+            if port == "Replay File...":
+                path = filedialog.askopenfilename(
+                    parent=modal, title="Select recording",
+                    filetypes=[("Recordings", "*.csv *.cfr"), ("Raw captures", "*.txt *.log"), ("All files", "*.*")],
+                )
+                if path:
+                    self._start_replay(path)
+                    modal.destroy()
+                    self._start_data_loop()
                 return
             ok = self.serial_handler.connect(port)
             if ok:
                 self._log(f"[INFO] Connected to {port}. Waiting for data...")
-                # Wait up to 5 seconds, checking every 1s for serial data before switching to dummy
-                self._check_data_or_dummy_retry(modal, retries=5)
+                self._check_data_or_dummy_retry(modal, status_label)
             else:
                 status_label.config(text="Failed to connect. Try another port.")
 
         ttk.Button(modal, text="Connect", command=try_connect).pack(pady=10)
+        modal.bind("<Destroy>", lambda e: e.widget is modal and self._stop_autodetect())
+        if search or settings.AUTODETECT_ON_START:
+            self._autodetect(modal, status_label)
 
-    def _check_data_or_dummy_retry(self, modal, retries=5):
-        data = self.serial_handler.get_data()
-        if data:
-            self._log("[INFO] Serial data received. Starting live mode.")
+    def _autodetect(self, modal, status_label):
+        """Searches every port in the background, round after round, until telemetry turns up or the dialog closes"""
+        if self._detect:
+            return
+        stop, result = threading.Event(), []
+        thread = threading.Thread(target=lambda: result.append(self.serial_handler.auto_connect(stop=stop)),
+                                  name="AutoDetect", daemon=True)
+        self._detect = (thread, stop, result)
+        thread.start()
+        status_label.config(text="Searching all ports for telemetry...", fg="#555")
+        self.root.after(100, lambda: self._autodetect_poll(modal, status_label, self._detect))
+
+    def _autodetect_poll(self, modal, status_label, search):
+        if search is not self._detect:
+            return  # stopped: another choice was made or the dialog closed
+        thread, stop, result = search
+        if not result:
+            self.root.after(100, lambda: self._autodetect_poll(modal, status_label, search))
+            return
+        self._detect = None
+        found = result[0]
+        if found:
+            self._log(f"[INFO] Telemetry found on {found.port} at {found.baud} baud ({found.format}). Starting live mode.")
             self.use_dummy = False
+            if self._record_on_connect:
+                self._start_recording()
             modal.destroy()
             self._start_data_loop()
-        elif retries > 1:
-            # Wait 1 second and try again
-            modal.after(1000, lambda: self._check_data_or_dummy_retry(modal, retries-1))
         else:
-            self._log("[WARN] No serial data. Switching to dummy mode.")
-            self.use_dummy = True
+            status_label.config(text="No telemetry yet. Still searching...", fg="#f00")
+            self.root.after(int(settings.AUTODETECT_RETRY_S * 1000),
+                            lambda: modal.winfo_exists() and self._autodetect(modal, status_label))
+
+    def _stop_autodetect(self):
+        """Ends a background search; a port it opened in the meantime is closed again"""
+        if not self._detect:
+            return
+        thread, stop, result = self._detect
+        self._detect = None
+        stop.set()
+        thread.join(2.0)
+        if result and result[0]:
+            self.serial_handler.disconnect()
+
+    def _start_replay(self, path):
+        # Recorded packets go through the same queue and parser as live serial data
+        self.replay = ReplaySource(self.serial_handler, path, speed=settings.REPLAY_SPEED)
+        self.replay.start()
+        self.use_dummy = False
+        speed = f"{settings.REPLAY_SPEED:g}x" if settings.REPLAY_SPEED else "max"
+        self._log(f"[INFO] Replaying {os.path.basename(path)} at {speed} speed.")
+        self.replay_frame.pack(after=self.replay_anchor, pady=(0, 4))
+
+    def _toggle_replay(self):
+        if self.replay.paused:
+            self.replay.resume()
+            self.btn_pause.config(text="Pause")
+        else:
+            self.replay.pause()
+            self.btn_pause.config(text="Resume")
+        self.renderer.mark_dirty("diagnostics")
+
+    def _skip_replay(self, seconds):
+        self.replay.skip(seconds)
+        self._log(f"[INFO] Replay at {self.replay.position_s:.0f} s.")
+        self.renderer.mark_dirty("diagnostics")
+
+    def _check_data_or_dummy_retry(self, modal, status_label, retries=50):
+        # Live as soon as the first packet is queued (checked every 100 ms, left in the queue)
+        if self.serial_handler.data_queue.qsize():
+            from serial_comm.autodetect import remember_link
+            self._log("[INFO] Serial data received. Starting live mode.")
+            remember_link(self.serial_handler.port, self.serial_handler.baud)
+            self.use_dummy = False
             modal.destroy()
             self._start_data_loop()
-
-    def _update_data(self):
-        # Get data from serial or dummy
-        data = None
-        if self.use_dummy:
-            # Try to get real data even in dummy mode, to allow switching if real data appears
-            real_data = self.serial_handler.get_data()
-            if real_data:
-                self._log("[INFO] Serial data detected. Switching to live mode.")
-                self.use_dummy = False
-                data = real_data
-            else:
-                data = self._get_dummy_data()
+        elif retries > 1:
+            modal.after(100, lambda: self._check_data_or_dummy_retry(modal, status_label, retries - 1))
         else:
-            data = self.serial_handler.get_data()
-            if not data:
-                # If no real data, keep trying (do not switch to dummy here)
-                pass
-        if data:
-            self._update_plots(data)
-        self.root.after(settings.GRAPH_REFRESH_INTERVAL_MS, self._update_data)
+            # Wrong port or baud: look everywhere rather than falling back to dummy data unasked
+            port = self.serial_handler.port
+            self.serial_handler.disconnect()
+            self._log(f"[WARN] No serial data on {port}. Searching all ports...")
+            self._autodetect(modal, status_label)
 
     def _check_data_or_dummy(self, modal):
         # Try to get data from serial queue
@@ -278,120 +446,171 @@ class CanSatGCSApp:
             self._start_data_loop()
 
     def _start_data_loop(self):
+        self.startup.mark("ingesting")
         self._update_time()
         self._update_data()
+        self.renderer.start()
 
     def _update_time(self):
         now = time.strftime("%H:%M:%S")
         self.time_label.config(text=now)
+        self.renderer.mark_dirty("diagnostics")
         self.root.after(1000, self._update_time)
 
     def _update_data(self):
-        # Get data from serial or dummy
+        # Ingestion only: move every packet that arrived since the last tick into
+        # the history and flag the widgets that changed. Painting happens in the
+        # render scheduler at its own (capped) frame rate.
         if self.use_dummy:
-            data = self._get_dummy_data()
+            self.pipeline.ingest(self._get_dummy_data())
+            count = 1
+            interval = settings.DUMMY_UPDATE_INTERVAL_MS
         else:
-            data = self.serial_handler.get_data()
-        if data:
-            self._update_plots(data)
-        self.root.after(settings.GRAPH_REFRESH_INTERVAL_MS, self._update_data)
+            count = self.pipeline.poll()
+            interval = settings.INGEST_INTERVAL_MS
+        if count:
+            self._mark_changed()
+        self._drain_bus()
+        self.root.after(interval, self._update_data)
+
+    def _drain_bus(self):
+        while not self._bus_inbox.empty():
+            topic, payload = self._bus_inbox.get()
+            if topic == NOTIFY:
+                self.toasts.show(payload)
+        if self.mission_log.pending:
+            self.renderer.mark_dirty("log")
+
+    def _mark_changed(self):
+        self.renderer.mark_dirty("plots", "gyro")
+        latest = self.data_history.latest
+        if not self._same(self._shown.get("battery"), latest('battery')):
+            self.renderer.mark_dirty("battery")
+        if not (self._same(self._shown.get("lat"), latest('gps_lat')) and self._same(self._shown.get("lon"), latest('gps_lon'))):
+            self.renderer.mark_dirty("map")
+
+    @staticmethod
+    def _same(a, b):
+        # Equality that treats two missing (NaN) readings as unchanged
+        return a == b or (a != a and b != b)
 
     def _get_dummy_data(self):
         # Use the same format as SerialHandler.generate_dummy_packet
         return self.serial_handler.generate_dummy_packet()
 
-    def _update_plots(self, data):
-        # Update left panel plots
-        for i, key in enumerate(["altitude", "temperature", "pressure", "vertical_speed", "voltage", "current"]):
-            val = data.get(key, 0)
-            title = self.left_titles[i]
-            self.data_history[title].append(val)
-            if len(self.data_history[title]) > settings.MAX_DATA_POINTS:
-                self.data_history[title].pop(0)
-            ax = self.left_axes[i]
-            ax.clear()
-            ax.plot(self.data_history[title], color=settings.THEME["graph_line"])
-            ax.set_title(title, color="#fff", fontsize=10)
-            ax.tick_params(axis='x', colors='#aaa')
-            ax.tick_params(axis='y', colors='#aaa')
-            ax.set_facecolor(settings.THEME["background"])
-            self.left_canvases[i].draw()
-        # Update center gyro plot
-        # Accept both {'gyro': {'x':..., 'y':..., 'z':...}} and {'x':..., 'y':..., 'z':...} at top level
-        gyro_data = data.get('gyro')
-        if gyro_data is None and all(axis in data for axis in ['x', 'y', 'z']):
-            gyro_data = {'x': data['x'], 'y': data['y'], 'z': data['z']}
-        if gyro_data:
-            for axis, line in zip(['x', 'y', 'z'], [self.gyro_lines['x'], self.gyro_lines['y'], self.gyro_lines['z']]):
-                gyro_val = gyro_data.get(axis, 0)
-                self.data_history[f'gyro_{axis}'].append(gyro_val)
-                if len(self.data_history[f'gyro_{axis}']) > settings.MAX_DATA_POINTS:
-                    self.data_history[f'gyro_{axis}'].pop(0)
-                line.set_data(range(len(self.data_history[f'gyro_{axis}'])), self.data_history[f'gyro_{axis}'])
-        self.gyro_ax.relim()
-        self.gyro_ax.autoscale_view()
-        self.gyro_canvas.draw()
-        # Update map widget with GPS
-        lat = data.get('gps', {}).get('lat', None)
-        lon = data.get('gps', {}).get('lon', None)
-        self.data_history['gps_lat'].append(lat if lat is not None else '--')
-        self.data_history['gps_lon'].append(lon if lon is not None else '--')
-        if self.map_widget and lat not in (None, '--') and lon not in (None, '--'):
-            try:
-                lat_f = float(lat)
-                lon_f = float(lon)
-                self.map_widget.set_position(lat_f, lon_f)
-                if self.map_marker:
-                    self.map_marker.set_position(lat_f, lon_f)
-                else:
-                    self.map_marker = self.map_widget.set_marker(lat_f, lon_f, text="CanSat")
-            except Exception:
-                pass
-        elif hasattr(self, 'map_label'):
-            self.map_label.config(text=f"Map: {lat}, {lon}")
-        # Update battery label
-        battery = data.get('battery', '--')
-        self.data_history['battery'].append(battery)
-        self.battery_label.config(text=f"Battery: {battery}%")
-        # Log time
-        t = data.get('time', time.strftime("%H:%M:%S"))
-        self.data_history['time'].append(t)
+    def _set_plot_window(self, seconds):
+        self.plot_window = seconds
+        self.renderer.mark_dirty("plots", "gyro")
+
+    def _on_plot_scroll(self, event):
+        # Wheel up zooms in, wheel down zooms out to the whole flight
+        lod = self.pipeline.lod
+        flight = (lod.last_time - lod.first_time) if len(lod) else 0.0
+        window = self.plot_window if self.plot_window is not None else max(flight, settings.PLOT_MIN_WINDOW_S)
+        window = window * (0.8 if event.button == "up" else 1.25)
+        if window > flight and event.button != "up":
+            self._set_plot_window(None)
+        else:
+            self._set_plot_window(max(window, settings.PLOT_MIN_WINDOW_S))
+
+    def _x_span(self):
+        """Visible x extent in seconds; for the whole flight it steps 1-2-5 so the axes rarely redraw"""
+        if self.plot_window is not None:
+            return self.plot_window
+        lod = self.pipeline.lod
+        flight = (lod.last_time - lod.first_time) if len(lod) else 0.0
+        span = 1.0
+        while span < flight:
+            for step in (2, 2.5, 2):
+                span *= step
+                if span >= flight:
+                    break
+        return span
+
+    def _render_plots(self):
+        # Update left panel plots (line data only; axes are redrawn just when limits change).
+        # The LOD store returns at most MAX_DATA_POINTS per line for any window.
+        span = self._x_span()
+        for key, plot in zip(self.left_keys, self.left_plots):
+            plot.set_x_window(-span, 0)
+            keys = [key, self.left_overlays[key]] if key in self.left_overlays else [key]
+            plot.update([self.pipeline.lod.query(k, self.plot_window, settings.MAX_DATA_POINTS) for k in keys])
+
+    def _render_gyro(self):
+        self.gyro_plot.set_x_window(-self._x_span(), 0)
+        self.gyro_plot.update([self.pipeline.lod.query(f'gyro_{axis}', self.plot_window, settings.MAX_DATA_POINTS)
+                               for axis in self.gyro_lines])
+
+    def _render_map(self):
+        lat = self.data_history.latest('gps_lat')
+        lon = self.data_history.latest('gps_lon')
+        self._shown["lat"], self._shown["lon"] = lat, lon
+        # MapPanel skips sub-threshold moves, so GPS jitter doesn't reload tiles
+        self.map_panel.update(lat, lon)
+
+    def _render_battery(self):
+        battery = self.data_history.latest('battery')
+        self._shown["battery"] = battery
+        text = f"{round(float(battery), 2)}" if battery is not None and battery == battery else "--"
+        self.battery_label.config(text=f"Battery: {text}%")
+
+    def _render_diagnostics(self):
+        text = self.pipeline.latency.summary_text() + "\n" + self.serial_handler.link.summary_text(self.serial_handler.queue_stats())
+        if self.replay:
+            text += "\n" + self.replay.summary_text()
+        self.diag_label.config(text=text)
+
+    def _export_latency(self):
+        path = time.strftime("latency_%Y%m%d_%H%M%S.json")
+        # Keep file I/O off the UI thread
+        threading.Thread(target=self.pipeline.latency.export, args=(path,), daemon=True).start()
+        self._log(f"[INFO] Latency report exported: {path}")
 
     def _log(self, msg):
-        self.log_box.config(state="normal")
-        self.log_box.insert("end", msg + "\n")
-        self.log_box.see("end")
-        self.log_box.config(state="disabled")
+        # Painted with the next frame, together with whatever else was logged
+        self.mission_log.add(msg)
+        self.renderer.mark_dirty("log")
 
     def _start_mission(self):
         self._log("[MISSION] Mission started.")
 
     def _start_recording(self):
-        import csv
-        if not self.recording:
-            filename = time.strftime("recording_%Y%m%d_%H%M%S.csv")
-            self.csv_file = open(filename, mode="w", newline="")
-            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=self.csv_fields)
-            self.csv_writer.writeheader()
-            self.recording = True
-            self._log(f"[RECORD] Data recording started: {filename}")
+        if not self.pipeline.recorder:
+            self.pipeline.start_recording()
         else:
             self._log("[RECORD] Already recording.")
+        self._drain_bus()
 
     def _stop_recording(self):
-        if self.recording:
-            self.recording = False
-            if self.csv_file:
-                self.csv_file.close()
-                self.csv_file = None
-                self.csv_writer = None
-            self._log("[RECORD] Data recording stopped.")
+        if self.pipeline.recorder:
+            # Don't wait for the final flush on the UI thread
+            self.pipeline.stop_recording(wait=0)
         else:
             self._log("[RECORD] Not currently recording.")
-        # (Removed block that incorrectly tried to write CSV row using undefined 'data')
+        self._drain_bus()
+
+    def _on_close(self):
+        if self.replay:
+            self.replay.stop()
+        self.pipeline.shutdown(wait=5.0)
+        if self.broadcaster:
+            self.broadcaster.stop()
+        self.mission_log.close()
+        self.root.destroy()
+        if self.map_panel:
+            self.map_panel.close()
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = CanSatGCSApp(root)
+    parser = argparse.ArgumentParser(description="CanSat ground station dashboard")
+    parser.add_argument("--port", default=settings.AUTO_CONNECT_PORT,
+                        help='open this serial port at once, skipping the port dialog ("auto": the first one with telemetry)')
+    parser.add_argument("--baud", type=int, default=settings.BAUD_RATE)
+    parser.add_argument("--record", action="store_true", default=settings.AUTO_RECORD, help="with --port, record from the first packet")
+    args = parser.parse_args()
+    startup = StartupTimer(_T0)
+    startup.mark("imports")
+    with startup.measure("tk"):
+        root = tk.Tk()
+    app = CanSatGCSApp(root, args.port, args.baud, args.record, startup)
     root.mainloop()
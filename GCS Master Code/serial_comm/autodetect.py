@@ -0,0 +1,189 @@
+# serial_comm/autodetect.py
+# Finds the ground radio: every port probed at once, across baud rates, until real telemetry is decoded
+__all__ = ["AUTO", "Detection", "detect_link", "last_link", "remember_link"]
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from config import settings
+from config.telemetry_schema import FIELD_NAMES, TIME_FIELD
+from serial_comm.binary_protocol import FRAME_SIZE, SYNC
+from serial_comm.multilink import Link
+
+AUTO = "auto"  # port name meaning "find it" (main.py --port auto, python -m core --port auto)
+
+# port/baud that decoded telemetry, how it was framed ("csv", "json" or "binary"),
+# packets and framing errors seen while probing, seconds from the start of the search
+Detection = namedtuple("Detection", "port baud format packets errors elapsed")
+
+_TIME = FIELD_NAMES.index(TIME_FIELD)
+_TEXT = frozenset(range(0x20, 0x7F)) | {0x09, 0x0A, 0x0D}
+_READ_SLICE_S = 0.05  # read timeout, so a probe notices the search is over
+
+
+def last_link(path=None):
+    """(port, baud) that last delivered telemetry, or None"""
+    try:
+        with open(path or settings.LAST_LINK_FILE) as f:
+            saved = json.load(f)
+        return saved["port"], int(saved["baud"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def remember_link(port, baud, path=None):
+    """Saves `port`/`baud` so the next search tries them first"""
+    path = path or settings.LAST_LINK_FILE
+    if not path:
+        return
+    try:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"port": port, "baud": baud, "time": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    except OSError as e:
+        print(f"[WARN] Could not remember the link: {e}")
+
+
+def _valid(row):
+    # A JSON object always decodes to a row; only one with a clock is telemetry
+    return row[_TIME] == row[_TIME]
+
+
+class _Probe(threading.Thread):
+    """
+    Tries the bauds on one port in turn. A baud is given up once it has
+    produced too many bytes without one valid packet (a frame's worth of
+    non-text with no sync word, `max_bytes` of non-text, two long lines of
+    text) or `dwell_s` after its first byte; an idle line says nothing about
+    the baud, so silence never moves the probe on. Once a baud
+    decodes telemetry the probe stays on it and keeps counting until stopped.
+    """
+
+    def __init__(self, port, bauds, stop, found, dwell_s, max_bytes):
+        super().__init__(name=f"Probe {port}", daemon=True)
+        self.port = port
+        self.bauds = bauds
+        self.stop = stop
+        self.found = found  # set (for the coordinator) at the first valid packet
+        self.dwell_s = dwell_s
+        self.max_bytes = max_bytes
+        self.t0 = time.perf_counter()
+        self.result = None
+        self.sweeping = False  # bytes came in during the first pass over the bauds
+        self.swept = False
+
+    def run(self):
+        import serial
+        try:
+            port = serial.Serial(self.port, baudrate=self.bauds[0], timeout=_READ_SLICE_S)
+        except (OSError, ValueError):  # busy, vanished or not a serial port
+            return
+        with port:
+            while not self.stop.is_set():
+                for baud in self.bauds:
+                    if self._try(port, baud) or self.stop.is_set():
+                        return
+                self.sweeping, self.swept = False, True
+
+    def _try(self, port, baud):
+        try:
+            port.baudrate = baud
+            port.reset_input_buffer()
+        except (OSError, ValueError):
+            self.stop.wait(_READ_SLICE_S)
+            return False
+        link = Link(self.port, port=self.port, baud=baud)
+        received = text = 0
+        first_byte = None
+        synced = False  # a binary sync word went by
+        tail = b""
+        packets = 0
+        while not self.stop.is_set():
+            try:
+                chunk = port.read(max(1, min(port.in_waiting, settings.SERIAL_READ_CHUNK_BYTES)))
+            except (OSError, ValueError):
+                self.stop.wait(_READ_SLICE_S)  # unplugged mid-probe
+                return False
+            now = time.perf_counter()
+            if not chunk:
+                continue
+            if first_byte is None:
+                first_byte = now
+                self.sweeping = not self.swept
+            received += len(chunk)
+            text += sum(1 for b in chunk if b in _TEXT)
+            synced = synced or SYNC in tail + chunk
+            tail = chunk[-1:]
+            good = sum(1 for _, row in link.feed(chunk, now) if _valid(row))
+            if good:
+                packets += good
+                s = link.stats
+                self.result = Detection(self.port, baud, link.format, packets,
+                                        s.parse_errors + s.frame_errors, now - self.t0)
+                self.found.set()
+            elif not packets:
+                if text >= 0.9 * received:
+                    limit = 2 * settings.SERIAL_MAX_LINE_BYTES  # text, maybe a long line
+                else:
+                    # More than a frame of non-text without a sync word can't be binary telemetry
+                    limit = self.max_bytes if synced else FRAME_SIZE + len(SYNC)
+                if received > limit or now - first_byte >= self.dwell_s:
+                    return False  # noise at this baud
+        return packets > 0
+
+
+def _candidate_bauds(preferred=None, bauds=None):
+    order = [preferred, settings.BAUD_RATE, *(bauds or settings.AUTODETECT_BAUDS)]
+    return [b for i, b in enumerate(order) if b and b not in order[:i]]
+
+
+def detect_link(ports, bauds=None, timeout=None, stop=None):
+    """
+    Probes all `ports` concurrently, one thread each, and returns the
+    Detection of the best one, or None if nothing decoded within `timeout`
+    seconds (or `stop` was set). A port that is sending keeps the search going
+    until each baud had its chance, up to AUTODETECT_SWEEP_MAX_S: at a slow
+    packet rate every wrong baud costs a packet interval. The remembered link (remember_link) is tried
+    first and wins at once; otherwise the other probes get a short grace
+    period after the first valid packet, then the port with the most packets
+    and fewest errors is chosen.
+    """
+    timeout = settings.AUTODETECT_TIMEOUT_S if timeout is None else timeout
+    stop = stop or threading.Event()
+    remembered = last_link()
+    found = threading.Event()
+    finished = threading.Event()  # probing is over, the caller's stop aside
+    # The remembered baud goes first on every port: a radio moved to another socket keeps its rate
+    candidates = _candidate_bauds(remembered and remembered[1], bauds)
+    probes = [
+        _Probe(port, candidates, finished, found, settings.AUTODETECT_BAUD_DWELL_S, settings.AUTODETECT_BAUD_BYTES)
+        for port in ports
+    ]
+    for probe in probes:
+        probe.start()
+    start = time.perf_counter()
+    deadline, sweep_deadline = start + timeout, start + max(timeout, settings.AUTODETECT_SWEEP_MAX_S)
+    while not stop.is_set() and not found.is_set():
+        now = time.perf_counter()
+        if now >= sweep_deadline or (now >= deadline and not any(p.sweeping for p in probes)):
+            break
+        found.wait(_READ_SLICE_S)
+    if found.is_set() and not stop.is_set():
+        winner = next((p.result for p in probes if p.result), None)
+        if not (remembered and winner and (winner.port, winner.baud) == remembered):
+            stop.wait(settings.AUTODETECT_GRACE_S)
+    finished.set()
+    for probe in probes:
+        probe.join(1.0)
+    if stop.is_set():
+        return None
+    results = [p.result for p in probes if p.result]
+    if not results:
+        return None
+    preferred = remembered or (None, None)
+    return max(results, key=lambda d: (d.packets, -d.errors, (d.port, d.baud) == preferred))
@@ -0,0 +1,86 @@
+# serial_comm/binary_protocol.py
+# Framed binary telemetry: sync word, length, sequence number, packed fields, CRC16
+#
+# Frame layout (little-endian):
+#   0xA5 0x5A | u8 payload length | u16 sequence | payload | u16 CRC
+# The CRC is CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over length, sequence
+# and payload; binascii.crc_hqx computes it in C. Fields are scaled integers as
+# declared in config/telemetry_schema.py. The matching encoder for the flight
+# computer is "Hardware Code/Teast Code/Ide test code 4/sketch_binary_frame.ino".
+__all__ = ["BinaryFrameDecoder", "encode_frame", "SYNC", "FRAME_SIZE"]
+
+import binascii
+import struct
+
+from config import telemetry_schema as schema
+
+SYNC = b"\xa5\x5a"
+
+# Fields, struct codes and scales come from the telemetry schema, in schema order
+FIELDS = [(f.name, f.wire, f.scale) for f in schema.FIELDS]
+
+_HEADER = struct.Struct("<2sBH")
+_PAYLOAD = struct.Struct("<" + "".join(code for _, code, _ in FIELDS))
+_CRC = struct.Struct("<H")
+PAYLOAD_SIZE = _PAYLOAD.size
+FRAME_SIZE = _HEADER.size + PAYLOAD_SIZE + _CRC.size
+_SCALES = [float(scale) for _, _, scale in FIELDS]
+
+
+def encode_frame(values, seq):
+    """Packs a dict of field values into one frame (the GCS side of the sketch encoder)"""
+    raw = [int(round((values.get(name) or 0) * scale)) for name, _, scale in FIELDS]
+    body = struct.pack("<BH", PAYLOAD_SIZE, seq & 0xFFFF) + _PAYLOAD.pack(*raw)
+    return SYNC + body + _CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+
+class BinaryFrameDecoder:
+    """
+    Incremental frame decoder. feed() takes raw bytes as they come off the port
+    and returns (seq, row) for every complete frame with a valid CRC, where row
+    is a list of floats in schema order (the same shape SchemaDecoder produces).
+    On a bad length or CRC it skips one byte and hunts for the next sync word,
+    so a corrupted frame costs only itself.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.resyncs = 0  # bytes skipped while hunting for a sync word
+
+    def feed(self, chunk):
+        buf = self._buffer
+        buf += chunk
+        out = []
+        pos = 0
+        end = len(buf)
+        view = memoryview(buf)
+        try:
+            while True:
+                start = buf.find(SYNC, pos)
+                if start < 0:
+                    # Keep a trailing 0xA5 that may be the first half of a sync word
+                    pos = end - 1 if end and buf[-1] == SYNC[0] else end
+                    break
+                self.resyncs += start - pos
+                if end - start < FRAME_SIZE:
+                    pos = start
+                    break
+                _, length, seq = _HEADER.unpack_from(view, start)
+                crc_end = start + FRAME_SIZE - _CRC.size
+                if length != PAYLOAD_SIZE or binascii.crc_hqx(view[start + 2:crc_end], 0xFFFF) != _CRC.unpack_from(view, crc_end)[0]:
+                    self.crc_errors += 1
+                    pos = start + 1
+                    continue
+                raw = _PAYLOAD.unpack_from(view, start + _HEADER.size)
+                out.append((seq, [v / s for v, s in zip(raw, _SCALES)]))
+                self.frames += 1
+                pos = start + FRAME_SIZE
+        finally:
+            view.release()
+        del buf[:pos]
+        return out
+
+    def reset(self):
+        self._buffer.clear()
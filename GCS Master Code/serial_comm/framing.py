@@ -0,0 +1,72 @@
+# serial_comm/framing.py
+# Splits raw serial byte chunks into newline-terminated lines or binary frames
+__all__ = ["LineFramer", "StreamFramer"]
+
+from serial_comm.binary_protocol import BinaryFrameDecoder
+
+
+class LineFramer:
+    """
+    Accumulates bytes read from the port in bulk and yields complete lines.
+    A line split across two reads is kept in the buffer until its newline arrives.
+    """
+
+    def __init__(self, max_line_bytes=1024):
+        self.max_line_bytes = max_line_bytes
+        self.overflows = 0  # partial lines discarded for never seeing a newline
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        """Adds a chunk of bytes and returns the list of complete lines (bytes, no line ending)"""
+        self._buffer += chunk
+        if b"\n" not in chunk:
+            # Garbage or a wrong baud rate can produce bytes with no newline ever
+            if len(self._buffer) > self.max_line_bytes:
+                self._buffer.clear()
+                self.overflows += 1
+            return []
+        lines = self._buffer.split(b"\n")
+        self._buffer = bytearray(lines.pop())
+        return [line.rstrip(b"\r") for line in lines if line.strip()]
+
+    def reset(self):
+        """Drops any partial line, e.g. after reconnecting"""
+        self._buffer.clear()
+
+
+class StreamFramer:
+    """
+    Auto-detects the link format. Every chunk is offered to the binary frame
+    decoder (cheap for ASCII, which never contains the 0xA5 sync byte); once a
+    frame passes its CRC the stream is treated as binary and the line framer is
+    bypassed, until `fallback_bytes` arrive without a valid frame.
+    """
+
+    def __init__(self, max_line_bytes=1024, fallback_bytes=4096):
+        self.lines = LineFramer(max_line_bytes)
+        self.frames = BinaryFrameDecoder()
+        self.fallback_bytes = fallback_bytes
+        self.binary = False
+        self._since_frame = 0
+
+    def feed(self, chunk):
+        """Returns (lines, frames): ASCII/JSON lines as bytes and binary frames as (seq, row)"""
+        frames = self.frames.feed(chunk)
+        if frames:
+            if not self.binary:
+                self.lines.reset()  # bytes before the first frame were not text
+            self.binary = True
+            self._since_frame = 0
+            return [], frames
+        if self.binary:
+            self._since_frame += len(chunk)
+            if self._since_frame < self.fallback_bytes:
+                return [], []
+            self.binary = False
+        return self.lines.feed(chunk), []
+
+    def reset(self):
+        self.lines.reset()
+        self.frames.reset()
+        self.binary = False
+        self._since_frame = 0
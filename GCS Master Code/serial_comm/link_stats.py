@@ -0,0 +1,178 @@
+# serial_comm/link_stats.py
+# Radio link quality: throughput, errors, gaps, jitter over a rolling window
+__all__ = ["LinkStats", "LINK_FIELDS"]
+
+import threading
+import time
+
+# Columns of the per-second link log written next to recordings
+LINK_FIELDS = [
+    "rx_time", "time", "altitude", "distance_m", "bytes_per_s", "packets_per_s", "error_rate",
+    "lost_packets", "gaps", "gap_s", "interval_ms", "jitter_ms", "queue_depth", "queue_dropped",
+]
+
+
+class _RollingSum:
+    """Sum of values added over the last `window_s` whole seconds, O(1) amortized per add"""
+
+    def __init__(self, window_s):
+        self.size = max(1, int(window_s))
+        self.buckets = [0] * self.size
+        self.total = 0
+        self.second = None
+
+    def _advance(self, now):
+        second = int(now)
+        if self.second is None or second - self.second >= self.size:
+            self.buckets = [0] * self.size
+            self.total = 0
+        else:
+            for s in range(self.second + 1, second + 1):
+                i = s % self.size
+                self.total -= self.buckets[i]
+                self.buckets[i] = 0
+        self.second = second
+
+    def add(self, value, now):
+        if self.second is None or int(now) > self.second:
+            self._advance(now)
+        self.buckets[int(now) % self.size] += value
+        self.total += value
+
+    def sum(self, now):
+        if self.second is None or int(now) > self.second:
+            self._advance(now)
+        return self.total
+
+
+class LinkStats:
+    """
+    Link-quality counters fed by SerialHandler.
+
+    The reader thread reports raw bytes, frame sequence numbers and CRC errors;
+    the consumer reports each decoded packet's clock and arrival time, and parse
+    failures. Rates are rolling sums over `window_s` seconds kept in per-second
+    buckets; inter-arrival mean and jitter are exponentially weighted (RFC 3550
+    style, gain 1/16). Every update is O(1).
+
+    Gaps come from sequence numbers when the link carries them (binary frames),
+    otherwise from jumps of more than `gap_s` in the packet clock.
+    """
+
+    def __init__(self, window_s=10.0, gap_s=2.0):
+        self.window_s = max(1, int(window_s))
+        self.gap_s = gap_s
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._bytes = _RollingSum(self.window_s)
+            self._packets = _RollingSum(self.window_s)
+            self._errors = _RollingSum(self.window_s)
+            self._started = None
+            self.total_bytes = 0
+            self.total_packets = 0
+            self.parse_errors = 0
+            self.frame_errors = 0
+            self.lost_packets = 0  # from sequence numbers
+            self.gaps = 0
+            self.gap_s_total = 0.0
+            self._last_seq = None
+            self._last_clock = None
+            self._last_arrival = None
+            self._interval = None
+            self._jitter = 0.0
+
+    def _start(self, now):
+        if self._started is None:
+            self._started = now
+
+    def add_bytes(self, count, now=None):
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self._start(now)
+            self.total_bytes += count
+            self._bytes.add(count, now)
+
+    def add_error(self, count=1, crc=False, now=None):
+        """A line that failed to parse, or (crc=True) a binary frame that failed its CRC"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self._start(now)
+            if crc:
+                self.frame_errors += count
+            else:
+                self.parse_errors += count
+            self._errors.add(count, now)
+
+    def add_sequence(self, seq):
+        """Binary frame sequence number (u16, wraps)"""
+        with self._lock:
+            last = self._last_seq
+            self._last_seq = seq
+            if last is None:
+                return
+            missing = (seq - last - 1) & 0xFFFF
+            if 0 < missing < 0x8000:  # larger means a duplicate or reordered frame
+                self.lost_packets += missing
+                self.gaps += 1
+
+    def add_packet(self, clock, arrival):
+        """One decoded packet: its clock (seconds of day, may be NaN) and perf_counter arrival"""
+        with self._lock:
+            self._start(arrival)
+            self.total_packets += 1
+            self._packets.add(1, arrival)
+            last = self._last_arrival
+            if last is not None:
+                interval = arrival - last
+                if self._interval is None:
+                    self._interval = interval
+                else:
+                    self._jitter += (abs(interval - self._interval) - self._jitter) / 16
+                    self._interval += (interval - self._interval) / 16
+            self._last_arrival = arrival
+            if clock == clock:
+                if self._last_seq is None and self._last_clock is not None:
+                    step = (clock - self._last_clock) % 86400.0  # midnight rollover
+                    if self.gap_s < step < 43200.0:
+                        self.gaps += 1
+                        self.gap_s_total += step
+                self._last_clock = clock
+
+    def stats(self, now=None):
+        """Snapshot of the rolling rates and totals"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            span = min(self.window_s, now - self._started) if self._started is not None else 0.0
+            span = max(span, 1.0)
+            packets = self._packets.sum(now)
+            errors = self._errors.sum(now)
+            return {
+                "bytes_per_s": self._bytes.sum(now) / span,
+                "packets_per_s": packets / span,
+                "error_rate": errors / (packets + errors) if packets + errors else 0.0,
+                "total_bytes": self.total_bytes,
+                "total_packets": self.total_packets,
+                "parse_errors": self.parse_errors,
+                "frame_errors": self.frame_errors,
+                "lost_packets": self.lost_packets,
+                "gaps": self.gaps,
+                "gap_s": self.gap_s_total,
+                "interval_ms": self._interval * 1000 if self._interval is not None else None,
+                "jitter_ms": self._jitter * 1000,
+            }
+
+    def summary_text(self, queue_stats=None):
+        """Short multi-line text for the diagnostics panel"""
+        s = self.stats()
+        lines = [
+            f"Link: {s['bytes_per_s']:.0f} B/s  {s['packets_per_s']:.1f} pkt/s",
+            f"  errors {s['error_rate'] * 100:.1f}%  lost {s['lost_packets']}  gaps {s['gaps']} ({s['gap_s']:.0f} s)",
+        ]
+        if s["interval_ms"] is not None:
+            lines.append(f"  interval {s['interval_ms']:.0f} ms  jitter {s['jitter_ms']:.1f} ms")
+        if queue_stats:
+            lines.append(f"  queue {queue_stats['depth']}/{queue_stats['maxsize']}  dropped {queue_stats['dropped']}")
+        return "\n".join(lines)
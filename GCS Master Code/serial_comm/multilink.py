@@ -0,0 +1,422 @@
+# serial_comm/multilink.py
+# Several radio links at once: one asyncio thread, one coroutine per link, redundant links deduplicated
+__all__ = ["Link", "MultiLinkHandler", "VehicleFeed"]
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from config import settings
+from config.telemetry_schema import FIELD_NAMES, TIME_FIELD
+from data.flight_log import format_time_of_day
+from data.logger import DataLogger
+from serial_comm.decoder import SchemaDecoder
+from serial_comm.framing import StreamFramer
+from serial_comm.link_stats import LinkStats
+from serial_comm.telemetry_queue import TelemetryQueue
+
+_TIME = FIELD_NAMES.index(TIME_FIELD)
+
+
+def _log(bus, message):
+    if bus:
+        from core.event_bus import LOG
+        bus.publish(LOG, message)
+    else:
+        print(message)
+
+
+def _file_safe(name):
+    # "/dev/ttyUSB0" -> "dev_ttyUSB0", "10.0.0.2:5760" -> "10.0.0.2_5760"
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "link"
+
+
+class Link:
+    """
+    One radio link (serial port or TCP stream) with its own framer, decoder,
+    link statistics and, while recording, its own recording of every packet it
+    received, duplicates included. `vehicle` groups redundant links: packets
+    are deduplicated across the links of one vehicle, never between vehicles.
+    """
+
+    def __init__(self, name, vehicle="cansat", port=None, baud=None, host=None, tcp_port=None):
+        self.name = name
+        self.vehicle = vehicle
+        self.port = port
+        self.baud = baud or settings.BAUD_RATE
+        self.host = host
+        self.tcp_port = tcp_port
+        self.framer = StreamFramer(settings.SERIAL_MAX_LINE_BYTES, settings.SERIAL_BINARY_FALLBACK_BYTES)
+        self.decoder = SchemaDecoder()
+        self.stats = LinkStats(settings.LINK_STATS_WINDOW_S, settings.LINK_GAP_S)
+        self.recorder = None
+        self.connected = False
+        self.packets = 0
+        self.duplicates = 0  # packets another link of the vehicle delivered first
+        self.format = None  # "csv", "json" or "binary", as last decoded
+        self.first_attempt = threading.Event()  # set once the link has tried to open
+
+    def __repr__(self):
+        target = self.port or f"{self.host}:{self.tcp_port}"
+        return f"Link({self.name!r}, {target}, vehicle={self.vehicle!r})"
+
+    def feed(self, chunk, t_read):
+        """
+        Frames and decodes one chunk; returns (key, row) for every good packet.
+        The key identifies the packet across redundant links: the frame sequence
+        number on binary links, the line itself on CSV/JSON links.
+        """
+        self.stats.add_bytes(len(chunk), t_read)
+        crc_errors = self.framer.frames.crc_errors
+        lines, frames = self.framer.feed(chunk)
+        out = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            row = None
+            if line.startswith(b"{"):
+                try:
+                    row = self.decoder.from_json(json.loads(line))
+                    self.format = "json"
+                except (ValueError, UnicodeDecodeError):
+                    pass
+            else:
+                row = self.decoder.from_csv(line)
+                if row is not None:
+                    self.format = "csv"
+            if row is None:
+                self.stats.add_error(now=t_read)
+            else:
+                out.append((bytes(line), row))
+        if frames:
+            self.format = "binary"
+        for seq, row in frames:
+            self.stats.add_sequence(seq)
+            out.append((seq, row))
+        if self.framer.frames.crc_errors != crc_errors:
+            self.stats.add_error(self.framer.frames.crc_errors - crc_errors, crc=True, now=t_read)
+        for _, row in out:
+            self.stats.add_packet(row[_TIME], t_read)
+        return out
+
+
+class _Deduplicator:
+    """
+    Remembers the last `window` packet keys of each vehicle and how many times
+    each link delivered them; O(links) per packet. A key is a duplicate only if
+    another link already delivered it as often: one radio repeating a line
+    (a CSV/JSON packet identical to the one before) is two packets, the same
+    line arriving over a second radio is one.
+    """
+
+    def __init__(self, window=512):
+        self.window = window
+        self._recent = {}  # vehicle -> (deque of keys, {key: [occurrences in the deque, {link: deliveries}]})
+
+    def seen(self, vehicle, key, link):
+        """True if another link already delivered this occurrence of `key`; otherwise remembers it"""
+        order, counts = self._recent.setdefault(vehicle, (deque(), {}))
+        entry = counts.get(key)
+        if entry is None:
+            entry = counts[key] = [0, {}]
+        delivered = entry[1]
+        n = delivered.get(link, 0) + 1
+        delivered[link] = n
+        if any(count >= n for name, count in delivered.items() if name != link):
+            return True
+        entry[0] += 1
+        order.append(key)
+        if len(order) > self.window:
+            old = order.popleft()
+            stale = counts[old]
+            stale[0] -= 1
+            if not stale[0]:
+                del counts[old]
+        return False
+
+
+class VehicleFeed:
+    """
+    One vehicle's deduplicated packets, with the consumer interface of
+    SerialHandler that TelemetryPipeline uses (get_batch, queue_stats, link...).
+    `link` holds the statistics of the combined stream: bytes and errors of all
+    the vehicle's links, and each packet once.
+    """
+
+    def __init__(self, owner, vehicle):
+        self.owner = owner
+        self.vehicle = vehicle
+        self.data_queue = TelemetryQueue(
+            settings.DATA_QUEUE_MAXSIZE, settings.DATA_QUEUE_POLICY, settings.DATA_QUEUE_BLOCK_TIMEOUT_S
+        )
+        self.decoder = SchemaDecoder()
+        self.link = LinkStats(settings.LINK_STATS_WINDOW_S, settings.LINK_GAP_S)
+
+    def get_data(self):
+        """Returns the oldest pending packet as a row, or None"""
+        entry = self.data_queue.get_nowait()
+        return entry[0] if entry else None
+
+    def get_batch(self, max_items=None, traced=False):
+        """
+        Every pending packet, oldest first. With traced=True returns
+        (row, trace, source) triples, source being the name of the link that
+        delivered the packet first (see SerialHandler.get_batch for the trace).
+        """
+        entries = self.data_queue.drain(max_items)
+        if not traced:
+            return [row for row, *_ in entries]
+        t_dequeue = time.perf_counter()
+        return [(row, [t_read, t_enqueue, t_dequeue, t_dequeue], source) for row, t_read, t_enqueue, source in entries]
+
+    def queue_stats(self):
+        return self.data_queue.stats()
+
+    def start_recording(self, base_path, fmt=None):
+        """Called by TelemetryPipeline.start_recording: each of the vehicle's links records too"""
+        self.owner.record_links(base_path, fmt, self.vehicle)
+
+    def stop_recording(self, wait=5.0):
+        self.owner.stop_link_recordings(wait, self.vehicle)
+
+    def disconnect(self):
+        pass  # the links belong to the MultiLinkHandler; see MultiLinkHandler.disconnect
+
+
+class MultiLinkHandler(VehicleFeed):
+    """
+    Reads any number of serial ports and TCP streams on one asyncio event loop
+    in one background thread: each link is a coroutine, not another polling
+    thread. Bytes are framed and decoded per link as they arrive; packets
+    already delivered by another link of the same vehicle are dropped, and the
+    rest are queued per vehicle, tagged with the link they came in on.
+
+    The handler itself is the feed of the first vehicle (a drop-in for
+    SerialHandler in TelemetryPipeline); feed(vehicle) gives the others, e.g.
+    for a second pipeline watching the payload. A link whose port vanishes is
+    reopened every `reconnect_s` until it comes back or is removed.
+    """
+
+    def __init__(self, bus=None, dedup_window=None, reconnect_s=None):
+        super().__init__(self, None)
+        self.bus = bus
+        self.reconnect_s = settings.MULTILINK_RECONNECT_S if reconnect_s is None else reconnect_s
+        self.links = {}
+        self.feeds = {}
+        self.duplicates = 0
+        self._dedup = _Deduplicator(settings.MULTILINK_DEDUP_WINDOW if dedup_window is None else dedup_window)
+        self._tasks = {}
+        self._loop = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def feed(self, vehicle):
+        """The feed of `vehicle`'s packets (created on first use)"""
+        if self.vehicle is None:
+            self.vehicle = vehicle
+        if vehicle == self.vehicle:
+            return self
+        if vehicle not in self.feeds:
+            self.feeds[vehicle] = VehicleFeed(self, vehicle)
+        return self.feeds[vehicle]
+
+    def add_serial(self, name, port, baud=None, vehicle="cansat"):
+        return self.add_link(Link(name, vehicle, port=port, baud=baud))
+
+    def add_tcp(self, name, host, port, vehicle="cansat"):
+        return self.add_link(Link(name, vehicle, host=host, tcp_port=port))
+
+    def add_link(self, link):
+        """Starts reading `link` (the event loop thread is started on first use)"""
+        if link.name in self.links:
+            raise ValueError(f"A link named {link.name!r} already exists")
+        self.feed(link.vehicle)
+        self.links[link.name] = link
+        self._ensure_loop()
+        self._loop.call_soon_threadsafe(self._spawn, link)
+        return link
+
+    def remove_link(self, name):
+        link = self.links.pop(name, None)
+        if link and self._loop:
+            self._loop.call_soon_threadsafe(self._cancel, name)
+        return link
+
+    def connect(self, port, baud=settings.BAUD_RATE):
+        """SerialHandler-style: adds `port` as a link; True if it opened within a couple of seconds"""
+        link = self.links.get(port) or self.add_serial(port, port, baud)
+        link.first_attempt.wait(2.0)
+        return link.connected
+
+    def disconnect(self):
+        """Stops every link and the event loop"""
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop)
+        try:
+            future.result(2.0)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(2.0)
+        self._loop = None
+        self.stop_link_recordings(wait=0)
+        _log(self.bus, "[!] All links closed.")
+
+    def record_links(self, base_path, fmt=None, vehicle=None):
+        """Records each link of `vehicle` (all of them by default) to <base_path>_rx-<link>.<ext>"""
+        fmt = fmt or settings.RECORD_FORMAT
+        ext = "cfr" if fmt == "binary" else "csv"
+        for link in list(self.links.values()):
+            if link.recorder is None and vehicle in (None, link.vehicle):
+                link.recorder = DataLogger(
+                    FIELD_NAMES, os.path.dirname(base_path) or ".",
+                    batch_rows=settings.RECORD_BATCH_ROWS,
+                    flush_interval_s=settings.RECORD_FLUSH_INTERVAL_S,
+                    fsync_interval_s=settings.RECORD_FSYNC_INTERVAL_S,
+                    queue_size=settings.RECORD_QUEUE_SIZE,
+                    fmt=fmt, file_path=f"{base_path}_rx-{_file_safe(link.name)}.{ext}",
+                )
+
+    def stop_link_recordings(self, wait=5.0, vehicle=None):
+        for link in list(self.links.values()):
+            if link.recorder and vehicle in (None, link.vehicle):
+                recorder, link.recorder = link.recorder, None
+                recorder.close(timeout=wait)
+
+    def stats(self):
+        """Per-link state and statistics, plus the duplicate count"""
+        return {
+            "duplicates": self.duplicates,
+            "links": [
+                dict(name=link.name, vehicle=link.vehicle, connected=link.connected, packets=link.packets,
+                     duplicates=link.duplicates, **link.stats.stats())
+                for link in list(self.links.values())
+            ],
+        }
+
+    # Everything below runs on the event loop thread
+
+    def _ensure_loop(self):
+        if self._loop:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="MultiLink", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def _spawn(self, link):
+        task = self._loop.create_task(self._run_link(link))
+        task.add_done_callback(lambda t, link=link: self._link_done(link, t))
+        self._tasks[link.name] = task
+
+    def _link_done(self, link, task):
+        if not task.cancelled() and task.exception():
+            link.connected = False
+            _log(self.bus, f"[!] Link {link.name} stopped: {task.exception()!r}")
+
+    def _cancel(self, name):
+        task = self._tasks.pop(name, None)
+        if task:
+            task.cancel()
+
+    async def _cancel_all(self):
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_link(self, link):
+        """Open, read until the link fails, wait, reopen; until cancelled"""
+        target = link.port or f"{link.host}:{link.tcp_port}"
+        while True:
+            try:
+                reader, close = await (self._open_tcp(link) if link.host else self._open_serial(link))
+            except (OSError, ValueError) as e:  # serial.SerialException is an OSError
+                if not link.first_attempt.is_set():
+                    _log(self.bus, f"[WARN] Link {link.name}: cannot open {target} ({e}); retrying every {self.reconnect_s:g} s.")
+                link.first_attempt.set()
+                await asyncio.sleep(self.reconnect_s)
+                continue
+            link.connected = True
+            link.first_attempt.set()
+            link.framer.reset()
+            _log(self.bus, f"[✓] Link {link.name} ({target}) open.")
+            try:
+                while True:
+                    chunk = await reader()
+                    if not chunk:
+                        break
+                    self._deliver(link, chunk, time.perf_counter())
+            except OSError as e:
+                _log(self.bus, f"[WARN] Link {link.name} lost: {e}")
+            else:
+                _log(self.bus, f"[WARN] Link {link.name} closed by the other end.")
+            finally:
+                link.connected = False
+                close()
+            await asyncio.sleep(self.reconnect_s)
+
+    async def _open_tcp(self, link):
+        reader, writer = await asyncio.open_connection(link.host, link.tcp_port)
+        return (lambda: reader.read(settings.SERIAL_READ_CHUNK_BYTES)), writer.close
+
+    async def _open_serial(self, link):
+        import serial
+        loop = asyncio.get_running_loop()
+        port = await loop.run_in_executor(None, lambda: serial.Serial(link.port, baudrate=link.baud, timeout=0))
+        reader = asyncio.StreamReader()
+        try:
+            # POSIX: the port's file descriptor is watched by the event loop itself
+            transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), port)
+        except (NotImplementedError, OSError, ValueError, AttributeError):
+            # Windows event loops can't watch a COM handle: blocking reads on the
+            # loop's shared worker pool instead (still no thread of the link's own)
+            port.timeout = settings.SERIAL_READ_TIMEOUT_S
+
+            async def read():
+                while True:
+                    waiting = port.in_waiting
+                    chunk = await loop.run_in_executor(
+                        None, port.read, min(waiting, settings.SERIAL_READ_CHUNK_BYTES) if waiting else 1)
+                    if chunk:
+                        return chunk
+            return read, port.close
+        return (lambda: reader.read(settings.SERIAL_READ_CHUNK_BYTES)), transport.close
+
+    def _deliver(self, link, chunk, t_read):
+        feed = self.feed(link.vehicle)
+        s = link.stats
+        errors = s.parse_errors + s.frame_errors
+        packets = link.feed(chunk, t_read)
+        # The combined stream's throughput and errors include every link's
+        feed.link.add_bytes(len(chunk), t_read)
+        if s.parse_errors + s.frame_errors > errors:
+            feed.link.add_error(s.parse_errors + s.frame_errors - errors, now=t_read)
+        for key, row in packets:
+            link.packets += 1
+            if link.recorder:
+                record = dict(zip(FIELD_NAMES, row))
+                record[TIME_FIELD] = format_time_of_day(row[_TIME])
+                link.recorder.log(record)
+            if self._dedup.seen(link.vehicle, key, link.name):
+                link.duplicates += 1
+                self.duplicates += 1
+                continue
+            feed.link.add_packet(row[_TIME], t_read)
+            feed.data_queue.put((row, t_read, time.perf_counter(), link.name))
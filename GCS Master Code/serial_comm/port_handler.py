@@ -1,34 +1,49 @@
 
 # serial_comm/port_handler.py
-print("[DEBUG] Loaded serial_comm/port_handler.py")
 __all__ = ["SerialHandler"]
 
-import serial
-import serial.tools.list_ports
+# pyserial is imported on first use (list/connect), so replay, dummy mode and
+# the dashboard's cold start don't pay for it
 import threading
-import queue
 import time
 import json
 from config import settings
 import random
+from serial_comm.decoder import SchemaDecoder
+from serial_comm.framing import StreamFramer
+from serial_comm.link_stats import LinkStats
+from serial_comm.telemetry_queue import TelemetryQueue
 
 class SerialHandler:
-    def __init__(self):
+    def __init__(self, bus=None):
+        self.bus = bus  # core.event_bus.EventBus, optional
         self.serial_port = None
+        self.port = None
+        self.baud = None
         self.running = False
         self.thread = None
-        self.data_queue = queue.Queue()
+        self.data_queue = TelemetryQueue(
+            settings.DATA_QUEUE_MAXSIZE, settings.DATA_QUEUE_POLICY, settings.DATA_QUEUE_BLOCK_TIMEOUT_S
+        )
+        self.decoder = SchemaDecoder()
+        self.link = LinkStats(settings.LINK_STATS_WINDOW_S, settings.LINK_GAP_S)
+        self.framer = StreamFramer(settings.SERIAL_MAX_LINE_BYTES, settings.SERIAL_BINARY_FALLBACK_BYTES)
         self._dummy_battery = 100.0  # For slow, monotonic battery decrease
 
     def list_available_ports(self):
         """Lists all available COM ports"""
+        import serial.tools.list_ports
         ports = serial.tools.list_ports.comports()
         return [port.device for port in ports]
 
     def connect(self, port=settings.SERIAL_PORT, baud=settings.BAUD_RATE):
-        """Attempts to connect to the given port"""
+        """Attempts to connect to the given port (None or "auto": whichever auto_connect finds)"""
+        if port in (None, "auto"):
+            return self.auto_connect() is not None
+        import serial
         try:
-            self.serial_port = serial.Serial(port, baudrate=baud, timeout=1)
+            self.serial_port = serial.Serial(port, baudrate=baud, timeout=settings.SERIAL_READ_TIMEOUT_S)
+            self.port, self.baud = port, baud
             self.running = True
             self.thread = threading.Thread(target=self.read_serial_data, daemon=True)
             self.thread.start()
@@ -38,68 +53,139 @@ class SerialHandler:
             print(f"[X] Serial connection failed: {e}")
             return False
 
+    def auto_connect(self, timeout=None, stop=None):
+        """
+        Probes every port for telemetry (serial_comm/autodetect.py), connects to
+        the best and remembers it for next time. Returns the Detection, or None
+        if no port delivered telemetry within `timeout` or `stop` was set.
+        """
+        from serial_comm.autodetect import detect_link, remember_link
+        ports = self.list_available_ports()
+        found = detect_link(ports, timeout=timeout, stop=stop) if ports else None
+        if found is None or (stop and stop.is_set()):
+            return None
+        print(f"[✓] Telemetry found on {found.port} at {found.baud} baud ({found.format}, {found.elapsed:.2f} s).")
+        if not self.connect(found.port, found.baud):
+            return None
+        remember_link(found.port, found.baud)
+        return found
+
     def disconnect(self):
         """Gracefully disconnect from serial port"""
         self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(1.0)  # a reconnect must not leave two readers on one handler
         if self.serial_port and self.serial_port.is_open:
             self.serial_port.close()
             print("[!] Serial port closed.")
 
     def read_serial_data(self):
-        """Reads incoming serial data"""
+        """Reads incoming serial data in bulk chunks and splits it into lines or binary frames"""
+        framer = self.framer
+        framer.reset()
+        self.link.reset()
+        crc_errors = framer.frames.crc_errors
         while self.running:
             try:
                 if settings.USE_DUMMY_DATA:
                     time.sleep(1)
                     dummy_data = self.generate_dummy_packet()
-                    self.data_queue.put(dummy_data)
-                elif self.serial_port and self.serial_port.in_waiting:
-                    line = self.serial_port.readline().decode('utf-8').strip()
-                    # Try JSON first
-                    try:
-                        data = json.loads(line)
-                        self.data_queue.put(data)
-                    except json.JSONDecodeError:
-                        # If not JSON, try as CSV (handled in get_data)
-                        if line:
-                            self.data_queue.put(line)
+                    self._enqueue(dummy_data, time.perf_counter())
+                elif self.serial_port:
+                    # Block for the first byte (up to the port timeout) instead of
+                    # spinning on in_waiting, then take everything already buffered.
+                    waiting = self.serial_port.in_waiting
+                    chunk = self.serial_port.read(min(waiting, settings.SERIAL_READ_CHUNK_BYTES) if waiting else 1)
+                    if chunk:
+                        t_read = time.perf_counter()
+                        self.link.add_bytes(len(chunk), t_read)
+                        lines, frames = framer.feed(chunk)
+                        for line in lines:
+                            self._handle_line(line, t_read)
+                        for seq, row in frames:
+                            self.link.add_sequence(seq)
+                            self._enqueue(row, t_read)
+                        if framer.frames.crc_errors != crc_errors:
+                            self.link.add_error(framer.frames.crc_errors - crc_errors, crc=True, now=t_read)
+                            crc_errors = framer.frames.crc_errors
+                else:
+                    time.sleep(settings.SERIAL_READ_TIMEOUT_S)
             except Exception as e:
                 print(f"[!] Serial Read Error: {e}")
+                # A vanished port raises on every call; don't turn that into a hot loop
+                time.sleep(settings.SERIAL_READ_TIMEOUT_S)
 
-    def get_data(self):
-        line = None
-        if not self.data_queue.empty():
-            line = self.data_queue.get()
+    def _handle_line(self, raw, t_read=None):
+        """Queues one received line, as a dict for JSON or as raw bytes for CSV"""
+        if t_read is None:
+            t_read = time.perf_counter()
+        line = raw.strip()
         if not line:
-            return None
+            return
+        # Only JSON objects start with '{'; skip the doomed json.loads for CSV lines
+        if line.startswith(b'{'):
+            try:
+                self._enqueue(json.loads(line), t_read)
+                return
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+        # If not JSON, try as CSV (decoded in the consumer thread by _parse)
+        self._enqueue(line, t_read)
 
-        # If the data is already a dict (from dummy or JSON), return as is
-        if isinstance(line, dict):
-            return line
+    def _enqueue(self, item, t_read):
+        # Stage timestamps travel with the packet (see core/latency.py)
+        self.data_queue.put((item, t_read, time.perf_counter()))
 
-        # If it's a CSV string, parse into a dict
-        try:
-            vals = str(line).strip().split(',')
-            # Arduino output: voltage,gps_lat,gps_lon,altitude,temperature,pressure,vertical_speed,current,gyro_x,gyro_y,gyro_z,battery,time
-            return {
-                "voltage": float(vals[0]),
-                "gps": {"lat": float(vals[1]), "lon": float(vals[2])},
-                "altitude": float(vals[3]),
-                "temperature": float(vals[4]),
-                "pressure": float(vals[5]),
-                "vertical_speed": float(vals[6]),
-                "current": float(vals[7]),
-                "gyro": {"x": float(vals[8]), "y": float(vals[9]), "z": float(vals[10])},
-                "battery": float(vals[11]),
-                "time": vals[12]
-            }
-        except Exception as e:
-            print("Parse error:", e, "Raw:", line)
-            return None
+    def get_data(self):
+        """Returns the oldest pending packet as a row (see SchemaDecoder), or None"""
+        entry = self.data_queue.get_nowait()
+        return self._account(self._parse(entry[0]), entry[1]) if entry else None
 
+    def get_batch(self, max_items=None, traced=False):
+        """
+        Drains every pending packet in one call and returns the decoded rows, oldest first.
+        With traced=True returns (data, trace) pairs, where trace is a list of
+        perf_counter stamps [read, enqueue, dequeue, parsed] that later stages extend.
+        """
+        batch = []
+        entries = self.data_queue.drain(max_items)
+        t_dequeue = time.perf_counter()
+        for line, t_read, t_enqueue in entries:
+            data = self._account(self._parse(line), t_read)
+            if data:
+                if traced:
+                    batch.append((data, [t_read, t_enqueue, t_dequeue, time.perf_counter()]))
+                else:
+                    batch.append(data)
+        return batch
 
-    def generate_dummy_packet(self):
-        """Realistic CanSat mission profile dummy data with event logging"""
+    def _account(self, row, t_read):
+        # Every dequeued packet feeds the link statistics, failures included
+        if row is None:
+            self.link.add_error(now=t_read)
+        else:
+            self.link.add_packet(row[self.decoder.time_index], t_read)
+        return row
+
+    def queue_stats(self):
+        """Queue depth and dropped-packet counters"""
+        return self.data_queue.stats()
+
+    def _parse(self, item):
+        """Queued item -> flat row in config/telemetry_schema.py field order, or None"""
+        if isinstance(item, list):
+            return item  # binary frame, already decoded
+        if isinstance(item, dict):
+            return self.decoder.from_json(item)  # JSON or dummy packet
+        if not item:
+            return None
+        return self.decoder.from_csv(item)  # None if malformed; counted in self.link
+
+    def generate_dummy_packet(self, now=None):
+        """
+        Realistic CanSat mission profile dummy data (events are detected downstream, core/phase_detector.py);
+        `now` is the packet's time.time(), for a simulated clock
+        """
         # State variables for mission profile
         if not hasattr(self, '_dummy_battery'):
             self._dummy_battery = 100.0
@@ -109,12 +195,12 @@ class SerialHandler:
             self._dummy_velocity = 0.0
         if not hasattr(self, '_dummy_phase'):
             self._dummy_phase = 0
+        now = time.time() if now is None else now
         if not hasattr(self, '_dummy_last_time'):
-            self._dummy_last_time = time.time()
+            self._dummy_last_time = now
         if not hasattr(self, '_dummy_events_logged'):
             self._dummy_events_logged = set()
         # Time step
-        now = time.time()
         dt = now - self._dummy_last_time
         self._dummy_last_time = now
         # Mission phases:
@@ -134,7 +220,6 @@ class SerialHandler:
                 self._dummy_phase = 1
                 self._dummy_velocity = 15
                 self._dummy_events_logged.add(1)
-                self._log_event("[MISSION] Primary parachute deployed!")
         elif self._dummy_phase == 1:
             # Primary chute descent
             self._dummy_velocity = 15
@@ -143,8 +228,6 @@ class SerialHandler:
                 self._dummy_phase = 2
                 self._dummy_velocity = 2
                 self._dummy_events_logged.add(2)
-                self._log_event("[MISSION] Secondary parachute deployed!")
-                self._popup_event("Secondary parachute deployed successfully!")
         elif self._dummy_phase == 2:
             # Secondary chute descent
             self._dummy_velocity = 2
@@ -152,11 +235,9 @@ class SerialHandler:
             if self._dummy_altitude <= 450 and 3 not in self._dummy_events_logged:
                 self._dummy_phase = 3
                 self._dummy_events_logged.add(3)
-                self._log_event("[MISSION] CanSat expansion mechanism completed.")
             if self._dummy_altitude <= 20 and 4 not in self._dummy_events_logged:
                 self._dummy_phase = 4
                 self._dummy_events_logged.add(4)
-                self._log_event("[MISSION] Audio beacons activated.")
         elif self._dummy_phase == 3:
             # Expansion, continue descent
             self._dummy_velocity = 2
@@ -164,7 +245,6 @@ class SerialHandler:
             if self._dummy_altitude <= 20 and 4 not in self._dummy_events_logged:
                 self._dummy_phase = 4
                 self._dummy_events_logged.add(4)
-                self._log_event("[MISSION] Audio beacons activated.")
         elif self._dummy_phase == 4:
             # Audio beacon, continue descent
             self._dummy_velocity = 2
@@ -200,25 +280,5 @@ class SerialHandler:
             "gyro": gyro,
             "gps": gps,
             "battery": round(self._dummy_battery, 2),
-            "time": time.strftime("%H:%M:%S")
+            "time": time.strftime("%H:%M:%S", time.localtime(now))
         }
-
-    def _log_event(self, msg):
-        # Log to GCS mission log if available
-        try:
-            from main import CanSatGCSApp
-            if CanSatGCSApp.instance is not None:
-                CanSatGCSApp.instance._log(msg)
-        except Exception:
-            pass
-
-    def _popup_event(self, msg):
-        # Popup to GCS if available
-        try:
-            import main
-            if hasattr(main, 'app') and hasattr(main.app, 'root'):
-                from tkinter import messagebox
-                messagebox.showinfo("Mission Event", msg, parent=main.app.root)
-        except Exception:
-            pass
-
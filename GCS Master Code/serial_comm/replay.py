@@ -0,0 +1,208 @@
+# serial_comm/replay.py
+# Feeds recorded flights back through the live ingestion path at 1x, Nx or full speed
+__all__ = ["ReplaySource", "load_recording"]
+
+import bisect
+import csv
+import os
+import threading
+import time
+
+from config.telemetry_schema import FIELD_NAMES
+from data.flight_log import FlightLogReader, format_time_of_day, parse_time_of_day
+
+# Field order of the firmware CSV line that SerialHandler parses
+ARDUINO_FIELDS = FIELD_NAMES
+
+
+def _to_line(row):
+    # Missing values go out as "nan": SchemaDecoder.from_csv drops a packet with an empty field
+    values = []
+    for name in ARDUINO_FIELDS:
+        value = row.get(name)
+        values.append("nan" if value is None or value == "" or value != value else str(value))
+    return ",".join(values).encode("utf-8")
+
+
+def load_recording(path, raw_rate_hz=2.0):
+    """
+    Loads a recording as (flight_times_s, raw_lines).
+    .csv and .cfr recordings are timed from their `time` column; any other file
+    is treated as a raw serial capture (one packet per line) at `raw_rate_hz`.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        clock = [parse_time_of_day(row.get("time")) for row in rows]
+    elif ext == ".cfr":
+        with FlightLogReader(path) as reader:
+            rows = [dict(zip(reader.fields, rec)) for rec in reader.records.tolist()]
+        clock = [row.get("time") for row in rows]
+        for row in rows:
+            row["time"] = format_time_of_day(row.get("time"))
+    else:
+        with open(path, "rb") as f:
+            lines = [line.rstrip(b"\r\n") for line in f if line.strip()]
+        return [i / raw_rate_hz for i in range(len(lines))], lines
+    if any(t is None or t != t for t in clock):
+        # No usable packet clock: fall back to a fixed rate
+        times = [i / raw_rate_hz for i in range(len(rows))]
+    else:
+        times = _spread_times(clock)
+    return times, [_to_line(row) for row in rows]
+
+
+def _spread_times(clock):
+    """Turns the 1 s packet clock into increasing flight times starting at 0"""
+    times = []
+    day = 0.0
+    start = 0
+    while start < len(clock):
+        end = start
+        while end < len(clock) and clock[end] == clock[start]:
+            end += 1
+        count = end - start
+        for k in range(count):
+            times.append(clock[start] + day + k / count)
+        if end < len(clock) and clock[end] < clock[start] - 43200:
+            day += 86400.0  # recording ran past midnight
+        start = end
+    t0 = times[0] if times else 0.0
+    return [t - t0 for t in times]
+
+
+class ReplaySource:
+    """
+    Replays a recording into a SerialHandler, as if the packets arrived on the port.
+
+    speed=1 plays in real time, speed=N N times faster, speed=None as fast as
+    possible. Packets are scheduled against absolute deadlines so timing errors
+    don't accumulate; pause(), resume() and seek() can be called from any thread.
+    """
+
+    def __init__(self, handler, path, speed=1.0, loop=False, raw_rate_hz=2.0, recording=None):
+        self.handler = handler
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.times, self.lines = recording if recording is not None else load_recording(path, raw_rate_hz)
+        self.duration_s = self.times[-1] if self.times else 0.0
+        self.packets_sent = 0
+        self.finished = False
+        self._index = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._rebase = True
+        self._lock = threading.Lock()
+        self._rate_start = None
+        self._rate_end = None
+        self._rate_packets = 0
+
+    @classmethod
+    def from_profile(cls, handler, profile, speed=1.0, loop=False):
+        """Plays a synthetic data.dummy_data.MissionProfile instead of a file"""
+        name = f"synthetic flight (seed {profile.seed}, {profile.rate_hz:g} Hz)"
+        return cls(handler, name, speed, loop, recording=(profile.columns["t"].tolist(), profile.csv_lines()))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ReplaySource", daemon=True)
+        self._thread.start()
+        print(f"[✓] Replaying {os.path.basename(self.path)}: {len(self.lines)} packets, "
+              f"{self.duration_s:.1f} s at {'max' if not self.speed else f'{self.speed:g}x'} speed.")
+
+    def stop(self):
+        self._stop.set()
+        self._resume.set()
+        if self._thread:
+            self._thread.join(1.0)
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        with self._lock:
+            self._rebase = True
+        self._resume.set()
+
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+
+    def seek(self, flight_time_s):
+        """Jumps to the first packet at or after `flight_time_s` into the recording"""
+        with self._lock:
+            self._index = bisect.bisect_left(self.times, max(0.0, flight_time_s))
+            self._rebase = True
+
+    def skip(self, seconds):
+        """Seeks `seconds` forward (negative: back) from the current position"""
+        self.seek(self.position_s + seconds)
+
+    @property
+    def position_s(self):
+        i = min(self._index, len(self.times) - 1)
+        return self.times[i] if i >= 0 and self.times else 0.0
+
+    def _run(self):
+        wall0 = flight0 = 0.0
+        while not self._stop.is_set():
+            self._resume.wait()
+            if self._stop.is_set():
+                break
+            with self._lock:
+                if self._index >= len(self.lines):
+                    if not self.loop or not self.lines:
+                        self.finished = True
+                        self._rate_end = time.perf_counter()
+                        break
+                    self._index = 0
+                    self._rebase = True
+                i = self._index
+                if self._rebase:
+                    wall0, flight0 = time.perf_counter(), self.times[i]
+                    self._rate_start, self._rate_end, self._rate_packets = wall0, None, 0
+                    self._rebase = False
+            if self.speed:
+                delay = wall0 + (self.times[i] - flight0) / self.speed - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                if self.paused:
+                    continue
+            with self._lock:
+                if self._rebase or self._index != i:
+                    continue  # seeked while waiting
+                self._index = i + 1
+            self.handler._handle_line(self.lines[i])
+            self.packets_sent += 1
+            self._rate_packets += 1
+
+    def stats(self):
+        """Requested vs achieved packet rate since the last start/seek/resume"""
+        end = self._rate_end or time.perf_counter()
+        elapsed = end - self._rate_start if self._rate_start else 0.0
+        achieved = self._rate_packets / elapsed if elapsed > 0 else 0.0
+        requested = None
+        if self.speed and self.duration_s > 0:
+            requested = (len(self.lines) - 1) / self.duration_s * self.speed
+        return {
+            "requested_hz": round(requested, 2) if requested else None,
+            "achieved_hz": round(achieved, 2),
+            "speed": self.speed,
+            "packets_sent": self.packets_sent,
+            "position_s": round(self.position_s, 3),
+            "duration_s": round(self.duration_s, 3),
+            "paused": self.paused,
+            "finished": self.finished,
+        }
+
+    def summary_text(self):
+        """One line for the diagnostics panel and the CLI status line"""
+        s = self.stats()
+        state = "finished" if s["finished"] else "paused" if s["paused"] else f"{self.speed:g}x" if self.speed else "max"
+        requested = f"{s['requested_hz']:.1f}" if s["requested_hz"] else "max"
+        return (f"Replay {s['position_s']:.0f}/{s['duration_s']:.0f} s ({state}), "
+                f"{s['achieved_hz']:.1f} of {requested} pkt/s")
@@ -0,0 +1,97 @@
+# serial_comm/telemetry_queue.py
+# Bounded hand-off queue between the serial reader thread and its consumers
+__all__ = ["TelemetryQueue", "DROP_OLDEST", "LATEST_ONLY", "BLOCK"]
+
+import threading
+from collections import deque
+
+# Overflow policies
+DROP_OLDEST = "drop_oldest"  # Full queue evicts the oldest packet to make room
+LATEST_ONLY = "latest_only"  # Only the newest packet is ever kept
+BLOCK = "block"              # Producer waits for room (up to a timeout, then drops)
+
+POLICIES = (DROP_OLDEST, LATEST_ONLY, BLOCK)
+
+
+class TelemetryQueue:
+    """
+    Thread-safe bounded FIFO with an explicit overflow policy.
+    Consumers should call drain() once per tick to take every pending packet at once.
+    """
+
+    def __init__(self, maxsize=2048, policy=DROP_OLDEST, block_timeout=0.5):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}, expected one of {POLICIES}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = 1 if policy == LATEST_ONLY else maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.put_count = 0
+        self.dropped = 0
+        self.high_water = 0
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._not_empty = threading.Condition(self._lock)
+
+    def put(self, item):
+        """Adds a packet, applying the overflow policy. Returns False if the packet was dropped."""
+        with self._lock:
+            if len(self._items) >= self.maxsize:
+                if self.policy == BLOCK:
+                    if not self._not_full.wait_for(lambda: len(self._items) < self.maxsize, self.block_timeout):
+                        self.dropped += 1
+                        return False
+                else:
+                    self._items.popleft()
+                    self.dropped += 1
+            self._items.append(item)
+            self._not_empty.notify()
+            self.put_count += 1
+            if len(self._items) > self.high_water:
+                self.high_water = len(self._items)
+            return True
+
+    def get_nowait(self):
+        """Returns the oldest pending packet, or None if there is none"""
+        with self._lock:
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def drain(self, max_items=None):
+        """Removes and returns pending packets (oldest first), all of them by default"""
+        with self._lock:
+            if max_items is None or max_items >= len(self._items):
+                items = list(self._items)
+                self._items.clear()
+            else:
+                items = [self._items.popleft() for _ in range(max_items)]
+            self._not_full.notify_all()
+            return items
+
+    def wait(self, timeout=None):
+        """Blocks until at least one packet is pending (or timeout); returns True if one is"""
+        with self._lock:
+            return bool(self._not_empty.wait_for(lambda: self._items, timeout))
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def stats(self):
+        """Snapshot of queue depth and drop counters"""
+        with self._lock:
+            return {
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                "received": self.put_count,
+                "dropped": self.dropped,
+                "high_water": self.high_water,
+            }
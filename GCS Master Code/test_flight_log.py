@@ -0,0 +1,54 @@
+# test_flight_log.py
+# .cfr recordings read back as written, uncompressed and compressed, and convert to CSV
+import csv
+import math
+
+import pytest
+
+from data.flight_log import FlightLogReader, FlightLogWriter, convert_to_csv
+
+FIELDS = ["time", "altitude", "pressure", "source"]
+ROWS = [
+    {"time": "12:00:00", "altitude": 1000.0, "pressure": 898.72, "source": "ground-a"},
+    {"time": "12:00:01", "altitude": 985.5, "pressure": None, "source": "ground-b"},
+    {"time": "12:00:02", "altitude": 970.25, "pressure": 900.26, "source": ""},
+]
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "lzma"])
+def test_write_and_read_back(tmp_path, compression):
+    path = tmp_path / "flight.cfr"
+    # chunk_records=2 puts the rows in a full and a partial chunk
+    with FlightLogWriter(path, FIELDS, dtypes={"source": "S16"}, compression=compression, chunk_records=2) as writer:
+        writer.writerows(ROWS)
+    with FlightLogReader(path) as reader:
+        assert reader.fields == FIELDS
+        assert reader.time_fields == ["time"]
+        assert len(reader) == len(ROWS)
+        assert reader["time"].tolist() == [43200.0, 43201.0, 43202.0]
+        assert reader["altitude"].tolist() == [1000.0, 985.5, 970.25]
+        pressure = reader["pressure"].tolist()
+        assert pressure[0] == 898.72 and math.isnan(pressure[1])  # missing values are NaN
+        assert reader["source"].tolist() == [b"ground-a", b"ground-b", b""]
+
+
+def test_convert_to_csv(tmp_path):
+    src, dst = tmp_path / "flight.cfr", tmp_path / "flight.csv"
+    with FlightLogWriter(src, FIELDS, dtypes={"source": "S16"}) as writer:
+        writer.writerows(ROWS)
+    assert convert_to_csv(src, dst) == len(ROWS)
+    with open(dst, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == FIELDS
+    assert rows[1] == ["12:00:00", "1000.0", "898.72", "ground-a"]
+    assert rows[2] == ["12:00:01", "985.5", "", "ground-b"]
+
+
+def test_file_cut_short_reads_to_the_last_complete_record(tmp_path):
+    path = tmp_path / "flight.cfr"
+    with FlightLogWriter(path, FIELDS, dtypes={"source": "S16"}) as writer:
+        writer.writerows(ROWS)
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - 5)
+    with FlightLogReader(path) as reader:
+        assert reader["altitude"].tolist() == [1000.0, 985.5]
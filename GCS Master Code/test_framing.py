@@ -0,0 +1,43 @@
+# test_framing.py
+# Binary frames survive the encode -> StreamFramer round trip; corrupted ones are dropped
+from config.telemetry_schema import FIELD_NAMES
+from data.dummy_data import MissionProfile
+from serial_comm.binary_protocol import FRAME_SIZE, encode_frame
+from serial_comm.framing import StreamFramer
+
+
+def _frames(n=20):
+    packets = MissionProfile(rate_hz=10.0, seed=0).frame_stream()
+    return [packets[i * FRAME_SIZE:(i + 1) * FRAME_SIZE] for i in range(n)]
+
+
+def test_sequence_and_values_round_trip_across_split_reads():
+    values = {name: 0.0 for name in FIELD_NAMES}
+    values.update(altitude=812.34, pressure=921.5, temperature=18.25)
+    stream = b"".join(encode_frame(values, seq) for seq in (65534, 65535, 0, 1))
+    framer = StreamFramer()
+    frames = []
+    for i in range(0, len(stream), 7):  # reads never line up with frame boundaries
+        frames += framer.feed(stream[i:i + 7])[1]
+    assert [seq for seq, _ in frames] == [65534, 65535, 0, 1]  # u16 sequence wraps
+    row = dict(zip(FIELD_NAMES, frames[0][1]))
+    assert abs(row["altitude"] - 812.34) < 1e-6
+    assert abs(row["pressure"] - 921.5) < 1e-6
+    assert framer.binary and framer.frames.crc_errors == 0
+
+
+def test_corrupted_frame_is_dropped_and_the_next_one_kept():
+    frames = _frames(3)
+    bad = bytearray(frames[1])
+    bad[FRAME_SIZE // 2] ^= 0xFF
+    framer = StreamFramer()
+    _, decoded = framer.feed(frames[0] + bytes(bad) + frames[2])
+    assert [seq for seq, _ in decoded] == [0, 2]
+    assert framer.frames.crc_errors >= 1
+
+
+def test_text_before_the_first_frame_is_not_taken_for_a_line():
+    framer = StreamFramer()
+    lines, frames = framer.feed(b"boot banner\r\n" + b"".join(_frames(2)))
+    assert lines == [] and [seq for seq, _ in frames] == [0, 1]
+    assert framer.binary
@@ -0,0 +1,45 @@
+# test_multilink.py
+# Redundant links: a packet is delivered once per vehicle, whichever link brings it first
+from data.dummy_data import MissionProfile
+from serial_comm.binary_protocol import FRAME_SIZE
+from serial_comm.multilink import Link, MultiLinkHandler
+
+FRAMES = MissionProfile(rate_hz=10.0, seed=0).frame_stream()
+
+
+def _frames(*seqs):
+    return b"".join(FRAMES[s * FRAME_SIZE:(s + 1) * FRAME_SIZE] for s in seqs)
+
+
+def _sources(handler):
+    return [source for _, _, source in handler.get_batch(traced=True)]
+
+
+def test_binary_packets_are_deduplicated_by_sequence_number():
+    handler = MultiLinkHandler()
+    a, b = Link("a"), Link("b")
+    handler._deliver(a, _frames(0, 1, 2), 0.0)
+    handler._deliver(b, _frames(1, 2, 3), 0.1)  # 1 and 2 again, over the second radio
+    handler._deliver(a, _frames(3, 4), 0.2)
+    assert _sources(handler) == ["a", "a", "a", "b", "a"]
+    assert (a.duplicates, b.duplicates, handler.duplicates) == (1, 2, 3)
+    assert (a.packets, b.packets) == (5, 3)  # each link's own count includes its duplicates
+
+
+def test_repeats_on_one_link_are_kept():
+    handler = MultiLinkHandler()
+    a, b = Link("a"), Link("b")
+    line = MissionProfile(rate_hz=1.0, seed=0).csv_lines()[0] + b"\n"
+    handler._deliver(a, line + line, 0.0)  # the radio sent the same packet twice
+    handler._deliver(b, line, 0.1)  # the second radio heard the first of them
+    assert _sources(handler) == ["a", "a"]
+    assert b.duplicates == 1
+
+
+def test_vehicles_are_deduplicated_separately():
+    handler = MultiLinkHandler()
+    handler._deliver(Link("a", "cansat"), _frames(0), 0.0)
+    handler._deliver(Link("p", "payload"), _frames(0), 0.1)  # same sequence number, other vehicle
+    assert _sources(handler) == ["a"]
+    assert _sources(handler.feed("payload")) == ["p"]
+    assert handler.duplicates == 0
@@ -0,0 +1,62 @@
+# test_phase_detection.py
+# Mission phases as the live pipeline reports them, at slow and fast packet rates and in Dummy Mode
+import random
+import time
+
+import pytest
+
+from config import settings
+from core.event_bus import EVENT, NOTIFY
+from core.phase_detector import PHASE_NAMES
+from core.pipeline import TelemetryPipeline
+from data.dummy_data import MissionProfile
+
+# Latest a phase may be reported after the simulated event (s): the filter
+# first settles for PHASE_SETTLE_S, and landing needs a stretch of stillness,
+# which takes longer the fewer packets there are
+MAX_DELAY_S = {"ejection": 7.0, "primary_chute": 7.0, "secondary_chute": 6.0,
+               "expansion": 4.0, "audio_beacon": 4.0, "landed": 25.0}
+# Earliest (s before the event): the height thresholds see the fused altitude's noise
+MAX_EARLY_S = {"expansion": 5.0, "audio_beacon": 5.0}
+
+
+def _events(pipeline):
+    events = {}
+    pipeline.bus.subscribe(EVENT, lambda event: events.setdefault(event["phase"], event["flight_time_s"]))
+    return events
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("rate_hz", [1.0, 2.0, 10.0])
+def test_every_phase_within_bounded_delay(rate_hz, seed):
+    flight = MissionProfile(rate_hz=rate_hz, seed=seed, landed_s=30.0)
+    pipeline = TelemetryPipeline()
+    events = _events(pipeline)
+    decoder = pipeline.handler.decoder
+    # The reader's arrival stamp is the simulated sample time: as fast as the
+    # test can go, with the timing of a real link
+    for t, line in zip(flight.columns["t"].tolist(), flight.csv_lines()):
+        pipeline.ingest(decoder.from_csv(line), [t])
+    truth = {"ejection": 0.0, **{PHASE_NAMES[phase]: t for t, phase, _ in flight.events}}
+    for name, at in truth.items():
+        assert name in events, f"{name} never detected at {rate_hz:g} Hz"
+        delay = events[name] - at
+        assert -MAX_EARLY_S.get(name, 0.0) <= delay <= MAX_DELAY_S[name], f"{name} {delay:+.2f} s at {rate_hz:g} Hz"
+
+
+def test_dummy_mode_reports_mission_events():
+    pipeline = TelemetryPipeline()
+    events = _events(pipeline)
+    notes = []
+    pipeline.bus.subscribe(NOTIFY, notes.append)
+    handler = pipeline.handler
+    random.seed(0)
+    now = time.mktime((2026, 6, 1, 12, 0, 0, 0, 0, -1))  # clear of midnight
+    interval = settings.DUMMY_UPDATE_INTERVAL_MS / 1000  # the dashboard's dummy packet rate
+    for _ in range(int(400 / interval)):
+        now += interval
+        pipeline.ingest(handler.generate_dummy_packet(now), [now])
+    order = [name for name in ("ejection", "primary_chute", "secondary_chute", "landed") if name in events]
+    assert order == ["ejection", "primary_chute", "secondary_chute", "landed"]
+    assert sorted(events.values()) == list(events.values())
+    assert len(notes) == len(settings.PHASE_NOTIFY)  # the chute toasts
@@ -0,0 +1,85 @@
+#include <Wire.h>
+#include <Adafruit_Sensor.h>
+#include <Adafruit_ADXL345_U.h>
+
+// Binary telemetry frame, decoded by GCS serial_comm/binary_protocol.py
+//   0xA5 0x5A | u8 payload length | u16 sequence | payload | u16 CRC-16/CCITT-FALSE
+// Little-endian (AVR native). CRC covers length, sequence and payload.
+// 41 bytes per packet instead of ~85 for the CSV line.
+
+Adafruit_ADXL345_Unified accel = Adafruit_ADXL345_Unified();
+
+struct __attribute__((packed)) Payload {
+  uint16_t voltage_mv;
+  int32_t gps_lat_e7;
+  int32_t gps_lon_e7;
+  int32_t altitude_cm;
+  int16_t temperature_c100;
+  uint16_t pressure_hpa10;
+  int16_t vertical_speed_cms;
+  int16_t current_ma;
+  int16_t gyro_x100;
+  int16_t gyro_y100;
+  int16_t gyro_z100;
+  uint16_t battery_pct100;
+  uint32_t time_s;  // seconds since midnight
+};
+
+uint16_t seq = 0;
+
+uint16_t crc16(const uint8_t *data, size_t len, uint16_t crc) {
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendFrame(const Payload &p) {
+  uint8_t header[5] = {0xA5, 0x5A, sizeof(Payload), (uint8_t)(seq & 0xFF), (uint8_t)(seq >> 8)};
+  uint16_t crc = crc16(header + 2, 3, 0xFFFF);
+  crc = crc16((const uint8_t *)&p, sizeof(Payload), crc);
+  Serial.write(header, sizeof(header));
+  Serial.write((const uint8_t *)&p, sizeof(Payload));
+  Serial.write((uint8_t)(crc & 0xFF));
+  Serial.write((uint8_t)(crc >> 8));
+  seq++;
+}
+
+void setup() {
+  Serial.begin(9600);
+
+  if (!accel.begin()) {
+    Serial.println("Could not find ADXL345 sensor!");
+    while (1);
+  }
+  accel.setRange(ADXL345_RANGE_16_G);
+}
+
+void loop() {
+  sensors_event_t event;
+  accel.getEvent(&event);
+
+  // Dummy values for fields you don't have yet
+  Payload p;
+  p.voltage_mv = 3700;                  // 3.7 V
+  p.gps_lat_e7 = 123456000L;            // 12.3456
+  p.gps_lon_e7 = 987654000L;            // 98.7654
+  p.altitude_cm = 12345;                // 123.45 m
+  p.temperature_c100 = 2550;            // 25.5 C
+  p.pressure_hpa10 = 10133;             // 1013.3 hPa
+  p.vertical_speed_cms = 120;           // 1.2 m/s
+  p.current_ma = 500;                   // 0.5 A
+  p.gyro_x100 = (int16_t)(event.acceleration.x * 100);
+  p.gyro_y100 = (int16_t)(event.acceleration.y * 100);
+  p.gyro_z100 = (int16_t)(event.acceleration.z * 100);
+  p.battery_pct100 = 9500;              // 95 %
+  p.time_s = 12UL * 3600 + 30 * 60 + 15 + millis() / 1000;  // dummy clock from 12:30:15
+
+  sendFrame(p);
+
+  // Half the bytes of the CSV line, so 4 Hz fits where 2 Hz did
+  delay(250);
+}